@@ -0,0 +1,20 @@
+# parse gaussian output files, see gptools.results for use as a library
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import importlib
+
+# loaded on first use, so importing any gptools module (e.g. gaucollect)
+# does not import gptools.results and everything it needs
+__all__ = ['GaussianResult', 'parse_log', 'parse_many', 'to_dataframe']
+
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(importlib.import_module('gptools.results'), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -5,26 +5,109 @@
 
 from gptools.arguments import parse_args
 from gptools.gauprocess import process
+from gptools.cache import prune_cache
+from gptools.sweep import sweep
+from gptools.watch import watch
+from gptools.profiling import measured
+from gptools.gensi import CSV_FILE, TXT_FILE
 
 
 if __name__ == '__main__':
     args = parse_args()
-    # normal gaussian file processing
-    process(inp_file=args.file,
-            need_entropy=args.entropy,
-            need_goodvibes=args.goodvibes,
-            temp=args.temperature,
-            conc=args.concentration,
-            factor_rot=args.factor_rot,
-            factor_trans=args.factor_trans,
-            )
-    # generate SI file from the files processed
-    if args.gensi:
-        try:
-            from gptools.gensi import gensi
-        except ImportError:
-            print('package gjftools is needed for this function!')
-
-        gensi(need_entropy=args.entropy,
-              need_goodvibes=args.goodvibes,
-              )
+    with measured(args.stats, args.profile):
+        # only clean up the cache
+        if args.prune_cache:
+            prune_cache()
+            raise SystemExit
+        # free energies over a grid of conditions
+        if args.sweep:
+            sweep(inp_file=args.file,
+                  temps=args.temperature,
+                  concs=args.concentration,
+                  factors_rot=args.factor_rot,
+                  factors_trans=args.factor_trans,
+                  jobs=args.jobs,
+                  use_cache=not args.no_cache,
+                  cache_hash=args.cache_hash,
+                  freq_scale=args.freq_scale,
+                  )
+            raise SystemExit
+        # species of conformers, numpy and pandas are only loaded here
+        if args.ensemble:
+            from gptools.ensemble import ensemble
+            ensemble(inp_file=args.file,
+                     need_entropy=args.entropy,
+                     need_goodvibes=args.goodvibes,
+                     temp=args.temperature,
+                     conc=args.concentration,
+                     factor_rot=args.factor_rot,
+                     factor_trans=args.factor_trans,
+                     jobs=args.jobs,
+                     use_cache=not args.no_cache,
+                     cache_hash=args.cache_hash,
+                     freq_scale=args.freq_scale,
+                     pattern=args.ensemble_pattern,
+                     e_window=args.e_window,
+                     rmsd_threshold=args.rmsd,
+                     )
+            raise SystemExit
+        # energy profile of reaction steps from processed results
+        if args.reaction:
+            from gptools.reaction import reaction
+            reaction(args.reaction,
+                     need_entropy=args.entropy,
+                     need_goodvibes=args.goodvibes,
+                     table_file=args.output or CSV_FILE,
+                     table_format=args.format,
+                     )
+            raise SystemExit
+        # points of relaxed scans and IRCs
+        if args.paths:
+            from gptools.pathscan import paths
+            paths(inp_file=args.file,
+                  path_file=args.paths,
+                  jobs=args.jobs,
+                  prefetch=args.prefetch,
+                  prefetch_mb=args.prefetch_mb,
+                  )
+            raise SystemExit
+        # keep processing files as they change
+        if args.watch:
+            if args.goodvibes and args.qh_engine == 'goodvibes':
+                print('Warning: --watch always uses the builtin quasi-harmonic engine!')
+            watch(need_entropy=args.entropy,
+                  need_goodvibes=args.goodvibes,
+                  temp=args.temperature,
+                  conc=args.concentration,
+                  factor_rot=args.factor_rot,
+                  factor_trans=args.factor_trans,
+                  jobs=args.jobs,
+                  use_cache=not args.no_cache,
+                  cache_hash=args.cache_hash,
+                  freq_scale=args.freq_scale,
+                  interval=args.watch_interval,
+                  use_poll=args.watch_poll,
+                  )
+            raise SystemExit
+        # normal gaussian file processing
+        process(inp_file=args.file,
+                need_entropy=args.entropy,
+                need_goodvibes=args.goodvibes,
+                temp=args.temperature,
+                conc=args.concentration,
+                factor_rot=args.factor_rot,
+                factor_trans=args.factor_trans,
+                jobs=args.jobs,
+                use_cache=not args.no_cache,
+                cache_hash=args.cache_hash,
+                qh_engine=args.qh_engine,
+                freq_scale=args.freq_scale,
+                output_file=args.output,
+                output_format=args.format,
+                split_jobs=args.split_jobs,
+                history_file=args.history,
+                # generate SI file from the files processed
+                si_file=TXT_FILE if args.gensi else None,
+                prefetch=args.prefetch,
+                prefetch_mb=args.prefetch_mb,
+                )
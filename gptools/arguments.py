@@ -5,13 +5,39 @@
 
 import argparse
 
+from gptools.output import OUTPUT_FORMATS
+from gptools.prefetch import PREFETCH_MB
+
+# options taking several values in a sweep
+GRID_OPTIONS = ['temperature', 'concentration', 'factor_rot', 'factor_trans']
+
+
+def grid_values(text: str):
+    '''
+    a single number, or a range start:stop:step with stop included
+    '''
+    if ':' not in text:
+        return [float(text)]
+    try:
+        start, stop, step = [float(x) for x in text.split(':')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{text} is not a number or start:stop:step')
+    if step <= 0:
+        raise argparse.ArgumentTypeError(f'step of {text} should be positive')
+    values = []
+    n = 0
+    while start + n * step <= stop + step * 1e-9:
+        values.append(round(start + n * step, 10))
+        n += 1
+    return values
+
 
 def parse_args():
     p = argparse.ArgumentParser()
     p.add_argument(
         '--file', '-f',
         type=str,
-        help='Specify a single file to process (must be .log or .out)',
+        help='Specify a single file to process (must be .log or .out, could be compressed as .gz/.xz/.bz2/.zst)',
     )
     p.add_argument(
         '--entropy', '-s',
@@ -25,31 +51,177 @@ def parse_args():
         action='store_const',
         const=True,
         default=False,
-        help='if specified, run goodvibes and merge the results with original gaussian output (default: False)',
+        help='if specified, compute quasi-harmonic corrections like goodvibes and merge the results with original gaussian output (default: False)',
     )
     p.add_argument(
-        '--temperature', '-t',
-        type=float,
-        default=298.15,
-        help='temperature used in free energy calculation (default: 298.15K)',
+        '--qh-engine',
+        type=str,
+        default='builtin',
+        choices=['builtin', 'goodvibes'],
+        help='how quasi-harmonic corrections are computed with -g, builtin uses the parsed frequencies, goodvibes runs goodvibes (default: builtin)',
     )
     p.add_argument(
-        '--concentration', '-c',
+        '--freq-scale',
         type=float,
         default=1.0,
-        help='concentration used in free energy calculation (default: 1.0M)',
+        help='frequency scaling factor used by the builtin quasi-harmonic engine (default: 1.0)',
+    )
+    p.add_argument(
+        '--temperature', '-t',
+        type=grid_values,
+        nargs='+',
+        default=[[298.15]],
+        help='temperature used in free energy calculation, several values or start:stop:step with --sweep (default: 298.15K)',
+    )
+    p.add_argument(
+        '--concentration', '-c',
+        type=grid_values,
+        nargs='+',
+        default=[[1.0]],
+        help='concentration used in free energy calculation, several values or start:stop:step with --sweep (default: 1.0M)',
     )
     p.add_argument(
         '--factor_rot',
-        type=float,
-        default=0.5,
-        help='scaling factor for S_rot (default: 0.5)',
+        type=grid_values,
+        nargs='+',
+        default=[[0.5]],
+        help='scaling factor for S_rot, several values or start:stop:step with --sweep (default: 0.5)',
     )
     p.add_argument(
         '--factor_trans',
+        type=grid_values,
+        nargs='+',
+        default=[[0.5]],
+        help='scaling factor for S_trans, several values or start:stop:step with --sweep (default: 0.5)',
+    )
+    p.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='number of processes used to parse files, 0 for all cores (default: 1)',
+    )
+    p.add_argument(
+        '--prefetch',
+        type=int,
+        default=0,
+        help='number of files read ahead by threads while one is parsed, for logs on network filesystems (NFS, Lustre), only used with -j 1, 0 for none (default: 0)',
+    )
+    p.add_argument(
+        '--prefetch-mb',
         type=float,
-        default=0.5,
-        help='scaling factor for S_trans (default: 0.5)',
+        default=PREFETCH_MB,
+        help=f'at most this many MB are read ahead by --prefetch, a larger file only has its end read ahead (default: {PREFETCH_MB})',
+    )
+    p.add_argument(
+        '--no-cache',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, parse all files again instead of using cached results of unchanged files (default: False)',
+    )
+    p.add_argument(
+        '--cache-hash',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, compare content hash instead of mtime to find unchanged files (default: False)',
+    )
+    p.add_argument(
+        '--prune-cache',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, remove cached results of deleted or changed files and exit (default: False)',
+    )
+    p.add_argument(
+        '--sweep',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, compute qh-G and solv-G over every combination of -t, -c, --factor_rot and --factor_trans values and write gauprocess_sweep.csv (default: False)',
+    )
+    p.add_argument(
+        '--ensemble',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, group conformers into species by --ensemble-pattern, drop duplicates and write boltzmann weighted G, qh-G and solv-G of each species to gauprocess_ensemble.csv (default: False)',
+    )
+    p.add_argument(
+        '--ensemble-pattern',
+        type=str,
+        default=r'(.+)[_-]conf\d+$',
+        help=r'regular expression matching file names of conformers, its first group is the species name, other files are species of their own (default: (.+)[_-]conf\d+$)',
+    )
+    p.add_argument(
+        '--e-window',
+        type=float,
+        default=0.1,
+        help='conformers of a species within this energy (kcal/mol) are compared by RMSD in --ensemble (default: 0.1)',
+    )
+    p.add_argument(
+        '--rmsd',
+        type=float,
+        default=0.125,
+        help='conformers inside the energy window with a lower RMSD (angstrom) after alignment are duplicates in --ensemble (default: 0.125)',
+    )
+    p.add_argument(
+        '--reaction',
+        type=str,
+        default=None,
+        help='reaction spec (.csv or .yaml) listing reactants, ts and products of each step by file name, write barriers and reaction energies from gauprocess.csv (or --output) to gauprocess_profile.csv and energetic spans to gauprocess_span.csv (default: None)',
+    )
+    p.add_argument(
+        '--split-jobs',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, give one row per sub-job (--Link1--, also opt and freq of opt freq) named file_link1, file_link2 ... (default: False)',
+    )
+    p.add_argument(
+        '--output', '-o',
+        type=str,
+        default=None,
+        help='write rows to this file in typed columns as files are parsed, instead of gauprocess.csv at the end (default: None)',
+    )
+    p.add_argument(
+        '--format',
+        type=str,
+        default=None,
+        choices=OUTPUT_FORMATS,
+        help='format of --output, told by its extension if not given (default: None)',
+    )
+    p.add_argument(
+        '--history',
+        type=str,
+        default=None,
+        help='save the optimization history (energy, forces, displacement, YES count per step) of running or error jobs to this .npz file (default: None)',
+    )
+    p.add_argument(
+        '--paths',
+        type=str,
+        default=None,
+        help='stream the points (reaction coordinate, energy, geometry) of relaxed scans and IRCs of the files to this .npz file, or .csv file without geometries (default: None)',
+    )
+    p.add_argument(
+        '--watch',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, keep gauprocess.csv updated as files are added or changed until Ctrl+C, only those files are parsed again (default: False)',
+    )
+    p.add_argument(
+        '--watch-poll',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, --watch compares file size and mtime every interval instead of using inotify, needed on network filesystems written by other hosts (default: False)',
+    )
+    p.add_argument(
+        '--watch-interval',
+        type=float,
+        default=2.0,
+        help='seconds changes are collected for before files are parsed again in --watch (default: 2.0)',
     )
     p.add_argument(
         '--gensi',
@@ -58,4 +230,29 @@ def parse_args():
         default=False,
         help='if specified, generate .txt file for SI after processing (default: False)',
     )
-    return p.parse_args()
+    p.add_argument(
+        '--stats',
+        type=str,
+        nargs='?',
+        const='-',
+        default=None,
+        help='if specified, print wall time, bytes read, lines scanned and peak memory of each stage and extractor, also written to the json file if given (default: None)',
+    )
+    p.add_argument(
+        '--profile',
+        type=str,
+        default=None,
+        help='write a cProfile dump of the run to this file, read it by python -m pstats (default: None)',
+    )
+    args = p.parse_args()
+
+    # flatten values of grid options, single values unless sweeping
+    for name in GRID_OPTIONS:
+        values = [x for group in getattr(args, name) for x in group]
+        if args.sweep:
+            setattr(args, name, values)
+        elif len(values) == 1:
+            setattr(args, name, values[0])
+        else:
+            p.error(f'--{name} takes several values only with --sweep')
+    return args
@@ -0,0 +1,386 @@
+# time parsing of synthetic gaussian output files, results as json
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import subprocess
+import platform
+import tempfile
+import contextlib
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from gptools import extractors
+from gptools.gauprocess import process
+from gptools.gensi import gensi
+from gptools.logfile import open_log
+from gptools.synthlog import (
+    TEMPLATE_DIR, OPT_TEMPLATE, TS_TEMPLATE, LogTemplate,
+    check_template_dir, write_goodvibes_output, make_campaign,
+)
+
+BENCH_FILE = 'gptools_bench.json'
+MB = 1024 ** 2
+
+# modules imported by the command line and the core path, none of them
+# may load HEAVY_MODULES (only goodvibes, solvent correction and gensi do)
+CORE_MODULES = ['gptools.__main__', 'gptools.results', 'gptools.gaucollect']
+HEAVY_MODULES = ['pandas', 'numpy']
+IMPORT_SCRIPT = '''
+import sys, time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps({{'seconds': time.perf_counter() - start,
+                  'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+'''
+
+# extractors taking the lines of a file
+LINE_EXTRACTORS = ['get_status', 'get_imag_freq', 'get_sp_energy', 'get_free_energy',
+                   'get_opt_points', 'get_converge', 'get_entropy', 'get_geometry']
+# extractors taking the file name, reading only what they need
+FILE_EXTRACTORS = ['get_status_from_file', 'get_sp_energy_from_file', 'get_opt_from_file',
+                   'get_geometry_from_file']
+
+
+def best_time(func, repeat: int=3) -> float:
+    '''shortest wall time of repeat calls, in seconds'''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def rate(amount: float, seconds: float) -> float:
+    return round(amount / seconds, 3) if seconds > 0 else None
+
+
+def bench_extractors(gau_file: str, repeat: int=3, read_lines: bool=True) -> List[dict]:
+    '''
+    time every extractor on one file, MB/s is given by the file size.
+    the line based ones are skipped for files too big to be read in memory
+    '''
+    size = os.path.getsize(gau_file) / MB
+
+    def record(name, func):
+        seconds = best_time(func, repeat)
+        return {'function': name, 'seconds': round(seconds, 6), 'MB/s': rate(size, seconds)}
+
+    def scan_jobs():
+        with open_log(gau_file) as f:
+            extractors.scan_jobs(f, need_thermo=True)
+
+    results = []
+    if read_lines:
+        with open(gau_file) as f:
+            lines = f.readlines()
+        for name in LINE_EXTRACTORS:
+            results.append(record(name, lambda: getattr(extractors, name)(lines)))
+    for name in FILE_EXTRACTORS:
+        results.append(record(name, lambda: getattr(extractors, name)(gau_file)))
+    results.append(record('scan_jobs', scan_jobs))
+    results.append(record('OptTracker.update', lambda: extractors.OptTracker().update(gau_file)))
+    return results
+
+
+def bench_solv_corr(n_rows: int, repeat: int=3) -> dict:
+    '''time get_solv_corr on a table of n_rows files'''
+    data_df = pd.DataFrame({
+        'E': np.full(n_rows, -2283.155184),
+        'H_corr': np.full(n_rows, 0.46324),
+        'T.qh-S_tot': np.full(n_rows, 0.082081),
+        'S_tot': np.full(n_rows, 194.04),
+        'S_rot': np.full(n_rows, 37.66),
+        'S_trans': np.full(n_rows, 44.504),
+    })
+    seconds = best_time(lambda: extractors.get_solv_corr(data_df.copy(), 298.15, (0.5, 0.5)), repeat)
+    return {'function': 'get_solv_corr', 'rows': n_rows,
+            'seconds': round(seconds, 6), 'rows/s': rate(n_rows, seconds)}
+
+
+def bench_goodvibes(work_dir: str, n_rows: int, repeat: int=3) -> dict:
+    '''time extract_goodvibes_result on an output of n_rows structures'''
+    gv_file = os.path.join(work_dir, 'Goodvibes_output.dat')
+    write_goodvibes_output(gv_file, [f'job{i:05d}' for i in range(n_rows)])
+    seconds = best_time(lambda: extractors.extract_goodvibes_result(gv_file), repeat)
+    size = os.path.getsize(gv_file) / MB
+    os.remove(gv_file)
+    return {'function': 'extract_goodvibes_result', 'rows': n_rows,
+            'seconds': round(seconds, 6), 'rows/s': rate(n_rows, seconds),
+            'MB/s': rate(size, seconds)}
+
+
+@contextlib.contextmanager
+def quiet_in(work_dir: str):
+    '''run in work_dir with stdout muted, process and gensi write there'''
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.chdir(cwd)
+
+
+def bench_process(work_dir: str, jobs: int=1, repeat: int=1) -> List[dict]:
+    '''time process over all files of work_dir, without the cache'''
+    names = [name for name in os.listdir(work_dir) if name.endswith('.log')]
+    n_files = len(names)
+    size = sum(os.path.getsize(os.path.join(work_dir, name)) for name in names) / MB
+
+    results = []
+    for options in [{}, {'need_entropy': True, 'need_goodvibes': True}]:
+        def run():
+            with quiet_in(work_dir):
+                process(work_dir=work_dir, jobs=jobs, use_cache=False, **options)
+        seconds = best_time(run, repeat)
+        results.append({'function': 'process', 'options': '-s -g' if options else '',
+                        'files': n_files, 'MB': round(size, 3), 'jobs': jobs,
+                        'seconds': round(seconds, 6), 'files/s': rate(n_files, seconds),
+                        'MB/s': rate(size, seconds)})
+    return results
+
+
+def bench_gensi(work_dir: str, jobs: int=1, repeat: int=1) -> dict:
+    '''time gensi on the table of the last process run in work_dir'''
+    n_files = sum(1 for name in os.listdir(work_dir) if name.endswith('_sp.log'))
+
+    def run():
+        with quiet_in(work_dir):
+            gensi(log_dir=work_dir, need_entropy=True, need_goodvibes=True, jobs=jobs)
+    seconds = best_time(run, repeat)
+    return {'function': 'gensi', 'structures': n_files,
+            'seconds': round(seconds, 6), 'structures/s': rate(n_files, seconds)}
+
+
+def bench_import(repeat: int=3) -> List[dict]:
+    '''
+    time a fresh import of each of CORE_MODULES in a new interpreter,
+    and tell which of HEAVY_MODULES got loaded (there should be none)
+    '''
+    results = []
+    for module in CORE_MODULES:
+        script = IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+        runs = [json.loads(subprocess.run([sys.executable, '-c', script], check=True,
+                                          capture_output=True, text=True).stdout)
+                for _ in range(repeat)]
+        results.append({'module': module,
+                        'seconds': round(min(run['seconds'] for run in runs), 6),
+                        'loaded': runs[0]['loaded']})
+    return results
+
+
+def check_import(results: List[dict], out=sys.stdout) -> bool:
+    '''print the import times to out, False if any core module loads a heavy one'''
+    passed = True
+    for result in results:
+        print(f'import {result["module"]}: {result["seconds"] * 1000:.1f} ms', file=out)
+        if result['loaded']:
+            print(f'Warning! import {result["module"]} loads {", ".join(result["loaded"])}!',
+                  file=out)
+            passed = False
+    return passed
+
+
+def get_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version('gptools')
+    except Exception:
+        return 'unknown'
+
+
+def meta() -> dict:
+    return {'gptools': get_version(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'cpu_count': os.cpu_count(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+
+def benchmark(work_dir: str,
+              atom_scales: List[int]=(1,),
+              steps: List[int]=(None,),
+              files: List[int]=(100,),
+              big_mb: float=0,
+              jobs: int=1,
+              repeat: int=3,
+              template_dir: str=TEMPLATE_DIR,
+              ) -> dict:
+    '''
+    time the parsers on synthetic logs modelled on the opt freq samples
+    (minimum and transition state) in template_dir, scaled along atom
+    count (every per atom row repeated), optimization steps (None for as
+    in the template) and number of files.
+    big_mb (if not 0) adds a single log of about that size in MB, only
+    the extractors reading files without loading them are timed on it
+    '''
+    check_template_dir(template_dir)
+    report = {'meta': meta(), 'import': bench_import(repeat),
+              'extractors': [], 'process': [], 'goodvibes': [], 'gensi': []}
+
+    for kind, template_file in [('min', OPT_TEMPLATE), ('ts', TS_TEMPLATE)]:
+        template = LogTemplate(os.path.join(template_dir, template_file))
+        for atom_scale in atom_scales:
+            for n_steps in steps:
+                gau_file = os.path.join(work_dir, f'bench_{kind}.log')
+                template.write(gau_file, n_steps, atom_scale)
+                info = {'template': template_file, 'atom_scale': atom_scale,
+                        'steps': n_steps or template.n_steps,
+                        'MB': round(os.path.getsize(gau_file) / MB, 3)}
+                for result in bench_extractors(gau_file, repeat):
+                    report['extractors'].append({**info, **result})
+                os.remove(gau_file)
+
+    if big_mb:
+        template = LogTemplate(os.path.join(template_dir, OPT_TEMPLATE))
+        n_steps = max(2, int(big_mb * MB / template.step_bytes()))
+        gau_file = os.path.join(work_dir, 'bench_big.log')
+        template.write(gau_file, n_steps)
+        info = {'template': OPT_TEMPLATE, 'atom_scale': 1, 'steps': n_steps,
+                'MB': round(os.path.getsize(gau_file) / MB, 3)}
+        for result in bench_extractors(gau_file, repeat, read_lines=False):
+            report['extractors'].append({**info, **result})
+        os.remove(gau_file)
+
+    for n_files in files:
+        campaign_dir = os.path.join(work_dir, f'campaign_{n_files}')
+        make_campaign(campaign_dir, n_files, template_dir)
+        # a single run each, file reads are cached by the os after the first
+        report['process'].extend(bench_process(campaign_dir, jobs))
+        report['gensi'].append({**bench_gensi(campaign_dir, jobs), 'files': n_files})
+        shutil.rmtree(campaign_dir)
+        report['goodvibes'].append(bench_goodvibes(work_dir, n_files, repeat))
+
+    report['goodvibes'].append(bench_solv_corr(max(files), repeat))
+    return report
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        '--atoms', '-a',
+        type=int,
+        nargs='+',
+        default=[1, 4],
+        help='number of times every per atom row of the templates is repeated (default: 1 4)',
+    )
+    p.add_argument(
+        '--steps',
+        type=int,
+        nargs='+',
+        default=[0, 200],
+        help='optimization steps of the synthetic logs, 0 for as in the templates (default: 0 200)',
+    )
+    p.add_argument(
+        '--files', '-n',
+        type=int,
+        nargs='+',
+        default=[10, 100],
+        help='number of files processed at once, e.g. 10000 for a large campaign (default: 10 100)',
+    )
+    p.add_argument(
+        '--big-mb',
+        type=float,
+        default=0,
+        help='size in MB of an extra single log, e.g. 2048 for a multi-GB file, 0 for none (default: 0)',
+    )
+    p.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='number of processes used by process, 0 for all cores (default: 1)',
+    )
+    p.add_argument(
+        '--repeat', '-r',
+        type=int,
+        default=3,
+        help='calls of each extractor, the shortest time is kept (default: 3)',
+    )
+    p.add_argument(
+        '--template-dir', '-t',
+        type=str,
+        default=TEMPLATE_DIR,
+        help='folder with the sample logs the synthetic ones are modelled on, '
+             'required outside a source checkout (default: test/ of the repository)',
+    )
+    p.add_argument(
+        '--workdir', '-w',
+        type=str,
+        default=None,
+        help='folder the synthetic logs are written to (default: a temporary folder)',
+    )
+    p.add_argument(
+        '--keep',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, keep the temporary folder (default: False)',
+    )
+    p.add_argument(
+        '--import-only',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, only check the import time of the command line, exit 1 if pandas or numpy is loaded (default: False)',
+    )
+    p.add_argument(
+        '--out', '-o',
+        type=str,
+        default=BENCH_FILE,
+        help=f'json file the results are written to, - for stdout (default: {BENCH_FILE})',
+    )
+    args = p.parse_args()
+    if not args.import_only:
+        try:
+            check_template_dir(args.template_dir)
+        except FileNotFoundError as e:
+            p.error(f'{e} (--template-dir)')
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    if args.import_only:
+        sys.exit(0 if check_import(bench_import(args.repeat)) else 1)
+
+    work_dir = args.workdir or tempfile.mkdtemp(prefix='gptools_bench_')
+    os.makedirs(work_dir, exist_ok=True)
+    work_dir = os.path.abspath(work_dir)
+    try:
+        report = benchmark(work_dir,
+                           atom_scales=args.atoms,
+                           steps=[n or None for n in args.steps],
+                           files=args.files,
+                           big_mb=args.big_mb,
+                           jobs=args.jobs,
+                           repeat=args.repeat,
+                           template_dir=args.template_dir,
+                           )
+    finally:
+        if args.workdir is None and not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.out == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Benchmark results wrote to {args.out}!')
+    # json on stdout is kept clean
+    if not check_import(report['import'], sys.stderr if args.out == '-' else sys.stdout):
+        sys.exit(1)
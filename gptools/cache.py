@@ -0,0 +1,156 @@
+# cache extracted results of gaussian output files
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import json
+import sqlite3
+import hashlib
+
+# cache file kept in the work directory
+CACHE_FILE = '.gptools_cache.sqlite'
+# bump when the extracted fields change, old results are ignored then
+# 2: inputs of quasi-harmonic thermochemistry and last geometry
+CACHE_VERSION = 2
+
+
+def file_hash(gau_file: str) -> str:
+    '''sha1 of the file content, read in blocks'''
+    h = hashlib.sha1()
+    with open(gau_file, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ResultCache:
+    '''
+    on-disk cache of per-file extraction results in a SQLite file.
+    a result is used again only if the file has the same path, size and
+    mtime (or the same content hash when use_hash is on) and was
+    extracted with the same options.
+    '''
+    def __init__(self, work_dir: str=os.getcwd(), use_hash: bool=False):
+        self.cache_file = os.path.join(os.path.abspath(work_dir), CACHE_FILE)
+        self.use_hash = use_hash
+        self.conn = sqlite3.connect(self.cache_file)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                path TEXT NOT NULL,
+                options TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (path, options)
+            )''')
+        # where parsing of running jobs stopped, see OptTracker
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS progress (
+                path TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            )''')
+
+    @staticmethod
+    def options_key(**options) -> str:
+        '''options that change the extracted result, as one string'''
+        options['version'] = CACHE_VERSION
+        return json.dumps(options, sort_keys=True)
+
+    def get(self, gau_file: str, options: str):
+        '''get cached result of one file, None if not cached or changed'''
+        path = os.path.abspath(gau_file)
+        row = self.conn.execute(
+            'SELECT size, mtime, hash, data FROM results WHERE path = ? AND options = ?',
+            (path, options)).fetchone()
+        if row is None:
+            return None
+        size, mtime, content_hash, data = row
+        stat = os.stat(path)
+        if stat.st_size != size:
+            return None
+        if self.use_hash:
+            if not content_hash or file_hash(path) != content_hash:
+                return None
+        elif stat.st_mtime_ns != mtime:
+            return None
+        return json.loads(data)
+
+    def put(self, gau_file: str, options: str, data_dict: dict, stat=None):
+        '''
+        store the result of one file, stat should be taken before the
+        file is parsed so that a file growing meanwhile is parsed again
+        '''
+        path = os.path.abspath(gau_file)
+        if stat is None:
+            stat = os.stat(path)
+        content_hash = file_hash(path) if self.use_hash else ''
+        self.conn.execute(
+            'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+            (path, options, stat.st_size, stat.st_mtime_ns, content_hash,
+             json.dumps(data_dict)))
+
+    def get_progress(self, gau_file: str) -> dict:
+        '''parser state of a running job, empty if none'''
+        row = self.conn.execute('SELECT data FROM progress WHERE path = ?',
+                                (os.path.abspath(gau_file),)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def put_progress(self, gau_file: str, state: dict):
+        self.conn.execute('INSERT OR REPLACE INTO progress VALUES (?, ?)',
+                          (os.path.abspath(gau_file), json.dumps(state)))
+
+    def drop_progress(self, gau_file: str):
+        self.conn.execute('DELETE FROM progress WHERE path = ?',
+                          (os.path.abspath(gau_file),))
+
+    def prune(self) -> int:
+        '''
+        remove results of files which are deleted or changed and
+        results from an older version of the cache
+        '''
+        stale = set()
+        for path, options, size, mtime in self.conn.execute(
+                'SELECT path, options, size, mtime FROM results'):
+            if json.loads(options).get('version') != CACHE_VERSION:
+                stale.add((path, options))
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stale.add((path, options))
+                continue
+            if stat.st_size != size or stat.st_mtime_ns != mtime:
+                stale.add((path, options))
+        self.conn.executemany(
+            'DELETE FROM results WHERE path = ? AND options = ?', stale)
+        gone = [(path,) for path, in self.conn.execute('SELECT path FROM progress')
+                if not os.path.exists(path)]
+        self.conn.executemany('DELETE FROM progress WHERE path = ?', gone)
+        self.conn.commit()
+        self.conn.execute('VACUUM')
+        return len(stale) + len(gone)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def open_cache(work_dir: str=os.getcwd(), use_hash: bool=False):
+    '''open the cache in work_dir, None if it could not be opened'''
+    try:
+        return ResultCache(work_dir, use_hash)
+    except sqlite3.Error as e:
+        print(f'Warning: cache could not be opened ({e}), all files would be parsed!')
+        return None
+
+
+def prune_cache(work_dir: str=os.getcwd()):
+    '''remove cached results of deleted or changed files in work_dir'''
+    cache = open_cache(work_dir)
+    if cache is None:
+        return
+    n_removed = cache.prune()
+    cache.close()
+    print(f'{n_removed} stale results removed from {CACHE_FILE}!')
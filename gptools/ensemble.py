@@ -0,0 +1,209 @@
+# group conformers into species, drop duplicates and boltzmann weight them
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import re
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from gptools.gauprocess import archive_dir, get_gau_list, collect_data, build_table, split_geometry
+from gptools.thermo import GAS_CONSTANT, J_TO_AU, HARTREE_TO_KCAL
+
+ENSEMBLE_FILE = 'gauprocess_ensemble.csv'
+# species name is the first group, files not matching are species of their own
+ENSEMBLE_PATTERN = r'(.+)[_-]conf\d+$'
+# free energy columns weighted, the ones in the table are used
+FREE_TITLES = ['G', 'qh-G', 'solv-G']
+# conformer pairs aligned at a time
+RMSD_BATCH = 4096
+
+
+def coords_array(geometries: List[dict]) -> np.ndarray:
+    '''coordinates of geometries having the same atoms, (conformers, atoms, 3)'''
+    return np.array([[[float(x), float(y), float(z)] for _, x, y, z in geometry['atoms']]
+                     for geometry in geometries], dtype=float)
+
+
+def pair_rmsd(coords: np.ndarray, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    '''
+    rmsd after the best superposition (kabsch) of each pair of
+    conformers first[k] and second[k], RMSD_BATCH pairs at a time.
+    only the singular values of the covariance matrices are needed,
+    the rotations themselves are never built
+    '''
+    coords = coords - coords.mean(axis=1, keepdims=True)
+    sq_norm = np.einsum('nai,nai->n', coords, coords)
+    n_atoms = coords.shape[1]
+    rmsd = np.empty(len(first))
+    for start in range(0, len(first), RMSD_BATCH):
+        i = first[start:start + RMSD_BATCH]
+        j = second[start:start + RMSD_BATCH]
+        cov = np.einsum('nai,naj->nij', coords[i], coords[j])
+        u, s, vt = np.linalg.svd(cov)
+        # no reflections, the smallest singular value is flipped instead
+        sign = np.sign(np.linalg.det(u) * np.linalg.det(vt))
+        s[:, -1] *= np.where(sign == 0, 1.0, sign)
+        msd = (sq_norm[i] + sq_norm[j] - 2 * s.sum(axis=1)) / n_atoms
+        rmsd[start:start + RMSD_BATCH] = np.sqrt(np.maximum(msd, 0.0))
+    return rmsd
+
+
+def find_duplicates(energies: np.ndarray,
+                    coords: np.ndarray,
+                    e_window: float=0.1,
+                    rmsd_threshold: float=0.125,
+                    ) -> np.ndarray:
+    '''
+    index of the conformer each one duplicates (itself if unique).
+    going up in energy, a conformer duplicates a lower unique one if
+    their energies (hartree) are within e_window (kcal/mol) and their
+    rmsd is below rmsd_threshold (angstrom). only pairs inside the energy
+    window are aligned, all of them at once
+    '''
+    n = len(energies)
+    order = np.argsort(energies, kind='stable')
+    sorted_e = energies[order] * HARTREE_TO_KCAL
+    # pairs (lower, higher) of sorted conformers inside the energy window
+    counts = np.searchsorted(sorted_e, sorted_e + e_window, side='right') - np.arange(n) - 1
+    first = np.repeat(np.arange(n), counts)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + np.arange(len(first)) - offsets
+    same = pair_rmsd(coords[order], first, second) < rmsd_threshold
+    # matches of each conformer with lower ones, the lowest first
+    by_second = np.argsort(second[same], kind='stable')
+    first, second = first[same][by_second], second[same][by_second]
+
+    duplicate_of = np.arange(n)
+    if len(second):
+        starts = np.flatnonzero(np.r_[True, second[1:] != second[:-1]])
+        for k, lower in zip(second[starts], np.split(first, starts[1:])):
+            unique = lower[duplicate_of[lower] == lower]
+            if len(unique):
+                duplicate_of[k] = unique[0]
+    result = np.empty(n, dtype=int)
+    result[order] = order[duplicate_of]
+    return result
+
+
+def boltzmann(free: np.ndarray, temp: float=298.15) -> dict:
+    '''
+    boltzmann weights of free energies (hartree) at temp, with the
+    weighted average and the free energy of the ensemble
+    '''
+    rt = GAS_CONSTANT * temp / J_TO_AU  # hartree
+    rel = free - free.min()
+    factor = np.exp(-rel / rt)
+    weights = factor / factor.sum()
+    return {'weights': weights,
+            'boltz': float(np.sum(weights * free)),
+            'ens': float(free.min() - rt * np.log(factor.sum()))}
+
+
+def species_name(file_name: str, pattern: re.Pattern) -> str:
+    match = pattern.match(file_name)
+    return match.group(1) if match else file_name
+
+
+def ensemble_table(data_df: pd.DataFrame,
+                   geometries: dict,
+                   temp: float=298.15,
+                   pattern: str=ENSEMBLE_PATTERN,
+                   e_window: float=0.1,
+                   rmsd_threshold: float=0.125,
+                   ) -> pd.DataFrame:
+    '''
+    one row per species of normal terminated files (single points, name_sp,
+    left out), conformers grouped by the first group of pattern.
+    duplicates (see find_duplicates) are dropped, then every free energy
+    column of the table is given as the lowest one, the boltzmann
+    weighted average (_boltz) and the free energy of the ensemble (_ens)
+    '''
+    pattern = re.compile(pattern)
+    data_df = data_df[(data_df['status'] == 'Normal') &
+                      ~data_df['file_name'].str.endswith('_sp')]
+    free_titles = [title for title in FREE_TITLES if title in data_df.columns]
+
+    rows = []
+    species = data_df['file_name'].map(lambda name: species_name(name, pattern))
+    for name, group in data_df.groupby(species, sort=True):
+        group = group.dropna(subset=['E'] + free_titles)
+        if group.empty:
+            continue
+        # conformers are only compared with ones of the same atoms
+        keep = np.ones(len(group), dtype=bool)
+        atoms = [tuple(atom[0] for atom in geometries[file]['atoms'])
+                 if file in geometries else None for file in group['file_name']]
+        for key in set(atoms) - {None}:
+            index = np.array([k for k, atom in enumerate(atoms) if atom == key])
+            coords = coords_array([geometries[group['file_name'].iloc[k]] for k in index])
+            duplicate_of = find_duplicates(group['E'].to_numpy(dtype=float)[index],
+                                           coords, e_window, rmsd_threshold)
+            keep[index] = duplicate_of == np.arange(len(index))
+        unique = group[keep]
+
+        row = {'species': name, 'conformers': len(group), 'unique': len(unique)}
+        if free_titles:
+            row['lowest'] = unique['file_name'].iloc[int(np.argmin(unique[free_titles[-1]]))]
+        for title in free_titles:
+            free = unique[title].to_numpy(dtype=float)
+            weighted = boltzmann(free, temp)
+            row[f'{title}_min'] = round(float(free.min()), 6)
+            row[f'{title}_boltz'] = round(weighted['boltz'], 6)
+            row[f'{title}_ens'] = round(weighted['ens'], 6)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def ensemble(work_dir: str=os.getcwd(),
+             inp_file: str=None,
+             need_entropy: bool=False,
+             need_goodvibes: bool=False,
+             temp: float=298.15,
+             conc: float=1.0,
+             factor_rot: float=0.5,
+             factor_trans: float=0.5,
+             jobs: int=1,
+             use_cache: bool=True,
+             cache_hash: bool=False,
+             freq_scale: float=1.0,
+             pattern: str=ENSEMBLE_PATTERN,
+             e_window: float=0.1,
+             rmsd_threshold: float=0.125,
+             ):
+    '''
+    process the files like process (builtin quasi-harmonic engine) with
+    their last geometries, then group conformers into species by the
+    naming rule pattern, drop duplicate conformers and weight the rest
+    by boltzmann at temp, see ensemble_table.
+    output to a csv file with one row per species
+    '''
+    work_dir, inp_file = archive_dir(work_dir, inp_file)
+    gau_list = get_gau_list(work_dir, inp_file)
+    if not gau_list:
+        return
+
+    print(f'Temperature used is {temp}K!')
+    print(f'Concentration used is {conc}M!')
+    print('Extracting data from gaussian output!')
+    data_list = collect_data(work_dir, gau_list, need_entropy, need_goodvibes,
+                             jobs, use_cache, cache_hash, need_geometry=True)
+    geometries = split_geometry(data_list)
+    data_df = build_table(data_list, work_dir, need_entropy, need_goodvibes,
+                          temp, conc, factor_rot, factor_trans,
+                          'builtin', freq_scale)
+
+    print(f'Grouping conformers by {pattern}, energy window {e_window} kcal/mol '
+          f'and RMSD {rmsd_threshold} A!')
+    ensemble_df = ensemble_table(data_df, geometries, temp, pattern, e_window, rmsd_threshold)
+    if ensemble_df.empty:
+        print('No normal terminated files found!')
+        return
+
+    n_dropped = int((ensemble_df['conformers'] - ensemble_df['unique']).sum())
+    print(f'{len(ensemble_df)} species found, {n_dropped} duplicate conformers dropped!')
+    ensemble_df.to_csv(ENSEMBLE_FILE, index=False)
+    print(f'All data wrote to {ENSEMBLE_FILE} in current folder!')
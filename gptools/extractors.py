@@ -6,10 +6,20 @@
 import os
 import re
 import sys
-from copy import copy
+from array import array
+from collections import deque
 from typing import List
 
-import pandas as pd
+from gptools.profiling import staged, count, count_lines
+from gptools.logfile import (
+    open_log,
+    open_buffer,
+    read_tail,
+    get_line,
+    get_lines,
+    get_next_lines,
+    find_archives,
+)
 
 # template to get single point energy
 PATTERN_LIST = [
@@ -20,175 +30,894 @@ PATTERN_LIST = [
     r'MP2=(-?\d+\.\d+)(\\|\|)S',
     r'HF=(-?\d+\.\d+)(\\|\|)S',
 ]
+# same templates to search raw bytes
+BYTES_PATTERN_LIST = [pattern.encode() for pattern in PATTERN_LIST]
+# charge and multiplicity of the molecule
+CHARGE_PATTERN = re.compile(r'Charge\s*=\s*(-?\d+)\s+Multiplicity\s*=\s*(\d+)')
+# element symbols by atomic number
+ELEMENTS = [
+    'X', 'H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne',
+    'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar', 'K', 'Ca',
+    'Sc', 'Ti', 'V', 'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn',
+    'Ga', 'Ge', 'As', 'Se', 'Br', 'Kr', 'Rb', 'Sr', 'Y', 'Zr',
+    'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd', 'In', 'Sn',
+    'Sb', 'Te', 'I', 'Xe', 'Cs', 'Ba', 'La', 'Ce', 'Pr', 'Nd',
+    'Pm', 'Sm', 'Eu', 'Gd', 'Tb', 'Dy', 'Ho', 'Er', 'Tm', 'Yb',
+    'Lu', 'Hf', 'Ta', 'W', 'Re', 'Os', 'Ir', 'Pt', 'Au', 'Hg',
+    'Tl', 'Pb', 'Bi', 'Po', 'At', 'Rn', 'Fr', 'Ra', 'Ac', 'Th',
+    'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk', 'Cf', 'Es', 'Fm',
+    'Md', 'No', 'Lr', 'Rf', 'Db', 'Sg', 'Bh', 'Hs', 'Mt', 'Ds',
+    'Rg', 'Cn', 'Nh', 'Fl', 'Mc', 'Lv', 'Ts', 'Og',
+]
+# headers of the coordinate tables, standard orientation is used if printed
+ORIENTATIONS = ['Standard orientation:', 'Input orientation:']
 
 
-def get_status(gauf):
+class LogScanner:
     '''
-    judge whether the job has terminated normally
+    single pass scanner over gaussian output lines.
+    every line is looked at once and only the lines the extractors
+    below need are kept, so an open file could be streamed directly
+    instead of being read in full by readlines().
     '''
-    is_normal = 0 
-    try:
-        for i in range(1,10):
-            if 'Normal termination' in gauf[-i]:
-                is_normal = 1
+    def __init__(self, need_thermo: bool=False, need_geometry: bool=False,
+                 need_archive: bool=True):
+        self.n_lines = 0
+        self.head = []  # first lines of the file
+        self.tail = deque(maxlen=9)  # last lines of the file
+        # single point energy, archive lines are only skipped if not needed
+        # (searched from the end of the file instead, see find_archives)
+        self.need_archive = need_archive
+        self.archive = []
+        self.in_archive = False
+        # frequencies
+        self.num_imag = 0
+        self.num_real = 0
+        self.freq_cons = 0.0
+        self.freq_error = False
+        self.freq_done = False
+        # free energy
+        self.free_corr = 0.0
+        self.free_energy = 0.0
+        # entropy, lines after the first free energy line
+        self.entropy_lines = None
+        # optimization
+        self.step_line = None
+        self.converge_lines = None
+        # inputs of quasi-harmonic thermochemistry (upon request)
+        self.need_thermo = need_thermo
+        self.job_freqs = []
+        self.job_has_freq = False
+        self.energy = None
+        self.mass = None
+        self.rotemp = None
+        self.symmno = 1
+        self.linear = False
+        self.mult = 1
+        self.zpe_corr = None
+        self.thermo = None
+        # last coordinate tables and charge line (upon request)
+        self.need_geometry = need_geometry
+        self.orientations = {}
+        self.geom_header = None
+        self.geom_rows = None
+        self.geom_dashes = 0
+        self.charge_line = None
+
+    def feed(self, line):
+        '''take one line of the output file'''
+        self.n_lines += 1
+        if self.n_lines <= 4:
+            self.head.append(line)
+        self.tail.append(line)
+
+        # collect lines following the matched ones
+        if self.converge_lines is not None and len(self.converge_lines) < 4:
+            self.converge_lines.append(line)
+        if self.entropy_lines is not None and len(self.entropy_lines) < 8:
+            self.entropy_lines.append(line)
+
+        # archive entry at the end of each job
+        if self.in_archive:
+            if self.need_archive:
+                self.archive.append(line.strip())
+            if line.rstrip().endswith('@'):
+                self.in_archive = False
+            return
+        if line.startswith(' 1\\1\\') or line.startswith(' 1|1|'):
+            self.in_archive = True
+            if self.need_archive:
+                self.archive.append(line.strip())
+            return
+
+        if 'Step number' in line:
+            self.step_line = line
+        elif 'Converged?' in line:
+            self.converge_lines = []
+        elif not self.freq_done and 'Frequencies --' in line:
+            if line.strip().startswith('Frequencies --'):
+                self._feed_freq(line)
+        elif 'Thermal correction to Gibbs Free Energy=' in line:
+            self.free_corr = line.split()[-1]
+        elif 'Sum of electronic and thermal Free Energies=' in line:
+            self.free_energy = line.split()[-1]
+            if self.entropy_lines is None:
+                self.entropy_lines = []
+
+        if self.need_thermo:
+            try:
+                self._feed_thermo(line)
+            except (ValueError, IndexError):
+                pass
+        if self.need_geometry:
+            self._feed_geometry(line)
+
+    def _feed_geometry(self, line):
+        # table: header, dashes, two title lines, dashes, rows, dashes
+        if self.geom_rows is not None:
+            if line.startswith(' ---'):
+                self.geom_dashes += 1
+                if self.geom_dashes == 3:
+                    self.orientations[self.geom_header] = self.geom_rows
+                    self.geom_rows = None
+            elif self.geom_dashes == 2:
+                self.geom_rows.append(line)
+        elif 'orientation:' in line:
+            for header in ORIENTATIONS:
+                if header in line:
+                    self.geom_header = header
+                    self.geom_rows = []
+                    self.geom_dashes = 0
+        elif 'Multiplicity =' in line:
+            self.charge_line = line
+
+    def _feed_thermo(self, line):
+        # values are kept the same way as goodvibes: frequencies from the
+        # last job having them, other values as last seen until its end
+        if 'Frequencies --' in line:
+            if line.strip().startswith('Frequencies --'):
+                self.job_has_freq = True
+                for fr in line.split()[2:]:
+                    self.job_freqs.append(float(fr))
+        elif 'SCF Done:' in line:
+            self.energy = float(line.split()[4])
+        elif 'EUMP2 =' in line:
+            self.energy = float(line.split()[5].replace('D', 'E'))
+        elif 'ONIOM: extrapolated energy' in line:
+            self.energy = float(line.split()[4])
+        elif 'Multiplicity' in line:
+            self.mult = int(line.split('=')[-1].split()[0])
+        elif 'Molecular mass:' in line:
+            self.mass = float(line.split()[2])
+        elif 'Rotational symmetry number' in line:
+            self.symmno = int(line.split()[3].split('.')[0])
+        elif 'Full point group' in line:
+            self.linear = line.split()[3] in ('D*H', 'C*V')
+        elif 'Rotational temperature' in line:
+            rotemp = []
+            for value in line.split()[3:]:
+                try:
+                    rotemp.append(float(value))
+                except ValueError:  # ******** for linear molecules
+                    pass
+            self.rotemp = rotemp
+        elif 'Zero-point correction=' in line:
+            self.zpe_corr = float(line.split()[2])
+        elif 'Normal termination' in line:
+            if self.job_has_freq:
+                self.thermo = {'energy': self.energy,
+                               'freqs': self.job_freqs,
+                               'mass': self.mass,
+                               'rotemp': self.rotemp,
+                               'symmno': self.symmno,
+                               'linear': self.linear,
+                               'mult': self.mult,
+                               'zpe_corr': self.zpe_corr}
+            self.job_freqs = []
+            self.job_has_freq = False
+
+    def _feed_freq(self, line):
+        try:
+            freqs = line.split()[2:]
+            for fr in freqs:
+                if float(fr) < 0.0:
+                    self.num_imag += 1
+                    if float(fr) < self.freq_cons:
+                        self.freq_cons = float(fr)
+                elif float(fr) > 0.0:
+                    self.num_real += 1
+                    if self.freq_cons == 0.0:
+                        self.freq_cons = float(fr)
+            if self.num_real:
+                self.freq_done = True
+        except:
+            self.freq_error = True
+            self.freq_done = True
+
+    @staged('LogScanner.scan')
+    def scan(self, gauf):
+        '''take all lines from a list or an open file'''
+        for line in count_lines(gauf):
+            self.feed(line)
+        return self
+
+    def status(self):
+        return status_from_lines(self.tail)
+
+    def imag_freq(self):
+        num_imag = self.num_imag
+        freq_cons = self.freq_cons
+        if self.freq_error:
+            num_imag = -1
+            freq_cons = 0.0
+        if num_imag == 0 and self.num_real == 0:
+            num_imag = -1
+            freq_cons = 0.0
+        return {'num_imag': int(num_imag), 'freq_cons': round(freq_cons, 2)}
+
+    def thermo_data(self):
+        '''
+        inputs of quasi-harmonic thermochemistry from the last normal
+        terminated frequency job, None if any of them is missing
+        '''
+        thermo = self.thermo
+        if thermo is None:
+            return None
+        if None in (thermo['energy'], thermo['mass'], thermo['zpe_corr']) or not thermo['rotemp']:
+            return None
+        return thermo
+
+    def sp_energy(self):
+        return sp_energy_from_archive(''.join(self.archive))
+
+    def free_energy_terms(self):
+        try:
+            free_corr = round(float(self.free_corr), 6)
+            free_energy = round(float(self.free_energy), 6)
+        except:
+            free_corr = -1.0
+            free_energy = -1.0
+        return {'G_corr': free_corr, 'G': free_energy}
+
+    def opt_points(self):
+        return opt_points_from_line(self.step_line)
+
+    def converge(self):
+        return converge_from_lines(self.converge_lines, self.head)
+
+    def geometry(self):
+        for header in ORIENTATIONS:
+            if header in self.orientations:
+                return geometry_from_rows(self.orientations[header], self.charge_line)
+        return None
+
+    def entropy(self):
+        tot_S = -1.0
+        elec_S = -1.0
+        trans_S = -1.0
+        rot_S = -1.0
+        vib_S = -1.0
+
+        if self.entropy_lines is not None:
+            lines = self.entropy_lines
+            tot_S = round(float(lines[3].split()[-1]), 3)
+            elec_S = round(float(lines[4].split()[-1]), 3)
+            trans_S = round(float(lines[5].split()[-1]), 3)
+            rot_S = round(float(lines[6].split()[-1]), 3)
+            vib_S = round(float(lines[7].split()[-1]), 3)
+
+        return {'S_tot': tot_S, 'S_elec': elec_S,
+                'S_trans': trans_S, 'S_rot': rot_S, 'S_vib': vib_S}
+
+
+@staged('scan_jobs')
+def scan_jobs(gauf, need_thermo: bool=False, need_geometry: bool=False) -> List[LogScanner]:
+    '''
+    stream lines once, split into sub-jobs at each termination line
+    (--Link1-- chains and internal steps like the freq of opt freq),
+    one scanner per sub-job. a trailing part with no output is dropped
+    '''
+    scanners = [LogScanner(need_thermo, need_geometry)]
+    for line in count_lines(gauf):
+        scanner = scanners[-1]
+        scanner.feed(line)
+        if 'Normal termination' in line or 'Error termination' in line:
+            # multiplicity is not always printed again in the next step
+            scanners.append(LogScanner(need_thermo, scanner.need_geometry))
+            scanners[-1].mult = scanner.mult
+            scanners[-1].charge_line = scanner.charge_line
+    if len(scanners) > 1 and not any(line.strip() for line in scanners[-1].tail):
+        scanners.pop()
+    return scanners
+
+
+def sp_energy_from_archive(archive):
+    '''
+    get single point energy from the joined archive entries (str or bytes)
+    if error occurs, return -1.0
+    '''
+    if isinstance(archive, bytes):
+        pattern_list = BYTES_PATTERN_LIST
+    else:
+        pattern_list = PATTERN_LIST
+
+    for pattern in pattern_list:
+        match = re.search(pattern, archive)
+        if match:
+            try:
+                sp_energy = round(float(match.group(1)), 6)
                 break
+            except ValueError:
+                sp_energy = -1.0
+        else:
+            sp_energy = -1.0
+
+    return {'E': sp_energy}
+
+
+def geometry_from_rows(rows, charge_line):
+    '''
+    charge, multiplicity and atoms (element and x, y, z as printed) from
+    the rows of a coordinate table and the charge line.
+    None if there is no row, charge and multiplicity are None if not found
+    '''
+    if not rows:
+        return None
+    atoms = []
+    for row in rows:
+        words = row.split()
+        number = int(words[1])
+        symbol = ELEMENTS[number] if 0 < number < len(ELEMENTS) else 'X'
+        atoms.append([symbol, words[-3], words[-2], words[-1]])
+    charge = mult = None
+    match = CHARGE_PATTERN.search(charge_line or '')
+    if match:
+        charge, mult = int(match.group(1)), int(match.group(2))
+    return {'charge': charge, 'mult': mult, 'atoms': atoms}
+
+
+def opt_points_from_line(step_line):
+    '''get optimization points from the last 'Step number' line'''
+    opt_points = 0
+    try:
+        if step_line is not None:
+            opt_points = step_line.split()[2]
+        opt_points = int(opt_points)
     except:
-        is_normal = 0
+        opt_points = -1
+
+    return {'opt_points': int(opt_points)}
+
 
+def converge_from_lines(converge_lines, head):
+    '''
+    get converge status from the lines following the last 'Converged?'.
+    the last step could be cut off, then the search wraps around to
+    the head lines of the file like a negative list index does
+    '''
+    converge = 0
+    if converge_lines is not None:
+        lines = converge_lines + head
+        try:
+            for j in range(4):
+                if lines[j].split()[-1] == 'YES':
+                    converge += 1
+        except:
+            converge = -1
+
+    return {'converge': int(converge)}
+
+
+def status_from_lines(tail_lines):
+    '''normal termination in the last 9 lines, 1 if so and 0 if not'''
+    is_normal = 0
+    for line in list(tail_lines)[-9:]:
+        if 'Normal termination' in line:
+            is_normal = 1
+            break
     return is_normal
 
 
+def as_scanner(gauf) -> LogScanner:
+    '''
+    the lines (a list or an open file) scanned once, a scanner is used as
+    it is, so several fields of one file could share one scan:
+    scanner = as_scanner(gauf); get_sp_energy(scanner); get_entropy(scanner)
+    '''
+    if isinstance(gauf, LogScanner):
+        return gauf
+    return LogScanner().scan(gauf)
+
+
+@staged('get_status')
+def get_status(gauf):
+    '''
+    judge whether the job has terminated normally,
+    only the last lines are looked at
+    '''
+    if isinstance(gauf, LogScanner):
+        return gauf.status()
+    if isinstance(gauf, list):
+        return status_from_lines(gauf[-9:])
+    return status_from_lines(deque(gauf, maxlen=9))
+
+
+@staged('get_imag_freq')
 def get_imag_freq(gauf):
     '''
     get number of imaginary freqencies if avaliable.
     if no freq info, return -1
     '''
-    try:
-        num_imag = 0
-        num_real = 0
-        freq_cons = 0.0
-        for line in gauf:
-            if line.strip().startswith('Frequencies --'):
-                freqs = line.split()[2:]
-                for fr in freqs:
-                    if float(fr) < 0.0:
-                        num_imag += 1
-                        if float(fr) < freq_cons:
-                            freq_cons = float(fr)
-                    elif float(fr) > 0.0:
-                        num_real += 1
-                        if freq_cons == 0.0:
-                            freq_cons = float(fr)
-                if num_real:
-                    break
-    except:
-        num_imag = -1
-        freq_cons = 0.0
-    
-    if num_imag == 0 and num_real == 0:
-        num_imag = -1
-        freq_cons = 0.0
-    
-    return {'num_imag': int(num_imag), 'freq_cons': round(freq_cons, 2)}
+    return as_scanner(gauf).imag_freq()
 
 
+@staged('get_sp_energy')
 def get_sp_energy(gauf: List[str]):
     '''
     get single point energy data in gaussian output file
     if error occurs, return -1.0
     '''
-    gauf = [x.strip() for x in gauf]
-    gauf = ''.join(gauf)
-    gauf = gauf.replace('\n', '')
-
-    for pattern in PATTERN_LIST:
-        match = re.search(pattern, gauf)
-        if match:
-            try:
-                sp_energy = round(float(match.group(1)), 6)
-                break
-            except ValueError:
-                sp_energy = -1.0
-        else:
-            sp_energy = -1.0
-
-    return {'E': sp_energy}
+    return as_scanner(gauf).sp_energy()
 
 
+@staged('get_free_energy')
 def get_free_energy(gauf):
     '''
     get free energy data in gaussian output file
     if error occurs, return -1.0
     '''
-    free_corr = 0.0
-    free_energy = 0.0
-    try:
-        for i in range(len(gauf)):
-            if 'Thermal correction to Gibbs Free Energy=' in gauf[i]:
-                free_corr = gauf[i].split()[-1]
-            if 'Sum of electronic and thermal Free Energies=' in gauf[i]:
-                free_energy = gauf[i].split()[-1]
-
-        free_corr = round(float(free_corr), 6)
-        free_energy = round(float(free_energy), 6)
-    except:
-        free_corr = -1.0
-        free_energy = -1.0
-
-    return {'G_corr': free_corr, 'G': free_energy}
+    return as_scanner(gauf).free_energy_terms()
 
 
+@staged('get_opt_points')
 def get_opt_points(gauf):
     '''
     get how many optimization points are there in the output file
     by searching for Step number * in the file
     '''
-    rev_gauf = copy(gauf)
-    rev_gauf.reverse() # search from the bottom
-
-    opt_points = 0
-    try:
-        for i in range(len(rev_gauf)):
-            
-            if 'Step number' in rev_gauf[i]:
-                opt_points = rev_gauf[i].split()[2]
-                break
-        opt_points = int(opt_points)
-    except:
-        opt_points = -1
-    
-    return {'opt_points': int(opt_points)}
+    return as_scanner(gauf).opt_points()
 
 
+@staged('get_converge')
 def get_converge(gauf):
     '''
     get converge status for optimization jobs
     number refers to how many 'yes' are there in the last step
     '''
-    rev_gauf = copy(gauf)
-    rev_gauf.reverse() # search from the bottom
+    return as_scanner(gauf).converge()
 
-    converge = 0
-    try:
-        for i in range(len(rev_gauf)):
-            if 'Converged?' in rev_gauf[i]:
-                for j in range(1,5):
-                    if rev_gauf[i-j].split()[-1] == 'YES':
-                        converge += 1
+
+@staged('get_status_from_file')
+def get_status_from_file(gau_file):
+    '''
+    judge whether the job has terminated normally,
+    only the last lines are read from the end of the file
+    '''
+    return status_from_lines(read_tail(gau_file))
+
+
+@staged('get_sp_energy_from_file')
+def get_sp_energy_from_file(gau_file):
+    '''
+    get single point energy from the archive entries searched in raw
+    bytes, the same energy as LogScanner gives (the first match of the
+    templates over all entries, so the first job of a --Link1-- chain)
+    '''
+    with open_buffer(gau_file) as buf:
+        return sp_energy_from_archive(find_archives(buf))
+
+
+@staged('get_opt_from_file')
+def get_opt_from_file(gau_file):
+    '''
+    get optimization points and converge status of the last step,
+    both searched from the end of the file in raw bytes
+    '''
+    def decode(lines):
+        return [line.decode(errors='replace') for line in lines]
+
+    with open_buffer(gau_file) as buf:
+        step_line = None
+        pos = buf.rfind(b'Step number')
+        if pos >= 0:
+            step_line = get_line(buf, pos).decode(errors='replace')
+        converge_lines = None
+        pos = buf.rfind(b'Converged?')
+        if pos >= 0:
+            converge_lines = decode(get_next_lines(buf, pos, 4))
+        head = decode(get_lines(buf, 0, 4))
+
+    data_dict = opt_points_from_line(step_line)
+    data_dict.update(converge_from_lines(converge_lines, head))
+    return data_dict
+
+
+@staged('get_geometry_from_file')
+def get_geometry_from_file(gau_file):
+    '''
+    get the last geometry (standard orientation, or input orientation
+    with nosymm) with charge and multiplicity, both searched from the
+    end of the file in raw bytes. None if no coordinates are printed
+    '''
+    with open_buffer(gau_file) as buf:
+        for header in ORIENTATIONS:
+            pos = buf.rfind(header.encode())
+            if pos >= 0:
                 break
-    except:
-        converge = -1
+        else:
+            return None
+        # skip the header, dashes, two title lines and dashes
+        start = buf.find(b'\n', pos) + 1
+        start += sum(len(line) for line in get_lines(buf, start, 4))
+        rows = []
+        while start < len(buf):
+            end = buf.find(b'\n', start)
+            end = len(buf) if end < 0 else end + 1
+            line = buf[start:end]
+            if line.startswith(b' ---'):
+                break
+            rows.append(line.decode(errors='replace'))
+            start = end
+        charge_line = None
+        pos = buf.rfind(b'Multiplicity =')
+        if pos >= 0:
+            charge_line = get_line(buf, pos).decode(errors='replace')
+    return geometry_from_rows(rows, charge_line)
 
-    return {'converge': int(converge)}
+
+@staged('get_geometry')
+def get_geometry(gauf):
+    '''
+    get the last geometry with charge and multiplicity from the lines,
+    None if no coordinates are printed
+    '''
+    return LogScanner(need_geometry=True).scan(gauf).geometry()
+
+
+# coordinate tables of path points, the first one found is used
+PATH_ORIENTATIONS = ['Input orientation:', 'Standard orientation:']
+# path of a point: a scan, the TS and the forward and reverse paths of an IRC
+PATH_SCAN, PATH_FORWARD, PATH_REVERSE = 0, 1, 2
+
+
+class PathScanner:
+    '''
+    single pass scanner over the points of relaxed scans (opt=modredundant)
+    and IRCs. only the coordinate table being read is kept as lines, each
+    point is packed into flat arrays when found, so memory grows with the
+    points and not with the file.
+    a scan point is a parameter table (optimized or not) with scanned
+    coordinates, their values are its coordinate. an IRC point is a
+    'Point Number' entry, its coordinate is the net reaction coordinate
+    (amu^1/2 bohr), negative along the reverse path, the TS is point 0
+    '''
+    def __init__(self):
+        self.n_lines = 0
+        self.kind = None  # 'scan' or 'irc' once a point is found
+        self.names = []  # scanned coordinates, e.g. D(4,1,5,6)
+        self.symbols = []
+        # one value per point, n_coords values and atoms * 3 coordinates
+        self.coordinate = array('d')
+        self.energy = array('d')
+        self.converged = array('b')
+        self.path = array('b')
+        self.xyz = array('d')
+        # state of the job being read
+        self.last_energy = float('nan')
+        self.opt_done = False
+        self.params = None  # (name, value) of scanned rows of the table read
+        self.params_dashes = 0
+        self.irc_path = None
+        self.start = None  # energy and rows of the first geometry (TS)
+        # last coordinate tables, the same as LogScanner
+        self.orientations = {}
+        self.geom_header = None
+        self.geom_rows = None
+        self.geom_dashes = 0
+        self.charge_line = None
+
+    _feed_geometry = LogScanner._feed_geometry
+
+    def feed(self, line):
+        '''take one line of the output file'''
+        self.n_lines += 1
+        self._feed_geometry(line)
+        if self.params is not None:
+            self._feed_params(line)
+            return
+        try:
+            if 'SCF Done:' in line:
+                self._set_energy(float(line.split()[4]))
+            elif 'EUMP2 =' in line:
+                self._set_energy(float(line.split()[5].replace('D', 'E')))
+            elif 'ONIOM: extrapolated energy' in line:
+                self._set_energy(float(line.split()[4]))
+            elif 'Optimization completed' in line:
+                self.opt_done = True
+            elif 'Optimization stopped' in line:
+                self.opt_done = False
+            elif 'Optimized Parameters' in line:
+                # Non-Optimized Parameters too, when the step limit is reached
+                self.params = []
+                self.params_dashes = 0
+            elif 'Point Number' in line:
+                self._feed_irc_point(line)
+            elif 'NET REACTION COORDINATE UP TO THIS POINT' in line:
+                if self.irc_path is not None:
+                    value = float(line.split('=')[-1])
+                    self._add_irc_point(value, self.irc_path)
+                    self.irc_path = None
+        except (ValueError, IndexError):
+            pass
+
+    def _set_energy(self, energy):
+        self.last_energy = energy
+        if self.start is None:
+            self.start = (energy, self._point_rows())
+
+    def _feed_params(self, line):
+        # table: dashes, title line, dashes, rows, dashes
+        if line.startswith(' ---'):
+            self.params_dashes += 1
+            if self.params_dashes == 3:
+                if self.params:
+                    self._add_scan_point()
+                self.params = None
+                self.opt_done = False
+        elif self.params_dashes == 2 and line.startswith(' !'):
+            words = line.split()
+            if len(words) > 4 and words[4] == 'Scan':
+                try:
+                    self.params.append((words[2], float(words[3])))
+                except ValueError:
+                    pass
+
+    def _feed_irc_point(self, line):
+        # g16: 'Point Number:   3          Path Number:   2'
+        # g09: 'Point Number  3 in REVERSE path direction.'
+        words = line.replace(':', ' ').split()
+        if 'Path' in words:
+            path = int(words[words.index('Path') + 2])
+        elif 'REVERSE' in words:
+            path = PATH_REVERSE
+        elif 'FORWARD' in words:
+            path = PATH_FORWARD
+        else:
+            return
+        number = int(words[words.index('Number') + 1])
+        self.irc_path = PATH_SCAN if number == 0 else path
+
+    def _point_rows(self):
+        for header in PATH_ORIENTATIONS:
+            if header in self.orientations:
+                return self.orientations[header]
+        return None
+
+    def _add_point(self, coordinate, energy, converged, path, rows):
+        if not rows:
+            return False
+        if not self.symbols:
+            for row in rows:
+                number = int(row.split()[1])
+                self.symbols.append(ELEMENTS[number] if 0 < number < len(ELEMENTS) else 'X')
+        elif len(rows) != len(self.symbols):
+            return False
+        xyz = [float(value) for row in rows for value in row.split()[-3:]]
+        self.coordinate.extend(coordinate)
+        self.energy.append(energy)
+        self.converged.append(converged)
+        self.path.append(path)
+        self.xyz.extend(xyz)
+        return True
+
+    def _add_scan_point(self):
+        names = [name for name, _ in self.params]
+        if self.kind is None:
+            self.kind = 'scan'
+            self.names = names
+        elif self.kind != 'scan' or names != self.names:
+            return
+        self._add_point([value for _, value in self.params], self.last_energy,
+                        self.opt_done, PATH_SCAN, self._point_rows())
+
+    def _add_irc_point(self, value, path):
+        if self.kind is None:
+            self.kind = 'irc'
+            self.names = ['IRC']
+            # the TS the paths start from, unless printed as point 0
+            if path != PATH_SCAN and self.start is not None:
+                self._add_point([0.0], self.start[0], True, PATH_SCAN, self.start[1])
+        elif self.kind != 'irc':
+            return
+        if path == PATH_SCAN and PATH_SCAN in self.path:
+            return
+        if path == PATH_REVERSE:
+            value = -abs(value)
+        self._add_point([value], self.last_energy, True, path, self._point_rows())
+
+    @staged('PathScanner.scan')
+    def scan(self, gauf):
+        '''take all lines from a list or an open file'''
+        for line in count_lines(gauf):
+            self.feed(line)
+        return self
+
+    def __len__(self):
+        return len(self.energy)
+
+    def arrays(self) -> dict:
+        '''
+        the points as numpy arrays: coordinate (points, len(names)),
+        energy, converged, path (see PATH_SCAN) and xyz (points, atoms, 3)
+        with the names of the coordinates and the symbols of the atoms.
+        IRC points are sorted along the reaction coordinate
+        '''
+        import numpy as np
+
+        n = len(self.energy)
+        arrays = {
+            'coordinate': np.frombuffer(self.coordinate, dtype=float).reshape(n, -1)
+                          if n else np.empty((0, len(self.names))),
+            'energy': np.frombuffer(self.energy, dtype=float),
+            'converged': np.frombuffer(self.converged, dtype=np.int8).astype(bool),
+            'path': np.frombuffer(self.path, dtype=np.int8),
+            'xyz': np.frombuffer(self.xyz, dtype=float).reshape(n, len(self.symbols), 3),
+        }
+        if self.kind == 'irc':
+            order = np.argsort(arrays['coordinate'][:, 0], kind='stable')
+            arrays = {key: value[order] for key, value in arrays.items()}
+        else:
+            arrays = {key: value.copy() for key, value in arrays.items()}
+        arrays['names'] = np.array(self.names, dtype=str)
+        arrays['symbols'] = np.array(self.symbols, dtype=str)
+        return arrays
+
+
+@staged('get_path')
+def get_path(gau_file) -> PathScanner:
+    '''
+    points of the relaxed scans or IRC of gau_file (compressed or not),
+    streamed once, see PathScanner
+    '''
+    with open_log(gau_file) as f:
+        return PathScanner().scan(f)
+
+
+# columns of the optimization history of OptTracker
+HISTORY_COLUMNS = ['step', 'energy', 'max_force', 'rms_force', 'max_disp', 'n_yes']
 
 
+class OptTracker:
+    '''
+    follow a running (or failed) optimization across runs.
+    the state (byte offset of the first line not read, last 'Step number'
+    line, lines after the last 'Converged?', first lines of the file and
+    the history) is kept as a dict, so the next run reads only the bytes
+    appended since. the file is read from the start again if it was
+    replaced or truncated.
+    history has one row per converge table, see HISTORY_COLUMNS
+    '''
+    def __init__(self, state: dict=None):
+        state = state or {}
+        self.offset = state.get('offset', 0)
+        self.head = state.get('head', [])
+        self.step_line = state.get('step_line')
+        self.converge_lines = state.get('converge_lines')
+        self.energy = state.get('energy')
+        self.history = state.get('history', [])
+        self.partial = ''
+
+    def state(self) -> dict:
+        return {'offset': self.offset,
+                'head': self.head,
+                'step_line': self.step_line,
+                'converge_lines': self.converge_lines,
+                'energy': self.energy,
+                'history': self.history}
+
+    def feed(self, line: str):
+        '''take one whole line'''
+        if len(self.head) < 4:
+            self.head.append(line)
+        if self.converge_lines is not None and len(self.converge_lines) < 4:
+            self.converge_lines.append(line)
+            if len(self.converge_lines) == 4:
+                self._add_step()
+
+        if 'SCF Done:' in line:
+            try:
+                self.energy = float(line.split()[4])
+            except (ValueError, IndexError):
+                pass
+        elif 'Step number' in line:
+            self.step_line = line
+        elif 'Converged?' in line:
+            self.converge_lines = []
+
+    def _add_step(self):
+        values = {}
+        n_yes = 0
+        for line in self.converge_lines:
+            words = line.split()
+            if len(words) < 3:
+                continue
+            if words[-1] == 'YES':
+                n_yes += 1
+            try:
+                if line.startswith(' Maximum Force'):
+                    values['max_force'] = float(words[2])
+                elif line.startswith(' RMS     Force'):
+                    values['rms_force'] = float(words[2])
+                elif line.startswith(' Maximum Displacement'):
+                    values['max_disp'] = float(words[2])
+            except ValueError:
+                pass
+        step = opt_points_from_line(self.step_line)['opt_points']
+        self.history.append([step, self.energy, values.get('max_force'),
+                             values.get('rms_force'), values.get('max_disp'), n_yes])
+
+    def is_same_file(self, buf) -> bool:
+        '''whether the lines read before are still the start of the file'''
+        if len(buf) < self.offset:
+            return False
+        head = [line.decode(errors='replace') for line in get_lines(buf, 0, len(self.head))]
+        return head == self.head
+
+    @staged('OptTracker.update')
+    def update(self, gau_file):
+        '''read lines appended since the last update'''
+        with open_buffer(gau_file) as buf:
+            if not self.is_same_file(buf):
+                self.__init__()
+            pos = self.offset
+            n_lines = 0
+            while True:
+                end = buf.find(b'\n', pos)
+                if end < 0:
+                    break
+                self.feed(buf[pos:end + 1].decode(errors='replace'))
+                pos = end + 1
+                n_lines += 1
+            self.offset = pos
+            count(lines=n_lines)
+            # a last line without newline could still be written, it is
+            # used now but read again next time
+            self.partial = buf[pos:].decode(errors='replace')
+        return self
+
+    def opt_points(self):
+        step_line = self.step_line
+        if 'Step number' in self.partial:
+            step_line = self.partial
+        return opt_points_from_line(step_line)
+
+    def converge(self):
+        converge_lines = self.converge_lines
+        head = self.head
+        if self.partial:
+            if 'Converged?' in self.partial:
+                converge_lines = []
+            elif converge_lines is not None and len(converge_lines) < 4:
+                converge_lines = converge_lines + [self.partial]
+            if len(head) < 4:
+                head = head + [self.partial]
+        return converge_from_lines(converge_lines, head)
+
+
+@staged('get_entropy')
 def get_entropy(gauf):
     '''
     get different (rot, trans, vib, total) entropies from freq calculation
     useful when doing correction for implicit solvent model
     '''
-    tot_S = -1.0
-    elec_S = -1.0
-    trans_S = -1.0
-    rot_S = -1.0
-    vib_S = -1.0
-
-    for i in range(len(gauf)):
-        if 'Sum of electronic and thermal Free Energies=' in gauf[i]:
-            idx = i + 4
-            tot_S = round(float(gauf[idx].split()[-1]), 3)
-            elec_S = round(float(gauf[idx+1].split()[-1]), 3)
-            trans_S = round(float(gauf[idx+2].split()[-1]), 3)
-            rot_S = round(float(gauf[idx+3].split()[-1]), 3)
-            vib_S = round(float(gauf[idx+4].split()[-1]), 3)
-            break
-
-    return {'S_tot': tot_S, 'S_elec': elec_S, 
-            'S_trans': trans_S, 'S_rot': rot_S, 'S_vib': vib_S}
+    return as_scanner(gauf).entropy()
 
 
+@staged('extract_goodvibes_result')
 def extract_goodvibes_result(gv_file='Goodvibes_output.dat'):
     '''extract results from goodvibes outputfile'''
+    import pandas as pd
+
     with open(gv_file, 'r') as g:
         glines = g.readlines()
     
@@ -222,33 +951,44 @@ def extract_goodvibes_result(gv_file='Goodvibes_output.dat'):
         return pd.DataFrame([])
 
 
+def solv_corr_terms(energy, h_corr, ts_qh, s_tot, s_rot, s_trans,
+                    temp, factor_rot, factor_trans):
+    '''
+    solv-G_corr and solv-G from arrays of goodvibes and entropy terms,
+    all arguments are broadcast against each other.
+    missing terms (zero) give nan, missing values (nan) stay nan
+    '''
+    import numpy as np
+
+    h_corr = np.asarray(h_corr, dtype=float)
+    ts_qh = np.asarray(ts_qh, dtype=float)
+    s_tot = np.asarray(s_tot, dtype=float)
+    energy = np.asarray(energy, dtype=float)
+    # check both entropy and goodvibes output exist
+    corr = np.round(h_corr -
+                    (ts_qh -
+                     ((1 - factor_rot) * temp * np.asarray(s_rot, dtype=float) +
+                      (1 - factor_trans) * temp * np.asarray(s_trans, dtype=float))
+                     / 1000 / 627.509
+                     ),
+                    6)
+    corr = np.where((h_corr != 0) & (ts_qh != 0) & (s_tot != 0), corr, np.nan)
+    # check both G_corr and electron energy output exist
+    corr_G = np.where((corr != 0) & (energy != 0), np.round(energy + corr, 6), np.nan)
+    return corr, corr_G
+
+
+@staged('get_solv_corr')
 def get_solv_corr(data_df, temp, factors):
     '''calculate corrected free energy based on both goodvibes result and entropy scaling'''
-    def compute_corr(row, temp, factors):
-        # check both entropy and goodvibes output exist
-        if row['H_corr'] and row['T.qh-S_tot'] and row['S_tot']:
-            # compute the solv-G_corr with 50% scaling for S_rot and S_trans
-            corr = round(row['H_corr'] -
-                            (row['T.qh-S_tot'] -
-                                ((1-factors[0]) * temp * row['S_rot'] +
-                                 (1-factors[1]) * temp * row['S_trans'])
-                                 / 1000 / 627.509
-                             ),
-                         6)
-        else:
-            corr = None
-        return corr
+    corr, corr_G = solv_corr_terms(data_df['E'].to_numpy(dtype=float),
+                                   data_df['H_corr'].to_numpy(dtype=float),
+                                   data_df['T.qh-S_tot'].to_numpy(dtype=float),
+                                   data_df['S_tot'].to_numpy(dtype=float),
+                                   data_df['S_rot'].to_numpy(dtype=float),
+                                   data_df['S_trans'].to_numpy(dtype=float),
+                                   temp, factors[0], factors[1])
+    data_df['solv-G_corr'] = corr
+    data_df['solv-G'] = corr_G
 
-    data_df['solv-G_corr'] = data_df.apply(compute_corr, args=(temp, factors), axis=1)
-
-    def compute_corrected_G(row):
-        # check both G_corr and electron energy output exist
-        if row['solv-G_corr'] and row['E']:
-            corr_G = round(row['E'] + row['solv-G_corr'], 6)
-        else:
-            corr_G = None
-        return corr_G
-
-    data_df['solv-G'] = data_df.apply(compute_corrected_G, axis=1)
-    
     return data_df
@@ -0,0 +1,115 @@
+# delete and move files in process, planned first and run at once
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# threads running file operations, they mostly wait for the filesystem
+FILEOPS_WORKERS = 4
+
+
+def freed_size(path: str) -> int:
+    '''
+    bytes freed by deleting path, files having other hard links and
+    symlinks free nothing (but the link itself)
+    '''
+    stat = os.lstat(path)
+    if os.path.isdir(path) and not os.path.islink(path):
+        total = 0
+        for root, dirs, files in os.walk(path):
+            for name in files:
+                try:
+                    file_stat = os.lstat(os.path.join(root, name))
+                except OSError:
+                    continue
+                if file_stat.st_nlink == 1:
+                    total += file_stat.st_size
+        return total
+    return stat.st_size if stat.st_nlink == 1 else 0
+
+
+class FilePlan:
+    '''
+    list of deletions and moves, made without touching any file.
+    show prints the plan (for dry run), run carries it out with a small
+    thread pool and keeps count of files done and bytes freed.
+    paths are used as they are, never passed to a shell.
+    kept paths (and folders holding them) are never planned for deletion
+    '''
+    def __init__(self, workers: int=FILEOPS_WORKERS):
+        self.workers = workers
+        self.ops = []
+        self.kept = set()
+        self.n_done = 0
+        self.n_failed = 0
+        self.bytes_freed = 0
+
+    def keep(self, path: str):
+        '''never delete path, e.g. a file others still link to'''
+        self.kept.add(os.path.abspath(path))
+
+    def is_kept(self, path: str) -> bool:
+        path = os.path.abspath(path)
+        return any(kept == path or kept.startswith(path + os.sep) for kept in self.kept)
+
+    def delete(self, path: str):
+        '''delete a file or a whole directory, skipped if not there or kept'''
+        if self.is_kept(path):
+            print(f'Warning: {path} is kept, collected files point to it!')
+        elif os.path.lexists(path):
+            self.ops.append(('delete', path, None))
+
+    def move(self, src: str, dst: str):
+        if os.path.lexists(src):
+            self.ops.append(('move', src, dst))
+
+    def show(self):
+        for op, src, dst in self.ops:
+            if op == 'delete':
+                print(f'[dry run] delete {src}')
+            else:
+                print(f'[dry run] move {src} -> {dst}')
+
+    def do(self, op: str, src: str, dst: str) -> int:
+        if op == 'move':
+            shutil.move(src, dst)
+            return 0
+        size = freed_size(src)
+        if os.path.isdir(src) and not os.path.islink(src):
+            shutil.rmtree(src)
+        else:
+            os.unlink(src)
+        return size
+
+    def try_do(self, op: str, src: str, dst: str):
+        try:
+            return self.do(op, src, dst)
+        except OSError as e:
+            print(f'Warning: could not {op} {src} ({e})!')
+            return None
+
+    def run(self, dry_run: bool=False):
+        '''carry out (or only show) the planned operations and clear them'''
+        if dry_run:
+            self.show()
+            self.ops = []
+            return
+        ops, self.ops = self.ops, []
+        if not ops:
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(lambda op: self.try_do(*op), ops))
+        for size in results:
+            if size is None:
+                self.n_failed += 1
+            else:
+                self.n_done += 1
+                self.bytes_freed += size
+
+    def summary(self) -> str:
+        return (f'{self.n_done} files or folders deleted/moved, '
+                f'{self.bytes_freed / 1024 ** 2:.1f} MB freed'
+                + (f', {self.n_failed} failed!' if self.n_failed else '!'))
@@ -8,14 +8,126 @@ import re
 import sys
 import csv
 import time
+import shutil
 import argparse
 from copy import copy
 from typing import List
 
+from gptools.logfile import TAIL_BLOCK, read_tail, is_gau_file
+from gptools.cache import file_hash
+from gptools.scheduler import SCHEDULERS, get_scheduler
+from gptools.fileops import FilePlan
+from gptools.profiling import stage, staged, measured
+from gptools.prefetch import PREFETCH_MB, prefetch as prefetch_ahead, file_size
 
-# bash command to get queue info
-QUEUE_CMD = "qstat -u zye"  # SGE
-# QUEUE_CMD = 'squeue -u zye3 -o "%.8i %.9P %.40j %.4u %.8T %.10M %.10l %.4C %R"'  # Slurm
+# how collected files are put into log/, fchk/ and file47/
+COLLECT_MODES = ['copy', 'hardlink', 'symlink', 'manifest']
+# modes leaving files of their own in log/, so the originals could be cleaned
+CLEAN_MODES = ['copy', 'hardlink']
+# where collected files are listed, in log/
+MANIFEST_FILE = 'manifest.csv'
+
+
+def file_kind(name: str):
+    '''folder a file is collected into, None if not collected'''
+    if name.endswith('.log') or (is_gau_file(name) and '.log.' in name):
+        return 'log'
+    elif name.endswith('.fchk'):
+        return 'fchk'
+    elif name.endswith('.47'):
+        return 'file47'
+    return None
+
+
+def drop_duplicates(paths: List[str]) -> List[str]:
+    '''
+    skip files with the same content as an earlier one, only files of
+    the same size are compared by their content hash
+    '''
+    sizes = {}
+    for path in paths:
+        sizes.setdefault(os.path.getsize(path), []).append(path)
+    seen = {}
+    kept = []
+    for path in paths:
+        if len(sizes[os.path.getsize(path)]) > 1:
+            content = file_hash(path)
+            if content in seen:
+                print(f'- {path} is the same as {seen[content]}, skipped!')
+                continue
+            seen[content] = path
+        kept.append(path)
+    return kept
+
+
+def scan_files(main_dir: str) -> dict:
+    '''
+    walk main_dir and its sub dirs named by numbers once, get the files
+    to collect by kind as file name -> path.
+    duplicate files are skipped, for different files of the same name
+    the one found last is used (as if copied one after another)
+    '''
+    found = {'log': [], 'fchk': [], 'file47': []}
+    with os.scandir(main_dir) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    sub_dirs = [entry.path for entry in entries
+                if entry.name.isdigit() and entry.is_dir()]
+    for sub_dir in sub_dirs:
+        with os.scandir(sub_dir) as it:
+            entries += sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        kind = file_kind(entry.name)
+        if kind is not None and entry.is_file():
+            found[kind].append(os.path.relpath(entry.path, main_dir))
+
+    collected = {}
+    for kind, paths in found.items():
+        collected[kind] = {}
+        for path in drop_duplicates(paths):
+            name = os.path.basename(path)
+            if name in collected[kind]:
+                print(f'Warning: {name} found in several places, {path} is used!')
+            collected[kind][name] = path
+    return collected
+
+
+def scan_jobids(main_dir: str) -> dict:
+    '''
+    map job names to job ids from the job output files (name.o<jobid>)
+    in one scan of main_dir, the first one in name order is used
+    '''
+    jobids = {}
+    with os.scandir(main_dir) as it:
+        names = sorted(entry.name for entry in it)
+    for name in names:
+        prefix = name.split('.')[0]
+        if not name.startswith(f'{prefix}.o'):
+            continue
+        jobid = name.split('.o')[-1]
+        # skip .out, .opt and so on
+        if jobid[:1].isdigit():
+            jobids.setdefault(prefix, jobid)
+    return jobids
+
+
+def place_file(path: str, dest_dir: str, mode: str='copy'):
+    '''
+    put file into dest_dir by copy, hardlink or symlink,
+    hardlink falls back to copy across filesystems
+    '''
+    dest = os.path.join(dest_dir, os.path.basename(path))
+    if os.path.lexists(dest):
+        os.remove(dest)
+    if mode == 'hardlink':
+        try:
+            os.link(path, dest)
+            return
+        except OSError:
+            pass
+    elif mode == 'symlink':
+        os.symlink(os.path.abspath(path), dest)
+        return
+    shutil.copy(path, dest)
 
 
 def get_termination(gauf):
@@ -34,6 +146,7 @@ def get_termination(gauf):
     return is_normal
 
 
+@staged('gaucollect')
 def main(main_dir: str=os.getcwd(),
          clean: bool=False,
          need_fchk: bool=False,
@@ -41,9 +154,27 @@ def main(main_dir: str=os.getcwd(),
          need_error: bool=False,
          deepclean: bool=False,
          all_yes: bool=False,
+         mode: str='copy',
+         scheduler: str='sge',
+         user: str=None,
+         queue_ttl: float=60.0,
+         dry_run: bool=False,
+         prefetch: int=0,
+         prefetch_mb: float=PREFETCH_MB,
          ):
     '''
     process all log or out file in dir and its sub dir startswith numbers
+    mode: how files are put into log/, fchk/ and file47/, by copy,
+        hardlink or symlink, or only listed in log/manifest.csv (manifest).
+        dir and sub dirs are walked once, duplicate files are skipped
+        and termination is always checked on the original files
+    scheduler: queueing system asked for running jobs of user (default:
+        current user), sge, slurm or local (none). the answer is kept for
+        queue_ttl seconds
+    dry_run: only print the files and folders that would be deleted or
+        moved, nothing is changed on disk
+    prefetch: number of files whose last lines are read ahead by threads
+        while one is judged, within prefetch_mb, for network filesystems
     determine whether they are normal termination
     if normal termination,
         get single point energy (HF=)
@@ -52,7 +183,13 @@ def main(main_dir: str=os.getcwd(),
         get optimization points
         get converge status
     output to a csv file
+    clean and deepclean are ignored unless mode is copy or hardlink,
+    symlinks and the manifest still point to the original files
     '''
+    if (clean or deepclean) and mode not in CLEAN_MODES:
+        print(f'Warning: original files are kept with --mode {mode}, '
+              'clean and deepclean are ignored!')
+        clean = deepclean = False
     # check if deepclean is required
     if deepclean:
         if all_yes:
@@ -66,121 +203,116 @@ def main(main_dir: str=os.getcwd(),
                 pass
     # make log dir, collect log file and get log_path
     os.chdir(main_dir)
-    if os.path.exists('log'):
+    plan = FilePlan()
+    for folder, need in [('log', True), ('fchk', need_fchk), ('file47', need_file47)]:
+        if not need or not os.path.exists(folder):
+            continue
         if all_yes:
-            os.system('rm -rf log')
+            plan.delete(folder)
         else:
-            print('Warning: old log folder exists!')
-            need_remove = input('Do you want delete old log? (y/n)')
+            print(f'Warning: old {folder} folder exists!')
+            need_remove = input(f'Do you want delete old {folder}? (y/n)')
             if need_remove == 'y':
-                os.system('rm -rf log')
+                plan.delete(folder)
             else:
-                os.system(f'mv log log_{int(time.time()*100)}')
-    os.makedirs('log', exist_ok=True)
+                plan.move(folder, f'{folder}_{int(time.time()*100)}')
+    with stage('remove old folders'):
+        plan.run(dry_run)
+    if not dry_run:
+        for folder, need in [('log', True), ('fchk', need_fchk),
+                             ('file47', need_file47), ('log/error', need_error)]:
+            if need:
+                os.makedirs(folder, exist_ok=True)
 
-    if need_fchk:
-        if os.path.exists('fchk'):
-            if all_yes:
-                os.system('rm -rf fchk')
-            else:
-                print('Warning: old fchk folder exists!')
-                need_remove = input('Do you want delete old fchk? (y/n)')
-                if need_remove == 'y':
-                    os.system('rm -rf fchk')
-                else:
-                    os.system(f'mv fchk fchk_{int(time.time()*100)}')
-        os.makedirs('fchk', exist_ok=True)
-    if need_file47:
-        if os.path.exists('file47'):
-            if all_yes:
-                os.system('rm -rf fchk')
-            else:
-                print('Warning: old file47 folder exists!')
-                need_remove = input('Do you want delete old file47? (y/n)')
-                if need_remove == 'y':
-                    os.system('rm -rf file47')
-                else:
-                    os.system(f'mv file47 fchk_{int(time.time()*100)}')
-        os.makedirs('file47', exist_ok=True)
-    if need_error:
-        os.makedirs('log/error', exist_ok=True)
-
-    for f in os.listdir():  # direct get files
-        if f.endswith('.log'):
-            os.system(f'cp {f} log/')
-        elif f.endswith('.fchk'):
-            if need_fchk:
-                os.system(f'cp {f} fchk/')
-        elif f.endswith('.47'):
-            if need_file47:
-                os.system(f'cp {f} file47/')
-    
-    for dir in os.listdir():  # get files from directories
-        if dir.isdigit():
-            os.system(f'cp {dir}/*.log log/')
-            if need_fchk:
-                os.system(f'cp {dir}/*.fchk fchk/')
-            if need_file47:
-                os.system(f'cp {dir}/*.47 file47/')
+    # find files once, put them in place unless only listed
+    with stage('scan files'):
+        collected = scan_files(main_dir)
+    # symlinks and the manifest point to the originals
+    if mode not in CLEAN_MODES:
+        for kind in collected.values():
+            for path in kind.values():
+                plan.keep(path)
+    if mode != 'manifest' and not dry_run:
+        with stage('place files'):
+            for kind, need in [('log', True), ('fchk', need_fchk), ('file47', need_file47)]:
+                if need:
+                    for path in collected[kind].values():
+                        place_file(path, kind, mode)
 
     log_path = os.path.abspath('log')
 
-    # read running jobs
-    queue_log = os.path.abspath(log_path + '/queue.log')
-    os.system(f'{QUEUE_CMD} > {queue_log}')
-    with open(queue_log, 'r') as l:
-        queue_lines = l.readlines()
-    running_jobid = [line.split()[0] for line in queue_lines[1:]]
-    os.system(f'rm -rf {queue_log}')
+    # read running jobs, one query for all of them
+    with stage('running jobs'):
+        running_jobid = get_scheduler(scheduler, user=user, ttl=queue_ttl,
+                                      cache_dir=None if dry_run else main_dir).running_jobs()
+        jobids = scan_jobids(main_dir)
 
-    # process log file
-    gau_list = [file for file in os.listdir(log_path)
-                if file.endswith('.log') or file.endswith('.out')]
-    gau_list.sort()
+    # process log file, termination is checked on the original files
+    gau_list = sorted(collected['log'])
+    manifest = []
 
     out_list = []
     remove_list = []
+    gau_files = [os.path.abspath(collected['log'][file]) for file in gau_list]
+    # termination is in the last lines, read ahead for the next files
+    tails = prefetch_ahead(gau_files, read_tail, prefetch, prefetch_mb,
+                           size=lambda path: min(file_size(path), TAIL_BLOCK))
     for file in gau_list:
-        gau_file = os.path.abspath(log_path + '/' + file)
-        with open(gau_file) as f:
-            gauf = f.readlines()
+        with stage('read_tail'):
+            gau_file, gauf = next(tails)
 
         # get jobid
-        ofile_list = [of for of in os.listdir(main_dir) if of.startswith(f"{file.split('.')[0]}.o")]
-        if not ofile_list:
-            jobid = ''
-        else:
-            ofile = ofile_list[0]
-            jobid = ofile.split('.o')[-1]
+        jobid = jobids.get(file.split('.')[0], '')
         
         # normal termination
         if get_termination(gauf):
             print(f'o {file} terminated normally!')
             remove_list.append((file, jobid))
+            status = 'Normal'
         # error termination or running
         else:  
             # determine running or error
             if jobid in running_jobid:  # running
                 print(f'o {file} is still running!')
+                status = 'Running'
             else:  # error
                 print(f'x {file} failed!')
-                if need_error:
-                    os.system(f'cp log/{file} log/error/')
+                status = 'Error'
+                if need_error and mode != 'manifest' and not dry_run:
+                    place_file(gau_file, 'log/error', mode)
                 if deepclean:
                     remove_list.append((file, jobid))
+        manifest.append(('log', file, gau_file, status))
+
+    # list where every file is
+    for kind in ['fchk', 'file47']:
+        for file, path in collected[kind].items():
+            manifest.append((kind, file, os.path.abspath(path), ''))
+    if not dry_run:
+        with open(os.path.join(log_path, MANIFEST_FILE), 'w', newline='') as m:
+            writer = csv.writer(m)
+            writer.writerow(['kind', 'file_name', 'path', 'status'])
+            writer.writerows(manifest)
     
-    # clean up file and dirs
-    if clean or deepclean:
+    # clean up file and dirs, planned at once from one scan of main_dir
+    if (clean or deepclean) and mode in CLEAN_MODES:
+        with os.scandir(main_dir) as it:
+            names = sorted(entry.name for entry in it)
         for log_file, jobid in remove_list:
             prefix = log_file.split('.')[0]
             print(f'{prefix} is now deleting...')
-            os.system(f'rm -f {prefix}.log')
-            os.system(f'rm -f {prefix}.gjf')
-            os.system(f'rm -f {prefix}.o*')
-            os.system(f'rm -f {prefix}.po*')
-            os.system(f'rm -f {prefix}.chk')
-            os.system(f'rm -f {prefix}.fchk')
-            os.system(f'rm -rf {jobid}')
+            for name in names:
+                if (name in (f'{prefix}.log', log_file,
+                             f'{prefix}.gjf', f'{prefix}.chk', f'{prefix}.fchk')
+                        or name.startswith((f'{prefix}.o', f'{prefix}.po'))):
+                    plan.delete(name)
+            if jobid:
+                plan.delete(jobid)
+        with stage('clean up'):
+            plan.run(dry_run)
+
+    if not dry_run:
+        print(plan.summary())
 
 
 def parse_args():
@@ -190,14 +322,14 @@ def parse_args():
         action='store_const',
         const=True,
         default=False,
-        help='remove finished job files (default: False)',
+        help='remove finished job files, only with --mode copy or hardlink (default: False)',
     )
     p.add_argument(
         '--deepclean', '-d',
         action='store_const',
         const=True,
         default=False,
-        help='remove finished job files and error job files (default: False)',
+        help='remove finished job files and error job files, only with --mode copy or hardlink (default: False)',
     )
     p.add_argument(
         '--fchk', '-k',
@@ -227,16 +359,83 @@ def parse_args():
         default=False,
         help='input y for all confirmation (default: False)',
     )
+    p.add_argument(
+        '--mode', '-m',
+        type=str,
+        default='copy',
+        choices=COLLECT_MODES,
+        help='how files are collected: copy, hardlink, symlink, or only listed in log/manifest.csv (default: copy)',
+    )
+    p.add_argument(
+        '--scheduler',
+        type=str,
+        default='sge',
+        choices=list(SCHEDULERS),
+        help='queueing system asked for running jobs, local for none (default: sge)',
+    )
+    p.add_argument(
+        '--user', '-u',
+        type=str,
+        default=None,
+        help='user whose jobs are asked for (default: current user)',
+    )
+    p.add_argument(
+        '--queue-ttl',
+        type=float,
+        default=60.0,
+        help='seconds the running jobs are kept in .gptools_queue.json before asking again, 0 to always ask (default: 60)',
+    )
+    p.add_argument(
+        '--dry-run', '-n',
+        action='store_const',
+        const=True,
+        default=False,
+        help='if specified, only print the files and folders that would be deleted or moved (default: False)',
+    )
+    p.add_argument(
+        '--prefetch',
+        type=int,
+        default=0,
+        help='number of files whose last lines are read ahead by threads, for logs on network filesystems, 0 for none (default: 0)',
+    )
+    p.add_argument(
+        '--prefetch-mb',
+        type=float,
+        default=PREFETCH_MB,
+        help=f'at most this many MB are read ahead by --prefetch (default: {PREFETCH_MB})',
+    )
+    p.add_argument(
+        '--stats',
+        type=str,
+        nargs='?',
+        const='-',
+        default=None,
+        help='if specified, print wall time, bytes read, lines scanned and peak memory of each stage, also written to the json file if given (default: None)',
+    )
+    p.add_argument(
+        '--profile',
+        type=str,
+        default=None,
+        help='write a cProfile dump of the run to this file, read it by python -m pstats (default: None)',
+    )
     return p.parse_args()
 
 
 if __name__ == '__main__':
     args = parse_args()
 
-    main(clean=args.clean,
-         need_fchk=args.fchk,
-         need_file47=args.file47,
-         need_error=args.error,
-         deepclean=args.deepclean,
-         all_yes=args.yes,
-         )
+    with measured(args.stats, args.profile):
+        main(clean=args.clean,
+             need_fchk=args.fchk,
+             need_file47=args.file47,
+             need_error=args.error,
+             deepclean=args.deepclean,
+             all_yes=args.yes,
+             mode=args.mode,
+             scheduler=args.scheduler,
+             user=args.user,
+             queue_ttl=args.queue_ttl,
+             dry_run=args.dry_run,
+             prefetch=args.prefetch,
+             prefetch_mb=args.prefetch_mb,
+             )
@@ -6,23 +6,602 @@
 import os
 import csv
 import subprocess
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List
 
 from gptools.extractors import (
-    get_status,
-    get_sp_energy,
-    get_free_energy,
-    get_imag_freq,
-    get_entropy,
-    get_opt_points,
-    get_converge,
+    LogScanner,
+    OptTracker,
+    scan_jobs,
+    get_status_from_file,
+    get_sp_energy_from_file,
+    get_opt_from_file,
     extract_goodvibes_result,
     get_solv_corr,
 )
-from gptools.utils import merge_and_update
+from gptools.utils import merge_and_update, write_csv, write_rows
+from gptools.cache import ResultCache, open_cache
+from gptools.logfile import (
+    open_log,
+    is_compressed,
+    is_gau_file,
+    is_log_archive,
+    list_archive,
+    iter_archive,
+)
+from gptools.profiling import stage, staged, call_measured
+from gptools.prefetch import PREFETCH_MB, warm_files
+from gptools.gensi import write_si
+from gptools import profiling
+from gptools.output import (
+    OUTPUT_CHUNK,
+    TableWriter,
+    get_format,
+    output_columns,
+    write_history,
+)
+
+
+def row_name(file: str) -> str:
+    '''name of the row of a file as listed: no suffixes, folders kept'''
+    head, base = os.path.split(file)
+    return os.path.join(head, base.split('.')[0])
+
+
+def member_files(members: List[str]) -> List[str]:
+    '''
+    archive members as listed for naming: the base name, or the path in
+    the archive when several members give the same name (rows a/x and
+    b/x instead of two rows x)
+    '''
+    counts = Counter(row_name(os.path.basename(member)) for member in members)
+    return [os.path.basename(member) if counts[row_name(os.path.basename(member))] == 1
+            else member for member in members]
+
+
+def scanner_record(scanner: LogScanner,
+                   name: str,
+                   need_entropy: bool=False,
+                   need_thermo: bool=False,
+                   need_geometry: bool=False,
+                   sp_energy: dict=None,
+                   ) -> dict:
+    '''
+    result dict of one job from a scanner fed with all of its lines,
+    sp_energy is used instead of the archive lines of the scanner if given
+    '''
+    # normal termination
+    if scanner.status():
+        data_dict = {'file_name': name, 'status': 'Normal'}
+        data_dict.update(sp_energy or scanner.sp_energy())
+        data_dict.update(scanner.free_energy_terms())
+        # has freq calculation
+        if (data_dict['G'] != 0.0) or (data_dict['G'] != -1.0):
+            data_dict.update(scanner.imag_freq())
+            if need_entropy:
+                data_dict.update(scanner.entropy())
+        # no freq calculation
+        else:
+            data_dict.update({'num_imag': -1, 'freq_cons': 0.0})
+            if need_entropy:
+                data_dict.update({'S_tot': -1.0, 'S_elec': -1.0,
+                    'S_trans': -1.0, 'S_rot': -1.0, 'S_vib': -1.0})
+        if need_thermo:
+            data_dict['thermo'] = scanner.thermo_data()
+        if need_geometry:
+            data_dict['geometry'] = scanner.geometry()
+
+    else:  # abnormal termination or running
+        data_dict = {'file_name': name, 'status': 'Error/Running'}
+        data_dict.update(scanner.opt_points())
+        data_dict.update(scanner.converge())
+
+    return data_dict
+
+
+def process_file(gau_file: str,
+                 need_entropy: bool=False,
+                 file: str=None,
+                 need_thermo: bool=False,
+                 state: dict=None,
+                 need_geometry: bool=False,
+                 ) -> dict:
+    '''
+    extract data from one gaussian output file.
+    termination is judged from the end of the file first, only normal
+    terminated files are streamed through LogScanner for the other
+    fields, while running or error files are searched from the end.
+    compressed files are decompressed as a stream only once.
+    file is the name as listed by process (default: base name of gau_file)
+    need_thermo adds the inputs of quasi-harmonic corrections as 'thermo'
+    state ({} to start over) follows running or error files with
+    OptTracker from where the last run stopped, adding the optimization
+    'history' and the new parser state as 'progress'
+    need_geometry adds the last geometry of normal terminated files as
+    'geometry' (see get_geometry), captured while they are streamed
+    '''
+    if file is None:
+        file = os.path.basename(gau_file)
+    name = row_name(file)
+    if is_compressed(gau_file):
+        # could not be read from the end, decompress once for everything
+        with open_log(gau_file) as f:
+            scanner = LogScanner(need_thermo, need_geometry).scan(f)
+        return scanner_record(scanner, name, need_entropy, need_thermo, need_geometry)
+
+    # normal termination, the energy is searched from the end of the file
+    # and the stream only skips the archive entries
+    if get_status_from_file(gau_file):
+        sp_energy = get_sp_energy_from_file(gau_file)
+        with open_log(gau_file) as f:
+            scanner = LogScanner(need_thermo, need_geometry, need_archive=False).scan(f)
+        return scanner_record(scanner, name, need_entropy, need_thermo, need_geometry,
+                              sp_energy)
+
+    # abnormal termination or running
+    data_dict = {'file_name': name, 'status': 'Error/Running'}
+    if state is None:
+        data_dict.update(get_opt_from_file(gau_file))
+    else:
+        tracker = OptTracker(state).update(gau_file)
+        data_dict.update(tracker.opt_points())
+        data_dict.update(tracker.converge())
+        data_dict['history'] = tracker.history
+        data_dict['progress'] = tracker.state()
+    return data_dict
+
+
+def name_jobs(data_list: List[dict], file: str) -> List[dict]:
+    '''
+    name records of sub-jobs after the file, name_link1, name_link2 ...
+    a file of a single job keeps its own name
+    '''
+    name = row_name(file)
+    for i, data_dict in enumerate(data_list, 1):
+        data_dict['file_name'] = f'{name}_link{i}' if len(data_list) > 1 else name
+    return data_list
+
+
+def process_file_jobs(gau_file: str,
+                      need_entropy: bool=False,
+                      file: str=None,
+                      need_thermo: bool=False,
+                      need_geometry: bool=False,
+                      ) -> List[dict]:
+    '''
+    same as process_file, but one record per sub-job of the file
+    (--Link1-- chains, also the opt and freq steps of opt freq),
+    every sub-job has its own status, energies, frequencies and
+    entropies. the file is read once from the start
+    '''
+    if file is None:
+        file = os.path.basename(gau_file)
+    with open_log(gau_file) as f:
+        scanners = scan_jobs(f, need_thermo, need_geometry)
+    return name_jobs([scanner_record(scanner, '', need_entropy, need_thermo, need_geometry)
+                      for scanner in scanners], file)
+
+
+def process_member(f,
+                   member: str,
+                   need_entropy: bool=False,
+                   need_thermo: bool=False,
+                   split_jobs: bool=False,
+                   need_geometry: bool=False,
+                   file: str=None,
+                   ):
+    '''
+    same as process_file (process_file_jobs if split_jobs) for a member of
+    an archive, streamed once from the text stream f whatever its status.
+    file is the name as listed (default: base name of the member path)
+    '''
+    if file is None:
+        file = os.path.basename(member)
+    if split_jobs:
+        scanners = scan_jobs(f, need_thermo, need_geometry)
+        return name_jobs([scanner_record(scanner, '', need_entropy, need_thermo, need_geometry)
+                          for scanner in scanners], file)
+    scanner = LogScanner(need_thermo, need_geometry).scan(f)
+    return scanner_record(scanner, row_name(file), need_entropy, need_thermo, need_geometry)
+
+
+@staged('parse archive')
+def parse_archive(archive: str,
+                  members: List[str],
+                  need_entropy: bool=False,
+                  need_thermo: bool=False,
+                  split_jobs: bool=False,
+                  need_geometry: bool=False,
+                  ) -> list:
+    '''
+    parse members of a tar or zip archive read one at a time as streams,
+    results are in the same order as members. a member that could not
+    be parsed is reported and given a 'Failed' row. rows are named by
+    member_files
+    '''
+    index = {member: i for i, member in enumerate(members)}
+    files = member_files(members)
+    results = [None] * len(members)
+    for member, f in iter_archive(archive, members):
+        file = files[index[member]]
+        try:
+            data = process_member(f, member, need_entropy, need_thermo, split_jobs, need_geometry,
+                                  file)
+        except Exception as e:
+            print(f'Warning: {member} could not be processed ({type(e).__name__}: {e})!')
+            data = {'file_name': row_name(file), 'status': 'Failed'}
+        results[index[member]] = data
+    return results
+
+
+def try_process_file(gau_file: str,
+                     need_entropy: bool=False,
+                     file: str=None,
+                     need_thermo: bool=False,
+                     split_jobs: bool=False,
+                     state: dict=None,
+                     need_geometry: bool=False,
+                     ):
+    '''
+    same as process_file (process_file_jobs if split_jobs), but a file
+    that could not be parsed is reported and given a 'Failed' row
+    instead of stopping the batch
+    '''
+    try:
+        if split_jobs:
+            return process_file_jobs(gau_file, need_entropy, file, need_thermo, need_geometry)
+        return process_file(gau_file, need_entropy, file, need_thermo, state, need_geometry)
+    except Exception as e:
+        if file is None:
+            file = os.path.basename(gau_file)
+        print(f'Warning: {file} could not be processed ({type(e).__name__}: {e})!')
+        return {'file_name': row_name(file), 'status': 'Failed'}
+
+
+@staged('parse')
+def parse_files(gau_files: List[str],
+                gau_list: List[str],
+                need_entropy: bool=False,
+                jobs: int=1,
+                need_thermo: bool=False,
+                split_jobs: bool=False,
+                states: List[dict]=None,
+                need_geometry: bool=False,
+                prefetch: int=0,
+                prefetch_mb: float=PREFETCH_MB,
+                ) -> list:
+    '''
+    parse files with a pool of jobs processes (0 for all cores),
+    results are in the same order as gau_files.
+    states are the parser states of running jobs (see process_file).
+    in a single process, the next prefetch files (within prefetch_mb)
+    are read ahead by threads while one is parsed, see warm_files
+    '''
+    if states is None:
+        states = [None] * len(gau_files)
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(gau_files))
+    if jobs <= 1:
+        return [try_process_file(gau_file, need_entropy, file, need_thermo, split_jobs, state,
+                                 need_geometry)
+                for gau_file, file, state in zip(warm_files(gau_files, prefetch, prefetch_mb),
+                                                 gau_list, states)]
+
+    print(f'Parsing files with {jobs} processes!')
+    chunksize = max(1, len(gau_files) // (jobs * 4))
+    args = (gau_files, repeat(need_entropy), gau_list, repeat(need_thermo),
+            repeat(split_jobs), states, repeat(need_geometry))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # map returns results in the order of gau_files
+        if profiling.STATS is None:
+            return list(executor.map(try_process_file, *args, chunksize=chunksize))
+        # workers measure their own stages, added up here
+        results = []
+        for data_dict, stages in executor.map(call_measured, repeat(try_process_file), *args,
+                                              chunksize=chunksize):
+            profiling.STATS.merge(stages)
+            results.append(data_dict)
+        return results
+
+
+def archive_dir(work_dir: str=os.getcwd(), inp_file: str=None):
+    '''
+    an archive given as inp_file is processed like a folder of its
+    members, return the work_dir and inp_file to use
+    '''
+    if is_log_archive(inp_file):
+        return os.path.abspath(inp_file), None
+    return work_dir, inp_file
+
+
+def drop_same_names(gau_list: List[str], verbose: bool=True) -> List[str]:
+    '''
+    keep one file of those giving the same row name (e.g. x.log and
+    x.log.gz), a plain file before a compressed one, then in name order.
+    return the files kept in name order
+    '''
+    kept = {}
+    for file in sorted(sorted(gau_list), key=is_compressed):
+        name = row_name(file)
+        if name in kept:
+            if verbose:
+                print(f'Warning: {file} has the same name as {kept[name]}, skipped!')
+            continue
+        kept[name] = file
+    return sorted(kept.values())
+
+
+def get_gau_list(work_dir: str=os.getcwd(), inp_file: str=None) -> List[str]:
+    '''
+    get the files to process, a single file if specified, otherwise
+    all log/output files in the directory, compressed ones included
+    (e.g. .log.gz), one of files giving the same name (see drop_same_names).
+    work_dir could also be a tar or zip archive, its members are listed
+    by path then. None if nothing to process
+    '''
+    if is_log_archive(work_dir):
+        gau_list = drop_same_names(list_archive(work_dir))
+    elif inp_file:
+        # Ensure the specified file exists and has the correct extension
+        if not is_gau_file(inp_file):
+            print(f"Error: {inp_file} is not a valid .log or .out file.")
+            return None
+        if not os.path.exists(inp_file):
+            print(f"Error: File {inp_file} not found.")
+            return None
+        gau_list = [inp_file]
+    else:
+        # Process all log/out files in the directory
+        gau_list = [f for f in os.listdir(work_dir) if is_gau_file(f)]
+        gau_list = drop_same_names(gau_list)
+
+    if not gau_list:
+        print("No valid Gaussian log/output files found.")
+        return None
+    return gau_list
+
 
-import pandas as pd
+@staged('collect_data')
+def collect_data(work_dir: str,
+                 gau_list: List[str],
+                 need_entropy: bool=False,
+                 need_thermo: bool=False,
+                 jobs: int=1,
+                 use_cache: bool=True,
+                 cache_hash: bool=False,
+                 split_jobs: bool=False,
+                 need_history: bool=False,
+                 need_geometry: bool=False,
+                 prefetch: int=0,
+                 prefetch_mb: float=PREFETCH_MB,
+                 ) -> List[dict]:
+    '''
+    get one result dict per file in gau_list (one per sub-job with
+    split_jobs), taken from the cache if the file is unchanged and
+    parsed otherwise.
+    running jobs are followed from where the last run stopped when the
+    cache is used, or from the start if need_history, both adding the
+    optimization 'history' of them.
+    need_geometry adds the last 'geometry' of normal terminated files.
+    prefetch and prefetch_mb read files ahead, see parse_files.
+    work_dir could be a tar or zip archive with gau_list its members,
+    they are parsed as streams from it, without cache or history
+    '''
+    if is_log_archive(work_dir):
+        data_list = parse_archive(work_dir, gau_list, need_entropy, need_thermo,
+                                  split_jobs, need_geometry)
+        return flatten_jobs(data_list) if split_jobs else data_list
+
+    gau_files = [os.path.abspath(work_dir + '/' + file) for file in gau_list]
+
+    # take results of unchanged files from cache
+    data_list = [None] * len(gau_list)
+    cache = open_cache(work_dir, cache_hash) if use_cache else None
+    # results without geometry stay valid for runs not needing it
+    extra = {'need_geometry': True} if need_geometry else {}
+    options = ResultCache.options_key(need_entropy=need_entropy,
+                                      need_thermo=need_thermo,
+                                      split_jobs=split_jobs,
+                                      **extra)
+    todo = list(range(len(gau_list)))
+    if cache is not None:
+        todo = []
+        with stage('cache lookup'):
+            for i, (gau_file, file) in enumerate(zip(gau_files, gau_list)):
+                data_dict = cache.get(gau_file, options)
+                if data_dict is None:
+                    todo.append(i)
+                elif isinstance(data_dict, list):  # sub-jobs
+                    data_list[i] = name_jobs(data_dict, file)
+                else:
+                    data_dict['file_name'] = row_name(file)
+                    data_list[i] = data_dict
+            if len(todo) < len(gau_list):
+                print(f'{len(gau_list) - len(todo)} unchanged files taken from cache!')
+
+    # parse new or changed files
+    stats = [os.stat(gau_files[i]) for i in todo]
+    states = None
+    if cache is not None:
+        states = [cache.get_progress(gau_files[i]) for i in todo]
+    elif need_history:
+        states = [{} for _ in todo]
+    results = parse_files([gau_files[i] for i in todo],
+                          [gau_list[i] for i in todo],
+                          need_entropy, jobs, need_thermo, split_jobs, states,
+                          need_geometry, prefetch, prefetch_mb)
+    with stage('cache store'):
+        for i, stat, data_dict in zip(todo, stats, results):
+            data_list[i] = data_dict
+            failed = isinstance(data_dict, dict) and data_dict['status'] == 'Failed'
+            progress = data_dict.pop('progress', None) if isinstance(data_dict, dict) else None
+            if cache is not None and not failed:
+                cache.put(gau_files[i], options, data_dict, stat)
+                if progress is not None:
+                    cache.put_progress(gau_files[i], progress)
+                else:
+                    cache.drop_progress(gau_files[i])
+        if cache is not None:
+            cache.close()
+
+    # one row per sub-job
+    if split_jobs:
+        data_list = flatten_jobs(data_list)
+    return data_list
+
+
+def flatten_jobs(data_list: list) -> List[dict]:
+    '''one row per sub-job, from the records (or lists of them) of files'''
+    return [data_dict for data in data_list
+            for data_dict in (data if isinstance(data, list) else [data])]
+
+
+def split_thermo(data_list: List[dict]):
+    '''
+    remove inputs of quasi-harmonic corrections from the result dicts,
+    return names of files having them and the inputs
+    '''
+    thermo_files = []
+    thermo_list = []
+    for data_dict in data_list:
+        thermo = data_dict.pop('thermo', None)
+        if thermo is not None:
+            thermo_files.append(data_dict['file_name'])
+            thermo_list.append(thermo)
+    return thermo_files, thermo_list
+
+
+def split_geometry(data_list: List[dict]) -> dict:
+    '''
+    remove geometries from the result dicts, return them by file name
+    '''
+    geometries = {}
+    for data_dict in data_list:
+        geometry = data_dict.pop('geometry', None)
+        if geometry is not None:
+            geometries[data_dict['file_name']] = geometry
+    return geometries
+
+
+def split_history(data_list: List[dict]):
+    '''
+    remove optimization histories of running jobs from the result dicts,
+    return names of files having them and the histories
+    '''
+    history_files = []
+    histories = []
+    for data_dict in data_list:
+        history = data_dict.pop('history', None)
+        if history is not None:
+            history_files.append(data_dict['file_name'])
+            histories.append(history)
+    return history_files, histories
+
+
+@staged('build_table')
+def build_table(data_list: List[dict],
+                work_dir: str=os.getcwd(),
+                need_entropy: bool=False,
+                need_goodvibes: bool=False,
+                temp: float=298.15,
+                conc: float=1.0,
+                factor_rot: float=0.5,
+                factor_trans: float=0.5,
+                qh_engine: str='builtin',
+                freq_scale: float=1.0,
+                verbose: bool=True,
+                ):
+    '''
+    put the result dicts of all files into one table, with quasi-harmonic
+    and solvent corrections added upon request (see process).
+    verbose=False keeps it quiet for repeated updates
+    '''
+    # pandas (and numpy) are only loaded for tables
+    import pandas as pd
+
+    log = print if verbose else (lambda *args: None)
+    # inputs of quasi-harmonic corrections, histories and geometries are not written out
+    thermo_files, thermo_list = split_thermo(data_list)
+    split_history(data_list)
+    split_geometry(data_list)
+
+    # merge data into a big dict
+    with stage('DataFrame'):
+        data_df = pd.DataFrame(data_list)
+
+    # use goodvibes
+    if need_goodvibes:
+        if qh_engine == 'goodvibes':
+            log('Running goodvibes!')
+            with stage('goodvibes'):
+                p = subprocess.Popen(f'python -m goodvibes -c {conc} -t {temp} *', shell=True,
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                     cwd=work_dir)
+                p.wait()
+            gv_df = extract_goodvibes_result(os.path.join(work_dir, 'Goodvibes_output.dat'))
+        else:
+            log('Calculating quasi-harmonic corrections!')
+            from gptools.thermo import get_qh_thermo
+            with stage('get_qh_thermo'):
+                gv_df = get_qh_thermo(thermo_files, thermo_list, temp, conc, freq_scale)
+        if gv_df.empty:
+            log('No valid goodvibes results!')
+            need_goodvibes = False
+        else:
+            log('Merging goodvibes and gaussian results!')
+        with stage('merge_and_update'):
+            data_df = merge_and_update(data_df, gv_df)
+    
+    # run solvent correction with both goodvibes and entropy terms
+    if need_entropy and need_goodvibes:
+        log('Calculating entropy correction in solvent model!')
+        log(f'Scaling factor for S_rot is {factor_rot}')
+        log(f'Scaling factor for S_trans is {factor_trans}')
+        factors = [factor_rot, factor_trans]
+        data_df = get_solv_corr(data_df, temp, factors)
+
+    return data_df
+
+
+def write_table(data_list: List[dict],
+                output_file: str,
+                work_dir: str=os.getcwd(),
+                need_entropy: bool=False,
+                need_goodvibes: bool=False,
+                temp: float=298.15,
+                conc: float=1.0,
+                factor_rot: float=0.5,
+                factor_trans: float=0.5,
+                qh_engine: str='builtin',
+                freq_scale: float=1.0,
+                verbose: bool=True,
+                ):
+    '''
+    build the table (see build_table) and write it to output_file as csv
+    at once, return the table written. without goodvibes there is nothing
+    to correct, the result dicts are written by the csv module as they
+    are and returned, pandas is not loaded then
+    '''
+    if need_goodvibes:
+        data_df = build_table(data_list, work_dir, need_entropy, need_goodvibes,
+                              temp, conc, factor_rot, factor_trans,
+                              qh_engine, freq_scale, verbose)
+        with stage('write output'):
+            write_csv(data_df, output_file)
+        return data_df
+
+    split_thermo(data_list)
+    split_history(data_list)
+    split_geometry(data_list)
+    with stage('write output'):
+        write_rows(data_list, output_file)
+    return data_list
 
 
+@staged('process')
 def process(work_dir: str=os.getcwd(),
             inp_file: str = None,
             need_entropy: bool=False,
@@ -31,6 +610,18 @@ def process(work_dir: str=os.getcwd(),
             conc: float=1.0,
             factor_rot: float=0.5,
             factor_trans: float=0.5,
+            jobs: int=1,
+            use_cache: bool=True,
+            cache_hash: bool=False,
+            qh_engine: str='builtin',
+            freq_scale: float=1.0,
+            output_file: str=None,
+            output_format: str=None,
+            split_jobs: bool=False,
+            history_file: str=None,
+            si_file: str=None,
+            prefetch: int=0,
+            prefetch_mb: float=PREFETCH_MB,
             ):
     '''
     Process Gaussian log/output files and extract relevant data.
@@ -51,6 +642,8 @@ def process(work_dir: str=os.getcwd(),
     Arguments:
         file: specify a single file to process, if not specified (default),
             all gaussian output files in current folder would be processed.
+            a tar or zip archive (work_dir too) is processed like a folder
+            of the gaussian output files in it, read without extracting.
         need_entropy: whether to extract entropy terms from gaussian output
             files (default False)
         need_goodvibes: whether to use goodvibes to do quasi-harmonic
@@ -60,88 +653,101 @@ def process(work_dir: str=os.getcwd(),
         conc: concentraion (in M) used when calculating free energy terms
             (default 1 M)
         factor: scaling factor appied to the S_rot and S_trans (default 0.5)
+        jobs: number of processes used to parse files, 0 for all cores
+            (default 1). rows keep the sorted file order either way.
+        use_cache: whether to reuse results of unchanged files from the
+            cache file in work_dir (default True)
+        cache_hash: whether to compare content hash instead of mtime to
+            find unchanged files (default False)
+        qh_engine: 'builtin' computes quasi-harmonic corrections from the
+            parsed frequencies, 'goodvibes' runs goodvibes in the work
+            directory (default 'builtin')
+        freq_scale: frequency scaling factor used by the builtin engine
+            (default 1.0)
+        output_file: if given, rows are written to this file in typed
+            columns as files are parsed (OUTPUT_CHUNK at a time), instead
+            of gauprocess.csv at the end (default None)
+        output_format: csv, jsonl, parquet or feather, told by the
+            extension of output_file if not given (default None)
+        split_jobs: whether to give one row per sub-job (--Link1--, also
+            the opt and freq steps of opt freq) named file_link1,
+            file_link2 ..., files of a single job keep one row (default False)
+        history_file: if given, the optimization history of every running
+            or error job (one row per step, see HISTORY_COLUMNS) is saved
+            to this .npz file, for convergence plots (default None)
+        si_file: if given, the SI text of every opt file paired with its
+            single point file (name_sp) is written to this file, with
+            coordinates captured while the logs are parsed (default None)
+        prefetch: number of files read ahead by threads while one is
+            parsed, for logs on network filesystems, 0 for none. only
+            used with jobs 1 (default 0)
+        prefetch_mb: at most this many MB are read ahead, a larger file
+            only has its end read ahead (default PREFETCH_MB)
     '''
-    # Determine files to process
-    if inp_file:
-        # Ensure the specified file exists and has the correct extension
-        if not (inp_file.endswith('.log') or inp_file.endswith('.out')):
-            print(f"Error: {inp_file} is not a valid .log or .out file.")
-            return
-        if not os.path.exists(inp_file):
-            print(f"Error: File {inp_file} not found.")
-            return
-        gau_list = [inp_file]
-    else:
-        # Process all log/out files in the directory
-        gau_list = [f for f in os.listdir(work_dir)
-                    if f.endswith('.log') or f.endswith('.out')]
-        gau_list.sort()
-
+    work_dir, inp_file = archive_dir(work_dir, inp_file)
+    gau_list = get_gau_list(work_dir, inp_file)
     if not gau_list:
-        print("No valid Gaussian log/output files found.")
         return
-
-    # initialize data strucutre 
-    data_list = []
+    if need_goodvibes and qh_engine == 'goodvibes' and is_log_archive(work_dir):
+        print('Warning: goodvibes could not read archives, the builtin engine is used!')
+        qh_engine = 'builtin'
 
     # start processing
     print(f'Temperature used is {temp}K!')
     print(f'Concentration used is {conc}M!')
     print('Extracting data from gaussian output!')
-    for file in gau_list:
-        gau_file = os.path.abspath(work_dir + '/' + file)
-        with open(gau_file) as f:
-            gauf = f.readlines()
-        # normal termination
-        if get_status(gauf): 
-            data_dict = {'file_name': file.split('.')[0], 'status': 'Normal'}
-            data_dict.update(get_sp_energy(gauf))
-            data_dict.update(get_free_energy(gauf))
-            # has freq calculation
-            if (data_dict['G'] != 0.0) or (data_dict['G'] != -1.0):
-                data_dict.update(get_imag_freq(gauf))
-                if need_entropy:
-                    data_dict.update(get_entropy(gauf))
-            # no freq calculation
-            else:
-                data_dict.update({'num_imag': -1, 'freq_cons': 0.0})
-                if need_entropy:
-                    data_dict.update({'S_tot': -1.0, 'S_elec': -1.0, 
-                        'S_trans': -1.0, 'S_rot': -1.0, 'S_vib': -1.0})
-
-        else:  # abnormal termination or running
-            data_dict = {'file_name': file.split('.')[0], 'status': 'Error/Running'}
-            data_dict.update(get_opt_points(gauf))
-            data_dict.update(get_converge(gauf))
-
-        data_list.append(data_dict)
+    need_thermo = need_goodvibes and qh_engine == 'builtin'
+    need_geometry = bool(si_file)
+    histories = ([], [])
+    if output_file:
+        output_format = get_format(output_file, output_format)
+        columns = output_columns(need_entropy, need_goodvibes)
+        # goodvibes runs on the whole folder at once, no streaming then
+        chunk = len(gau_list) if need_goodvibes and not need_thermo else OUTPUT_CHUNK
+        # opt and single point files could be in different chunks
+        geometries = {}
+        si_tables = []
+        with TableWriter(output_file, output_format, columns) as writer:
+            for i in range(0, len(gau_list), chunk):
+                data_list = collect_data(work_dir, gau_list[i:i + chunk], need_entropy,
+                                         need_thermo, jobs, use_cache, cache_hash,
+                                         split_jobs, need_history=bool(history_file),
+                                         need_geometry=need_geometry,
+                                         prefetch=prefetch, prefetch_mb=prefetch_mb)
+                for collected, chunk_history in zip(histories, split_history(data_list)):
+                    collected.extend(chunk_history)
+                geometries.update(split_geometry(data_list))
+                data_df = build_table(data_list, work_dir, need_entropy, need_goodvibes,
+                                      temp, conc, factor_rot, factor_trans,
+                                      qh_engine, freq_scale, verbose=(i == 0))
+                with stage('write output'):
+                    writer.write(data_df)
+                if si_file:
+                    si_tables.append(data_df)
+                print(f'{min(i + chunk, len(gau_list))}/{len(gau_list)} files wrote to {output_file}!')
+        if history_file:
+            write_history(history_file, *histories)
+        if si_file:
+            import pandas as pd
+            write_si(pd.concat(si_tables, ignore_index=True), geometries, work_dir,
+                     need_entropy, need_goodvibes, si_file, jobs)
+        return
 
-    # merge data into a big dict
-    data_df = pd.DataFrame(data_list)
-
-    # use goodvibes
-    if need_goodvibes:
-        print('Running goodvibes!')
-        p = subprocess.Popen(f'python -m goodvibes -c {conc} -t {temp} *', shell=True,
-                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        p.wait()
-        gv_df = extract_goodvibes_result()
-        if gv_df.empty:
-            print('No valid goodvibes results!')
-            need_goodvibes = False
-        else:
-            print('Merging goodvibes and gaussian results!')
-        data_df = merge_and_update(data_df, gv_df)
-    
-    # run solvent correction with both goodvibes and entropy terms
-    if need_entropy and need_goodvibes:
-        print('Calculating entropy correction in solvent model!')
-        print(f'Scaling factor for S_rot is {factor_rot}')
-        print(f'Scaling factor for S_trans is {factor_trans}')
-        factors = [factor_rot, factor_trans]
-        data_df = get_solv_corr(data_df, temp, factors)
+    data_list = collect_data(work_dir, gau_list, need_entropy, need_thermo,
+                             jobs, use_cache, cache_hash, split_jobs,
+                             need_history=bool(history_file),
+                             need_geometry=need_geometry,
+                             prefetch=prefetch, prefetch_mb=prefetch_mb)
+    if history_file:
+        write_history(history_file, *split_history(data_list))
+    geometries = split_geometry(data_list)
 
     # write data into csv
     output_file = 'gauprocess.csv'
-    data_df.to_csv(output_file, index=False)
+    data_df = write_table(data_list, output_file, work_dir, need_entropy, need_goodvibes,
+                          temp, conc, factor_rot, factor_trans, qh_engine, freq_scale)
     print('All data wrote to gauprocess.csv in current folder!')
+
+    # generate SI file from the files processed
+    if si_file:
+        write_si(data_df, geometries, work_dir, need_entropy, need_goodvibes, si_file, jobs)
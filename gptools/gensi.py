@@ -1,47 +1,134 @@
 # generate SI .txt file
 # Author: Zihao Ye
 # creation time: Jun, 2025
-# version: 2025/06/27
+# version: 2026/10/18
 
 import os
-import pandas as pd
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
 
-from gjftools.gjftools import gjfdata
+from gptools.extractors import get_geometry_from_file
+from gptools.logfile import LOG_SUFFIXES, COMPRESSED_SUFFIXES
+from gptools.output import read_table
+from gptools.profiling import staged
 
 
 CSV_FILE = 'gauprocess.csv'
 TXT_FILE = 'SI_coord.txt'
 
-def gensi(log_dir: str=os.getcwd(),
-          need_entropy: bool=False,
-          need_goodvibes: bool=False) -> str:
-    '''
-    get all coords from a directory of log files and output to
-    one xyz file for paste to the SI part of papers.
-    '''
-    error_count = 0
 
+def energy_titles(need_entropy: bool=False, need_goodvibes: bool=False):
+    '''columns of the enthalpy and free energy corrections used'''
     enth_title = 'H_corr'  # enthalpy
     free_title = 'G_corr'  # no correction
     if need_goodvibes:
         free_title = 'qh-G_corr'  # only goodvibes correction
     if need_entropy and need_goodvibes:
         free_title = 'solv-G_corr'  # goodvibes and solvation correction
+    return enth_title, free_title
+
+
+def find_log(log_dir: str, name: str) -> str:
+    '''gaussian output file of name in log_dir, plain or compressed, None if not found'''
+    for suffix in LOG_SUFFIXES:
+        for compressed in ('',) + tuple(COMPRESSED_SUFFIXES):
+            log_file = os.path.join(log_dir, f'{name}{suffix}{compressed}')
+            if os.path.isfile(log_file):
+                return log_file
+    return None
+
+
+def read_geometry(log_file: str) -> dict:
+    '''last geometry of log_file, None if not found or not readable'''
+    if log_file is None:
+        return None
+    try:
+        return get_geometry_from_file(log_file)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_geometries(log_files: List[str], jobs: int=1):
+    '''
+    geometries of log_files in the same order, yielded as they are read,
+    by a pool of jobs processes (0 for all cores)
+    '''
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(log_files))
+    if jobs <= 1:
+        yield from map(read_geometry, log_files)
+        return
+    chunksize = max(1, len(log_files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(read_geometry, log_files, chunksize=chunksize)
+
+
+def si_lines(row: dict, sp_row: dict, geometry: dict, enth_title: str, free_title: str) -> List[str]:
+    '''SI text of one structure'''
+    ener = round(float(row['E']), 6)
+    spe = round(float(sp_row['E']), 6)
+    enth = round(float(row[enth_title]) + spe, 6)
+    free = round(float(row[free_title]) + spe, 6)
+    single_txt_list = [
+        f'{row["file_name"]}\n',
+        f'E={ener}\n',
+        f'E_SP={spe}\n',
+        f'H={enth}\n',
+        f'G={free}\n',
+    ]
+    # collect imaginary freq if needed
+    if row['num_imag'] != 0.0:
+        single_txt_list.append(f'''Imag. Freq. {row['freq_cons']}\n''')
+    # charge, multiplicity and coords
+    single_txt_list.append(f'charge and multiplicity: {geometry["charge"]} {geometry["mult"]}\n')
+    single_txt_list.append('Cartesian coordinates:\n')
+    single_txt_list.extend(f'{symbol}    {x}  {y}  {z}\n' for symbol, x, y, z in geometry['atoms'])
+    single_txt_list.append('\n')
+    return single_txt_list
 
-    # read csv file
-    gp_df = pd.read_csv(CSV_FILE)
-    file_col = 'file_name'
-    # file_col = gp_df.columns['file_name']
-    # gp_df_sp = gp_df[gp_df[file_col].str.endswith('_sp')]
-    gp_df_opt = gp_df[~gp_df[file_col].str.endswith('_sp')]
-
-    # go through all files
-    total_SI_list = []
-    for _, row in gp_df_opt.iterrows():
-        opt_file = row[file_col]
+
+@staged('write_si')
+def write_si(gp_df,
+             geometries: dict=None,
+             log_dir: str=os.getcwd(),
+             need_entropy: bool=False,
+             need_goodvibes: bool=False,
+             si_file: str=None,
+             jobs: int=1) -> int:
+    '''
+    write the SI text of every opt file in the table (a DataFrame or the
+    result dicts of process) paired with its single point file (name_sp),
+    return the number of structures skipped.
+    coordinates are taken from geometries (by file name, see
+    get_geometry) or read from the end of the single point logs in
+    log_dir with jobs processes. structures are written as they are ready
+    '''
+    error_count = 0
+    enth_title, free_title = energy_titles(need_entropy, need_goodvibes)
+    geometries = geometries or {}
+    if si_file is None:
+        si_file = os.path.join(os.path.abspath(log_dir), TXT_FILE)
+
+    # pair opt and single point rows by name, the first row of a name is used
+    if isinstance(gp_df, list):
+        # result dicts of process, values not extracted are nan as in the table
+        columns = dict.fromkeys(key for row in gp_df for key in row)
+        rows = [{**dict.fromkeys(columns, math.nan), **row} for row in gp_df]
+    else:
+        rows = gp_df.to_dict('records')
+    index = {}
+    for i, row in enumerate(rows):
+        index.setdefault(row['file_name'], i)
+    pairs = []
+    for row in rows:
+        opt_file = row['file_name']
+        if opt_file.endswith('_sp'):
+            continue
         sp_file = f'{opt_file}_sp'
         # check files
-        if sp_file not in list(gp_df[file_col]):
+        if sp_file not in index:
             print(f'{opt_file} does not have corresponding single point file!')
             error_count += 1
             continue
@@ -49,42 +136,42 @@ def gensi(log_dir: str=os.getcwd(),
             print(f'{opt_file} does not terminate normally!')
             error_count += 1
             continue
-        # collect data
-        ener = round(float(row['E']), 6)
-        spe = round(float(gp_df[gp_df[file_col] == sp_file]['E'].iloc[0]), 6)
-        enth = round(float(row[enth_title]) + spe, 6)
-        free = round(float(row[free_title]) + spe, 6)
-        single_txt_list = [
-            f'{opt_file}\n',
-            f'E={ener}\n',
-            f'E_SP={spe}\n',
-            f'H={enth}\n',
-            f'G={free}\n',
-        ]
-        # collect imaginary freq if needed
-        if row['num_imag'] != 0.0:
-            single_txt_list.append(f'''Imag. Freq. {row['freq_cons']}\n''')
-        # collect coords
-        log_file = os.path.join(os.path.abspath(log_dir), f'{sp_file}.log')
-        # read log
-        _xyz = gjfdata()
-        _xyz.get_body_from_log(log_file)
-        # crude str list
-        _crude_list = _xyz.write_xyz(to_str_list=True)
-        # do some modification
-        _crude_list[0] = f'charge and multiplicity: {_xyz.c_m}\n'  # add charge and multiplicity
-        _crude_list[1] = 'Cartesian coordinates:\n'  # remove atom number
-        _crude_list.append('\n')
-        # combine str list
-        single_txt_list.extend(_crude_list)
-
-        # add this structure to the overall list
-        total_SI_list.extend(single_txt_list)
-    
+        pairs.append((row, rows[index[sp_file]]))
+
+    # coords of single points not captured by process are read from their logs
+    missing = [sp_row['file_name'] for _, sp_row in pairs
+               if sp_row['file_name'] not in geometries]
+    read = read_geometries([find_log(log_dir, name) for name in missing], jobs)
+
+    with open(si_file, 'w') as coord:
+        for row, sp_row in pairs:
+            sp_file = sp_row['file_name']
+            geometry = geometries[sp_file] if sp_file in geometries else next(read)
+            if geometry is None:
+                print(f'{row["file_name"]} has no coordinates found in {sp_file}!')
+                error_count += 1
+                continue
+            coord.writelines(si_lines(row, sp_row, geometry, enth_title, free_title))
+
     if error_count:
         print(f'Warning! {error_count} structures has error!')
+    print(f'SI txt file has been generated to {os.path.basename(si_file)} in current folder!')
+    return error_count
+
 
-    SI_coord_file = os.path.join(os.path.abspath(log_dir), TXT_FILE)
-    with open(SI_coord_file, 'w') as coord:
-        coord.writelines(total_SI_list)
-    print(f'SI txt file has been generated to {TXT_FILE} in current folder!')
+@staged('gensi')
+def gensi(log_dir: str=os.getcwd(),
+          need_entropy: bool=False,
+          need_goodvibes: bool=False,
+          table_file: str=CSV_FILE,
+          table_format: str=None,
+          jobs: int=1) -> int:
+    '''
+    get all coords from a directory of log files and output to
+    one xyz file for paste to the SI part of papers.
+    table_file is the output of process in any format (csv by default),
+    coords are read from the end of the single point logs by jobs processes
+    '''
+    # read csv (or columnar) file
+    gp_df = read_table(table_file, table_format)
+    return write_si(gp_df, None, log_dir, need_entropy, need_goodvibes, jobs=jobs)
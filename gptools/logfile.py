@@ -0,0 +1,239 @@
+# read gaussian output files from disk
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import io
+import bz2
+import gzip
+import lzma
+import mmap
+import tarfile
+import zipfile
+from collections import deque
+from contextlib import contextmanager
+from typing import List
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# start of the archive entry printed at the end of each job
+ARCHIVE_MARKERS = [b'\n 1\\1\\', b'\n 1|1|']
+# bytes read at a time when reading from the end of file
+TAIL_BLOCK = 8192
+# extensions of gaussian output files
+LOG_SUFFIXES = ('.log', '.out')
+# extensions of archives holding gaussian output files
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz', '.zip')
+
+
+def open_zst(gau_file):
+    '''open a zstandard compressed file, needs the zstandard package'''
+    if zstandard is None:
+        name = os.path.basename(gau_file) if isinstance(gau_file, str) else '.zst files'
+        raise ImportError(f'zstandard is needed to read {name}, '
+                          'install it by pip install zstandard')
+    return zstandard.open(gau_file, 'rb')
+
+
+# open functions of compressed files, all return binary streams
+COMPRESSED_SUFFIXES = {
+    '.gz': gzip.open,
+    '.xz': lzma.open,
+    '.bz2': bz2.open,
+    '.zst': open_zst,
+}
+
+
+def is_compressed(gau_file) -> bool:
+    '''judge whether the file is compressed by its extension'''
+    return os.path.splitext(gau_file)[1] in COMPRESSED_SUFFIXES
+
+
+def is_gau_file(gau_file) -> bool:
+    '''gaussian output file, plain (.log/.out) or compressed (e.g. .log.gz)'''
+    if is_compressed(gau_file):
+        gau_file = os.path.splitext(gau_file)[0]
+    return gau_file.endswith(LOG_SUFFIXES)
+
+
+def open_log(gau_file):
+    '''
+    open a gaussian output file as text lines, compressed files are
+    decompressed as a stream while being read
+    '''
+    suffix = os.path.splitext(gau_file)[1]
+    if suffix in COMPRESSED_SUFFIXES:
+        return io.TextIOWrapper(COMPRESSED_SUFFIXES[suffix](gau_file), errors='replace')
+    return open(gau_file)
+
+
+def is_log_archive(path) -> bool:
+    '''judge whether path is a tar or zip archive (compressed tar included)'''
+    return bool(path) and path.endswith(ARCHIVE_SUFFIXES) and os.path.isfile(path)
+
+
+def list_archive(archive) -> List[str]:
+    '''
+    paths of the gaussian output files (plain or compressed) in a tar or
+    zip archive, in the order they are stored
+    '''
+    if archive.endswith('.zip'):
+        with zipfile.ZipFile(archive) as zf:
+            return [info.filename for info in zf.infolist()
+                    if not info.is_dir() and is_gau_file(info.filename)]
+    with tarfile.open(archive) as tf:
+        return [member.name for member in tf if member.isfile() and is_gau_file(member.name)]
+
+
+def open_stream(f, name: str):
+    '''
+    text lines of the binary stream f of gaussian output file name,
+    decompressed while being read if name is compressed
+    '''
+    suffix = os.path.splitext(name)[1]
+    if suffix in COMPRESSED_SUFFIXES:
+        f = COMPRESSED_SUFFIXES[suffix](f)
+    return io.TextIOWrapper(f, errors='replace')
+
+
+def iter_archive(archive, members: List[str]):
+    '''
+    yield (member, text stream) of members of a tar or zip archive one at
+    a time, as a stream read straight from the archive, nothing is
+    extracted to disk. tar members come in the order they are stored,
+    so a compressed tar is decompressed once
+    '''
+    members = set(members)
+    if archive.endswith('.zip'):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if info.filename in members:
+                    with open_stream(zf.open(info), info.filename) as f:
+                        yield info.filename, f
+        return
+    # members are read in sequence, a compressed tar is only read forward
+    with tarfile.open(archive) as tf:
+        for member in tf:
+            if member.isfile() and member.name in members:
+                with open_stream(tf.extractfile(member), member.name) as f:
+                    yield member.name, f
+
+
+@contextmanager
+def open_buffer(gau_file):
+    '''
+    map the file into memory read-only, bytes are only read from disk
+    when they are searched, so searching from the end of the file
+    costs nothing for the beginning of it.
+    empty files give an empty bytes object (could not be mapped).
+    compressed files could not be mapped either, they are decompressed
+    into memory at once
+    '''
+    suffix = os.path.splitext(gau_file)[1]
+    if suffix in COMPRESSED_SUFFIXES:
+        with COMPRESSED_SUFFIXES[suffix](gau_file) as f:
+            yield f.read()
+        return
+
+    with open(gau_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buf
+        finally:
+            buf.close()
+
+
+def read_tail(gau_file, n_lines: int=9) -> List[str]:
+    '''
+    read the last lines of a file backwards block by block,
+    the file is never read in full.
+    none of the compressed formats could be read backwards, so they are
+    decompressed as a stream keeping only the last lines, only the
+    compressed bytes are read from disk and nothing else kept in memory
+    '''
+    suffix = os.path.splitext(gau_file)[1]
+    if suffix in COMPRESSED_SUFFIXES:
+        with COMPRESSED_SUFFIXES[suffix](gau_file) as f:
+            lines = deque(f, maxlen=n_lines)
+        return [line.decode(errors='replace') for line in lines]
+
+    with open(gau_file, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        block = TAIL_BLOCK
+        while True:
+            start = max(0, size - block)
+            f.seek(start)
+            lines = f.read(size - start).splitlines(keepends=True)
+            # first line could be cut in half unless read from the start
+            if start == 0 or len(lines) > n_lines:
+                break
+            block *= 2
+
+    return [line.decode(errors='replace') for line in lines[-n_lines:]]
+
+
+def get_line(buf, pos: int) -> bytes:
+    '''get the whole line containing position pos'''
+    start = buf.rfind(b'\n', 0, pos) + 1
+    end = buf.find(b'\n', pos)
+    if end < 0:
+        end = len(buf)
+    return buf[start:end + 1]
+
+
+def get_lines(buf, start: int, n_lines: int) -> List[bytes]:
+    '''get at most n_lines lines beginning at position start'''
+    lines = []
+    while start < len(buf) and len(lines) < n_lines:
+        end = buf.find(b'\n', start)
+        end = len(buf) if end < 0 else end + 1
+        lines.append(buf[start:end])
+        start = end
+    return lines
+
+
+def get_next_lines(buf, pos: int, n_lines: int) -> List[bytes]:
+    '''get at most n_lines lines following the line containing position pos'''
+    end = buf.find(b'\n', pos)
+    if end < 0:
+        return []
+    return get_lines(buf, end + 1, n_lines)
+
+
+def find_archives(buf) -> bytes:
+    '''
+    find every archive entry (one per job) searching from the end of the
+    buffer, the last one first and then one entry back at a time. lines
+    of the entries are stripped and joined into one in the order of the
+    file, the same as LogScanner keeps them. only the entries are split
+    into lines, the bytes between them are skipped by rfind.
+    if no archive entry, return empty bytes
+    '''
+    entries = []
+    stop = len(buf)
+    while True:
+        start = max(buf.rfind(marker, 0, stop) for marker in ARCHIVE_MARKERS)
+        if start < 0:
+            break
+        archive = []
+        pos = start + 1  # skip the newline before the entry
+        while pos < len(buf):
+            end = buf.find(b'\n', pos)
+            if end < 0:
+                end = len(buf)
+            line = buf[pos:end].strip()
+            archive.append(line)
+            if line.endswith(b'@'):
+                break
+            pos = end + 1
+        entries.append(b''.join(archive))
+        stop = start
+
+    return b''.join(reversed(entries))
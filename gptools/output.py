@@ -0,0 +1,211 @@
+# write the processed table as rows are ready, in several formats
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+from typing import List, TYPE_CHECKING
+
+from gptools.extractors import HISTORY_COLUMNS
+from gptools.profiling import staged
+from gptools.utils import write_rows
+
+# pandas is imported when a table is written or read, not with the module
+if TYPE_CHECKING:
+    import pandas as pd
+
+# formats of --output, named by file extension
+OUTPUT_FORMATS = ['csv', 'jsonl', 'parquet', 'feather']
+# files parsed and written at a time when streaming
+OUTPUT_CHUNK = 1000
+
+# columns of the output table and their types, by option
+BASE_COLUMNS = [
+    ('file_name', 'string'),
+    ('status', 'string'),
+    ('E', 'float64'),
+    ('G_corr', 'float64'),
+    ('G', 'float64'),
+    ('num_imag', 'Int64'),
+    ('freq_cons', 'float64'),
+]
+ENTROPY_COLUMNS = [
+    ('S_tot', 'float64'),
+    ('S_elec', 'float64'),
+    ('S_trans', 'float64'),
+    ('S_rot', 'float64'),
+    ('S_vib', 'float64'),
+]
+OPT_COLUMNS = [
+    ('opt_points', 'Int64'),
+    ('converge', 'Int64'),
+]
+QH_COLUMNS = [
+    ('ZPE', 'float64'),
+    ('H_corr', 'float64'),
+    ('H', 'float64'),
+    ('T.qh-S_tot', 'float64'),
+    ('qh-G_corr', 'float64'),
+    ('qh-G', 'float64'),
+]
+SOLV_COLUMNS = [
+    ('solv-G_corr', 'float64'),
+    ('solv-G', 'float64'),
+]
+
+
+def output_columns(need_entropy: bool=False, need_goodvibes: bool=False) -> List[tuple]:
+    '''(name, type) of every output column, fixed before any file is parsed'''
+    columns = BASE_COLUMNS.copy()
+    if need_entropy:
+        columns += ENTROPY_COLUMNS
+    columns += OPT_COLUMNS
+    if need_goodvibes:
+        columns += QH_COLUMNS
+    if need_entropy and need_goodvibes:
+        columns += SOLV_COLUMNS
+    return columns
+
+
+def conform(data_df: 'pd.DataFrame', columns: List[tuple]) -> 'pd.DataFrame':
+    '''put the table into the given columns and types, missing ones are null'''
+    data_df = data_df.reindex(columns=[name for name, _ in columns])
+    return data_df.astype(dict(columns))
+
+
+def get_format(output_file: str, output_format: str=None) -> str:
+    '''format given or told by the file extension, csv by default'''
+    if output_format:
+        return output_format
+    ext = os.path.splitext(output_file)[1].lstrip('.').lower()
+    if ext in ('json', 'ndjson'):
+        return 'jsonl'
+    if ext in ('pq', 'parq'):
+        return 'parquet'
+    if ext in ('arrow', 'ipc'):
+        return 'feather'
+    return ext if ext in OUTPUT_FORMATS else 'csv'
+
+
+def arrow_schema(columns: List[tuple]):
+    import pyarrow as pa
+    types = {'string': pa.string(), 'float64': pa.float64(), 'Int64': pa.int64()}
+    return pa.schema([(name, types[dtype]) for name, dtype in columns])
+
+
+class TableWriter:
+    '''
+    append tables of the same columns to one output file.
+    csv and jsonl are flushed after every table, so the rows written
+    survive a crash. parquet and feather need pyarrow, their rows are
+    readable once the writer is closed
+    '''
+    def __init__(self, output_file: str, output_format: str, columns: List[tuple]):
+        self.output_file = output_file
+        self.output_format = output_format
+        self.columns = columns
+        self.n_rows = 0
+        if output_format in ('csv', 'jsonl'):
+            self.f = open(output_file, 'w', newline='')
+            if output_format == 'csv':
+                import pandas as pd
+                pd.DataFrame(columns=[name for name, _ in columns]).to_csv(self.f, index=False)
+        else:
+            try:
+                import pyarrow.parquet as pq
+                import pyarrow.ipc as ipc
+            except ImportError:
+                raise ImportError(f'pyarrow is needed to write {output_format}, '
+                                  'install it by pip install pyarrow')
+            schema = arrow_schema(columns)
+            if output_format == 'parquet':
+                self.f = pq.ParquetWriter(output_file, schema)
+            else:
+                self.f = ipc.new_file(output_file, schema)
+            self.schema = schema
+
+    def write(self, data_df: 'pd.DataFrame'):
+        data_df = conform(data_df, self.columns)
+        if self.output_format == 'csv':
+            data_df.to_csv(self.f, header=False, index=False)
+        elif self.output_format == 'jsonl':
+            if not data_df.empty:
+                self.f.write(data_df.to_json(orient='records', lines=True).rstrip('\n') + '\n')
+        else:
+            import pyarrow as pa
+            self.f.write_table(pa.Table.from_pandas(data_df, schema=self.schema,
+                                                    preserve_index=False))
+        if self.output_format in ('csv', 'jsonl'):
+            self.f.flush()
+        self.n_rows += len(data_df)
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@staged('read_table')
+def read_table(table_file: str, table_format: str=None) -> 'pd.DataFrame':
+    '''read a table written by process in any output format'''
+    import pandas as pd
+
+    table_format = get_format(table_file, table_format)
+    if table_format == 'parquet':
+        return pd.read_parquet(table_file)
+    if table_format == 'feather':
+        return pd.read_feather(table_file)
+    if table_format == 'jsonl':
+        return pd.read_json(table_file, lines=True)
+    return pd.read_csv(table_file)
+
+
+@staged('write_history')
+def write_history(history_file: str, history_files: List[str], histories: List[list]):
+    '''
+    save optimization histories to one .npz file, an array of shape
+    (steps, len(HISTORY_COLUMNS)) per file name (missing values are nan),
+    column names are under 'columns'
+    '''
+    import numpy as np
+
+    arrays = {name: np.array(history, dtype=float).reshape(-1, len(HISTORY_COLUMNS))
+              for name, history in zip(history_files, histories)}
+    arrays['columns'] = np.array(HISTORY_COLUMNS)
+    np.savez_compressed(history_file, **arrays)
+    print(f'Optimization history of {len(history_files)} files wrote to {history_file}!')
+
+
+@staged('write_paths')
+def write_paths(path_file: str, path_files: List[str], paths: List[dict]):
+    '''
+    save the scan and IRC points of files (see PathScanner.arrays) to a
+    .npz file, each array under file_name/key. to a .csv file instead,
+    one row per point with the energy relative to the lowest point of the
+    file (kcal/mol) and a column per coordinate name, no geometries
+    '''
+    if path_file.endswith('.csv'):
+        from gptools.thermo import HARTREE_TO_KCAL
+
+        rows = []
+        for name, path in zip(path_files, paths):
+            energy = path['energy']
+            rel_energy = (energy - energy.min()) * HARTREE_TO_KCAL if len(energy) else energy
+            for k in range(len(energy)):
+                row = {'file_name': name, 'point': k, 'path': int(path['path'][k]),
+                       'E': float(energy[k]), 'rel_E': round(float(rel_energy[k]), 2),
+                       'converged': bool(path['converged'][k])}
+                row.update(zip(path['names'].tolist(), path['coordinate'][k].tolist()))
+                rows.append(row)
+        write_rows(rows, path_file)
+    else:
+        import numpy as np
+
+        arrays = {f'{name}/{key}': value
+                  for name, path in zip(path_files, paths) for key, value in path.items()}
+        np.savez_compressed(path_file, **arrays)
+    print(f'Scan and IRC points of {len(path_files)} files wrote to {path_file}!')
@@ -0,0 +1,91 @@
+# points of relaxed scans and IRCs streamed from gaussian output files
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from gptools.extractors import PathScanner, get_path
+from gptools.gauprocess import archive_dir, get_gau_list, member_files, row_name
+from gptools.logfile import is_log_archive, iter_archive
+from gptools.output import write_paths
+from gptools.prefetch import PREFETCH_MB, warm_files
+from gptools.profiling import staged
+
+PATH_FILE = 'gauprocess_paths.npz'
+
+
+def read_path(gau_file: str) -> PathScanner:
+    '''points of gau_file, None if it could not be read'''
+    try:
+        return get_path(gau_file)
+    except (OSError, ValueError, IndexError) as e:
+        print(f'Warning: {os.path.basename(gau_file)} could not be read ({type(e).__name__}: {e})!')
+        return None
+
+
+def read_paths(work_dir: str,
+               gau_list: List[str],
+               jobs: int=1,
+               prefetch: int=0,
+               prefetch_mb: float=PREFETCH_MB,
+               ):
+    '''
+    yield (file, points) of the files in gau_list in the same order, by
+    a pool of jobs processes (0 for all cores). members of an archive
+    work_dir are streamed from it one at a time
+    '''
+    if is_log_archive(work_dir):
+        for member, f in iter_archive(work_dir, gau_list):
+            yield member, PathScanner().scan(f)
+        return
+    gau_files = [os.path.join(work_dir, file) for file in gau_list]
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(gau_files))
+    if jobs <= 1:
+        yield from zip(gau_list, map(read_path, warm_files(gau_files, prefetch, prefetch_mb)))
+        return
+    chunksize = max(1, len(gau_files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from zip(gau_list, executor.map(read_path, gau_files, chunksize=chunksize))
+
+
+@staged('paths')
+def paths(work_dir: str=os.getcwd(),
+          inp_file: str=None,
+          path_file: str=PATH_FILE,
+          jobs: int=1,
+          prefetch: int=0,
+          prefetch_mb: float=PREFETCH_MB,
+          ):
+    '''
+    stream every file once and keep the points of its relaxed scan or
+    IRC (coordinate, energy and geometry, see PathScanner), files without
+    any are left out. output to a .npz file, or a .csv file without the
+    geometries
+    '''
+    work_dir, inp_file = archive_dir(work_dir, inp_file)
+    gau_list = get_gau_list(work_dir, inp_file)
+    if not gau_list:
+        return
+
+    print('Extracting scan and IRC points from gaussian output!')
+    # named as rows of process
+    files = member_files(gau_list) if is_log_archive(work_dir) else gau_list
+    names = {file: row_name(name) for file, name in zip(gau_list, files)}
+    path_files, found = [], []
+    for file, scanner in read_paths(work_dir, gau_list, jobs, prefetch, prefetch_mb):
+        if scanner is None or not len(scanner):
+            continue
+        name = names[file]
+        print(f'{name}: {len(scanner)} {scanner.kind} points')
+        path_files.append(name)
+        found.append(scanner.arrays())
+
+    if not path_files:
+        print('No scan or IRC points found!')
+        return
+    write_paths(path_file, path_files, found)
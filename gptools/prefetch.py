@@ -0,0 +1,100 @@
+# read files ahead in threads while the current one is parsed
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# default budget of bytes read ahead and not parsed yet
+PREFETCH_MB = 256
+MB = 1024 ** 2
+# bytes read at a time when warming a file
+WARM_BLOCK = 1 << 20
+
+
+def file_size(path) -> int:
+    '''size of the file, 0 if it could not be told (load reports the error)'''
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def warm(path, max_bytes: int=None) -> int:
+    '''
+    read the file (only its last max_bytes if larger) into one block
+    that is dropped, so the bytes are in the page cache of the os when
+    the parser reads them instead of being waited for from a network
+    filesystem. return the bytes read, 0 if the file could not be read
+    (the parser reports it)
+    '''
+    buf = bytearray(WARM_BLOCK)
+    total = 0
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            if max_bytes is not None and size > max_bytes:
+                f.seek(size - max_bytes)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                total += n
+    except OSError:
+        pass
+    return total
+
+
+def prefetch(items, load, n_ahead: int=8, max_mb: float=PREFETCH_MB, size=file_size):
+    '''
+    yield (item, load(item)) in the order of items, while load runs
+    ahead on the next items in a pool of n_ahead threads (blocking reads
+    let go of the GIL, so this overlaps latency even on a single core).
+    the sizes (size(item)) of items loaded but not yet taken stay within
+    max_mb, one item is always loaded however large. errors of load are
+    raised when their item is taken. n_ahead 0 loads each item when taken
+    '''
+    if n_ahead <= 0:
+        for item in items:
+            yield item, load(item)
+        return
+
+    budget = max_mb * MB
+    items = iter(items)
+    pending = deque()  # (item, size, future) in order
+    in_flight = 0
+    waiting = None  # next item, not submitted for lack of budget
+    with ThreadPoolExecutor(max_workers=n_ahead) as executor:
+        while True:
+            while len(pending) < n_ahead:
+                if waiting is None:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        break
+                    waiting = (item, size(item))
+                item, item_size = waiting
+                if pending and in_flight + item_size > budget:
+                    break
+                pending.append((item, item_size, executor.submit(load, item)))
+                in_flight += item_size
+                waiting = None
+            if not pending:
+                return
+            item, item_size, future = pending.popleft()
+            in_flight -= item_size
+            yield item, future.result()
+
+
+def warm_files(paths, n_ahead: int=8, max_mb: float=PREFETCH_MB):
+    '''
+    yield paths in order once the next ones are being read ahead (see
+    warm), a file larger than max_mb only has its end read ahead, where
+    the termination is judged from
+    '''
+    max_bytes = int(max_mb * MB)
+    for path, _ in prefetch(paths, lambda path: warm(path, max_bytes), n_ahead, max_mb,
+                            size=lambda path: min(file_size(path), max_bytes)):
+        yield path
@@ -0,0 +1,213 @@
+# time and measure the stages of a run, for --stats and --profile
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import sys
+import json
+import time
+import cProfile
+import functools
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not on windows
+    resource = None
+
+# stats of the current run, None when not measured (then stage costs nothing)
+STATS = None
+# where bytes read by the process are counted (linux only)
+PROC_IO = '/proc/self/io'
+
+
+def bytes_read() -> int:
+    '''
+    bytes read by read calls of this process so far, 0 if unknown.
+    files searched through mmap (from the end) are not counted
+    '''
+    try:
+        with open(PROC_IO, 'rb') as f:
+            for line in f:
+                if line.startswith(b'rchar:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def peak_rss() -> float:
+    '''peak resident memory in MB of this process or any of its children'''
+    if resource is None:
+        return 0.0
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # kilobytes on linux, bytes on macos
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+class Stats:
+    '''
+    wall time, calls, bytes read, lines scanned and peak rss of named
+    stages. stages nest, a stage is named after the stages it is in
+    (e.g. process/parse/get_status_from_file) and counts all of them
+    '''
+    def __init__(self):
+        self.stages = {}
+        self.path = []
+        self.start = time.perf_counter()
+
+    def record(self, name: str) -> dict:
+        return self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'bytes': 0,
+                                             'lines': 0, 'peak_rss_mb': 0.0})
+
+    def merge(self, stages: dict):
+        '''add stages measured elsewhere (e.g. in a worker process) under the current one'''
+        prefix = ''.join(f'{name}/' for name in self.path)
+        for name, other in stages.items():
+            record = self.record(prefix + name)
+            for key in ('calls', 'seconds', 'bytes', 'lines'):
+                record[key] += other[key]
+            record['peak_rss_mb'] = max(record['peak_rss_mb'], other['peak_rss_mb'])
+            # lines scanned by other processes are not seen by the current stages,
+            # their bytes are (added to the parent once they have exited)
+            if '/' not in name:
+                for i in range(len(self.path)):
+                    self.record('/'.join(self.path[:i + 1]))['lines'] += other['lines']
+
+    def report(self) -> dict:
+        return {'seconds': round(time.perf_counter() - self.start, 6),
+                'peak_rss_mb': round(peak_rss(), 1),
+                'stages': {name: dict(record, seconds=round(record['seconds'], 6),
+                                      peak_rss_mb=round(record['peak_rss_mb'], 1))
+                           for name, record in self.stages.items()}}
+
+    def table(self) -> str:
+        report = self.report()
+        width = max([len(name) for name in report['stages']] + [5])
+        lines = [f'{"stage":<{width}} {"calls":>8} {"seconds":>10} {"MB read":>10} '
+                 f'{"lines":>12} {"peak MB":>9}']
+        for name, record in report['stages'].items():
+            lines.append(f'{name:<{width}} {record["calls"]:>8} {record["seconds"]:>10.4f} '
+                         f'{record["bytes"] / 1024 ** 2:>10.2f} {record["lines"]:>12} '
+                         f'{record["peak_rss_mb"]:>9.1f}')
+        lines.append(f'total {report["seconds"]:.4f} s, peak rss {report["peak_rss_mb"]:.1f} MB')
+        return '\n'.join(lines)
+
+
+def enable() -> Stats:
+    global STATS
+    STATS = Stats()
+    return STATS
+
+
+def disable() -> Stats:
+    global STATS
+    stats, STATS = STATS, None
+    return stats
+
+
+@contextmanager
+def stage(name: str):
+    '''measure the code run inside as stage name, nothing if not enabled'''
+    stats = STATS
+    if stats is None:
+        yield
+        return
+    stats.path.append(name)
+    record = stats.record('/'.join(stats.path))
+    start_bytes = bytes_read()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record['seconds'] += time.perf_counter() - start
+        record['bytes'] += bytes_read() - start_bytes
+        record['calls'] += 1
+        record['peak_rss_mb'] = max(record['peak_rss_mb'], peak_rss())
+        stats.path.pop()
+
+
+def staged(name: str):
+    '''decorator measuring every call of a function as stage name'''
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if STATS is None:
+                return func(*args, **kwargs)
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(lines: int=0):
+    '''add lines scanned to every stage being measured'''
+    if STATS is None:
+        return
+    for i in range(len(STATS.path)):
+        STATS.record('/'.join(STATS.path[:i + 1]))['lines'] += lines
+
+
+def count_lines(lines):
+    '''pass lines through, counting them to every stage being measured'''
+    if STATS is None:
+        return lines
+    return _count_lines(lines, STATS)
+
+
+def _count_lines(lines, stats):
+    records = [stats.record('/'.join(stats.path[:i + 1])) for i in range(len(stats.path))]
+    n = 0
+    try:
+        for line in lines:
+            n += 1
+            yield line
+    finally:
+        for record in records:
+            record['lines'] += n
+
+
+def call_measured(func, *args):
+    '''
+    call func in a worker process with its own stats, return its result
+    and the stages measured, to be merged by the parent
+    '''
+    enable()
+    try:
+        result = func(*args)
+    finally:
+        stats = disable()
+    return result, stats.stages
+
+
+@contextmanager
+def measured(stats_file: str=None, profile_file: str=None):
+    '''
+    measure the run inside if stats_file or profile_file is given.
+    stats_file '-' prints a table of the stages, any other name also
+    writes them to that file as json. profile_file gets a cProfile dump,
+    read it by python -m pstats profile_file
+    '''
+    if stats_file is None and profile_file is None:
+        yield
+        return
+    if stats_file is not None:
+        enable()
+    profiler = cProfile.Profile() if profile_file else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_file)
+            print(f'Profile wrote to {profile_file}, read it by python -m pstats {profile_file}!')
+        stats = disable()
+        if stats is not None:
+            print(stats.table())
+            if stats_file != '-':
+                with open(stats_file, 'w') as f:
+                    json.dump(stats.report(), f, indent=2)
+                print(f'Stage stats wrote to {stats_file}!')
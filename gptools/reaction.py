@@ -0,0 +1,202 @@
+# reaction energy profiles and energetic spans from gauprocess results
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import csv
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from gptools.gensi import CSV_FILE, energy_titles
+from gptools.output import read_table
+from gptools.thermo import HARTREE_TO_KCAL
+
+PROFILE_FILE = 'gauprocess_profile.csv'
+SPAN_FILE = 'gauprocess_span.csv'
+# roles of species in a step, in the order of the profile
+ROLES = ['reactants', 'ts', 'products']
+
+
+def split_species(value) -> List[str]:
+    '''species of one role, a list or names joined by +, empty if none'''
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    if isinstance(value, str):
+        value = value.split('+')
+    return [str(name).strip() for name in value if str(name).strip()]
+
+
+def read_spec(spec_file: str) -> pd.DataFrame:
+    '''
+    read the steps of a reaction spec, one row per step with the
+    pathway and the species (file names) of each role as lists.
+    csv: columns pathway, reactants, ts, products (ts could be empty),
+    species of a role joined by +, steps in the order of a pathway.
+    yaml/yml: pathway names mapped to lists of steps, each a mapping of
+    reactants, ts and products (a name, a list or names joined by +)
+    '''
+    if spec_file.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise ImportError(f'pyyaml is needed to read {os.path.basename(spec_file)}, '
+                              'install it by pip install pyyaml')
+        with open(spec_file) as f:
+            spec = yaml.safe_load(f) or {}
+        steps = [{'pathway': str(pathway), **step}
+                 for pathway, pathway_steps in spec.items() for step in pathway_steps]
+    else:
+        with open(spec_file, newline='') as f:
+            steps = list(csv.DictReader(f))
+
+    spec_df = pd.DataFrame({'pathway': [str(step.get('pathway', '')) for step in steps]})
+    for role in ROLES:
+        spec_df[role] = [split_species(step.get(role)) for step in steps]
+    spec_df['step'] = spec_df.groupby('pathway', sort=False).cumcount() + 1
+    return spec_df
+
+
+def composite_energies(table_df: pd.DataFrame, free_title: str='G_corr') -> pd.Series:
+    '''
+    E_SP + free_title of every normal terminated file by file name, E_SP
+    is E of its single point file (name_sp) if any and its own E if not.
+    single points are looked up through one hashed index of the table
+    '''
+    table_df = table_df[table_df['status'] == 'Normal'].drop_duplicates('file_name')
+    energy = table_df.set_index('file_name')['E'].astype(float)
+    e_sp = energy.reindex(energy.index + '_sp').to_numpy()
+    e_sp = np.where(np.isnan(e_sp), energy.to_numpy(), e_sp)
+    corr = table_df[free_title].astype(float).to_numpy() if free_title in table_df else np.nan
+    return pd.Series(e_sp + corr, index=energy.index)
+
+
+def step_energies(spec_df: pd.DataFrame, energies: pd.Series):
+    '''
+    sum the energies of the species of every role of every step at once,
+    (steps, roles) in hartree, nan if a species is missing (or no ts).
+    also return the names not found
+    '''
+    n_steps = len(spec_df)
+    step_index, role_index, names = [], [], []
+    for k, role in enumerate(ROLES):
+        counts = spec_df[role].map(len).to_numpy()
+        step_index.append(np.repeat(np.arange(n_steps), counts))
+        role_index.append(np.full(counts.sum(), k))
+        names.extend(name for species in spec_df[role] for name in species)
+    step_index = np.concatenate(step_index)
+    role_index = np.concatenate(role_index)
+
+    found = energies.index.get_indexer(names)
+    values = np.where(found >= 0, energies.to_numpy()[found], np.nan)
+    cell = step_index * len(ROLES) + role_index
+    size = n_steps * len(ROLES)
+    sums = np.bincount(cell, weights=values, minlength=size)
+    counts = np.bincount(cell, minlength=size)
+    sums[counts == 0] = np.nan
+    missing = sorted({name for name, k in zip(names, found) if k < 0})
+    return sums.reshape(n_steps, len(ROLES)), missing
+
+
+def energetic_span(barrier: np.ndarray, reaction: np.ndarray) -> dict:
+    '''
+    energetic span of one pathway from the barriers and reaction
+    energies of its steps (kcal/mol), by the model of kozuch and shaik:
+    the largest TS - intermediate difference, with the reaction energy
+    added when the TS comes before the intermediate. a nan barrier is a
+    step without a TS listed, taken as barrierless. the TDI is given by
+    the step it is the reactants of, the TDTS by its own step
+    '''
+    n = len(reaction)
+    # intermediate k comes before the TS of step k + 1
+    levels = np.concatenate([[0.0], np.cumsum(reaction)])
+    ts = levels[:-1] + np.where(np.isnan(barrier), np.maximum(reaction, 0.0), barrier)
+    span = ts[None, :] - levels[:-1, None]
+    span = np.where(np.arange(n)[None, :] >= np.arange(n)[:, None], span, span + levels[-1])
+    tdi, tdts = np.unravel_index(np.nanargmax(span), span.shape)
+    return {'span': round(float(span[tdi, tdts]), 2), 'tdi_step': int(tdi) + 1,
+            'tdts_step': int(tdts) + 1, 'reaction': round(float(levels[-1]), 2)}
+
+
+def reaction_profile(table_df: pd.DataFrame,
+                     spec_df: pd.DataFrame,
+                     free_title: str='G_corr'):
+    '''
+    composite energies (see composite_energies) of the reactants, TS and
+    products of every step, barriers and reaction energies in kcal/mol,
+    computed for all steps at once. return the steps, the energetic span
+    of every pathway and the species not found in the table.
+    a pathway with a species not found (a TS listed but missing too) has
+    no energetic span
+    '''
+    energies = composite_energies(table_df, free_title)
+    sums, missing = step_energies(spec_df, energies)
+
+    steps_df = pd.DataFrame({
+        'pathway': spec_df['pathway'],
+        'step': spec_df['step'],
+        **{role: spec_df[role].map('+'.join) for role in ROLES},
+        **{f'G_{role}': np.round(sums[:, k], 6) for k, role in enumerate(ROLES)},
+        'barrier': np.round((sums[:, 1] - sums[:, 0]) * HARTREE_TO_KCAL, 2),
+        'reaction': np.round((sums[:, 2] - sums[:, 0]) * HARTREE_TO_KCAL, 2),
+    })
+
+    # steps of each pathway in their order, split once
+    codes, pathways = pd.factorize(steps_df['pathway'])
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    barriers = steps_df['barrier'].to_numpy()
+    reactions = steps_df['reaction'].to_numpy()
+    # barrierless steps have no TS listed, a TS listed but not found is missing
+    missing_ts = np.isnan(barriers) & (spec_df['ts'].map(len).to_numpy() > 0)
+    spans = []
+    for pathway, index in zip(pathways.tolist(), np.split(order, bounds)):
+        barrier = barriers[index]
+        reaction = reactions[index]
+        if np.isnan(reaction).any() or missing_ts[index].any():
+            span = {'span': np.nan, 'tdi_step': None, 'tdts_step': None,
+                    'reaction': round(float(reaction.sum()), 2)}
+        else:
+            span = energetic_span(barrier, reaction)
+        max_barrier = np.nanmax(barrier) if (~np.isnan(barrier)).any() else np.nan
+        spans.append({'pathway': pathway, 'steps': len(index),
+                      'max_barrier': max_barrier, **span})
+    span_df = pd.DataFrame(spans).astype({'tdi_step': 'Int64', 'tdts_step': 'Int64'})
+    return steps_df, span_df, missing
+
+
+def reaction(spec_file: str,
+             need_entropy: bool=False,
+             need_goodvibes: bool=False,
+             table_file: str=CSV_FILE,
+             table_format: str=None,
+             ):
+    '''
+    energy profile of the reaction steps listed in spec_file (see
+    read_spec) from the output of process (csv by default, any format).
+    energies are E_SP + G_corr, qh-G_corr with goodvibes, solv-G_corr with
+    goodvibes and entropy, the same as gensi.
+    output a csv file of the steps and one of the energetic span of
+    every pathway
+    '''
+    _, free_title = energy_titles(need_entropy, need_goodvibes)
+    table_df = read_table(table_file, table_format)
+    if free_title not in table_df:
+        print(f'Error: {free_title} not found in {table_file}, process it with the same options!')
+        return
+    spec_df = read_spec(spec_file)
+    print(f'Computing {len(spec_df)} steps of {spec_df["pathway"].nunique()} pathways '
+          f'with E_SP + {free_title}!')
+
+    steps_df, span_df, missing = reaction_profile(table_df, spec_df, free_title)
+    if missing:
+        print(f'Warning! {len(missing)} species not found or not terminated normally: '
+              f'{", ".join(missing[:10])}{" ..." if len(missing) > 10 else ""}')
+    steps_df.to_csv(PROFILE_FILE, index=False)
+    span_df.to_csv(SPAN_FILE, index=False)
+    print(f'Steps wrote to {PROFILE_FILE} and energetic spans to {SPAN_FILE} in current folder!')
@@ -0,0 +1,145 @@
+# parse gaussian output files in memory, for use as a library
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from itertools import islice, repeat
+from typing import Iterable, Iterator, List, Optional
+
+from gptools.gauprocess import process_file
+
+# files handed to the worker processes of parse_many at a time
+PARSE_BATCH = 256
+# records are slotted where dataclasses support it (python 3.10+)
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**DATACLASS_SLOTS)
+class GaussianResult:
+    '''
+    result of one gaussian output file, fields are named as the columns
+    of gauprocess.csv. values not extracted are None, so are the fields
+    of the other status: energies and frequencies are only given for
+    'Normal' files, opt_points and converge only for 'Error/Running'.
+    'Failed' files could not be parsed, error tells why
+    '''
+    file_name: str
+    status: str
+    path: Optional[str] = None
+    E: Optional[float] = None
+    G_corr: Optional[float] = None
+    G: Optional[float] = None
+    num_imag: Optional[int] = None
+    freq_cons: Optional[float] = None
+    S_tot: Optional[float] = None
+    S_elec: Optional[float] = None
+    S_trans: Optional[float] = None
+    S_rot: Optional[float] = None
+    S_vib: Optional[float] = None
+    opt_points: Optional[int] = None
+    converge: Optional[int] = None
+    # inputs of quasi-harmonic corrections, see gptools.thermo
+    thermo: Optional[dict] = None
+    # last geometry, see get_geometry
+    geometry: Optional[dict] = None
+    # optimization history, one row per step, see HISTORY_COLUMNS
+    history: Optional[list] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data_dict: dict, path: str=None) -> 'GaussianResult':
+        '''record from a result dict of process_file, unknown keys are dropped'''
+        return cls(path=path, **{key: value for key, value in data_dict.items()
+                                 if key in RESULT_FIELDS})
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in RESULT_FIELDS}
+
+
+RESULT_FIELDS = [field.name for field in fields(GaussianResult)]
+# fields kept out of tables, they are not single values
+NESTED_FIELDS = ['thermo', 'geometry', 'history']
+
+
+def parse_log(path: str,
+              need_entropy: bool=False,
+              need_thermo: bool=False,
+              need_geometry: bool=False,
+              need_history: bool=False,
+              ) -> GaussianResult:
+    '''
+    parse one gaussian output file (plain or compressed) into a record,
+    nothing is printed or written. errors are raised.
+    need_entropy: extract S_tot, S_elec, S_trans, S_rot and S_vib
+    need_thermo: keep inputs of quasi-harmonic corrections as thermo
+    need_geometry: keep the last geometry of normal terminated files
+    need_history: keep the optimization history of running or error files
+    '''
+    data_dict = process_file(path, need_entropy, need_thermo=need_thermo,
+                             state={} if need_history else None,
+                             need_geometry=need_geometry)
+    data_dict.pop('progress', None)
+    return GaussianResult.from_dict(data_dict, path)
+
+
+def try_parse_log(path: str, *options) -> GaussianResult:
+    '''same as parse_log, but a file that could not be parsed gives a 'Failed' record'''
+    try:
+        return parse_log(path, *options)
+    except Exception as e:
+        return GaussianResult(file_name=os.path.basename(path).split('.')[0], status='Failed',
+                              path=path, error=f'{type(e).__name__}: {e}')
+
+
+def parse_many(paths: Iterable[str],
+               need_entropy: bool=False,
+               need_thermo: bool=False,
+               need_geometry: bool=False,
+               need_history: bool=False,
+               jobs: int=1,
+               ) -> Iterator[GaussianResult]:
+    '''
+    parse files lazily, records are yielded in the order of paths as
+    they are ready, paths could be any iterable (e.g. a generator).
+    with jobs processes (0 for all cores) PARSE_BATCH files are parsed at
+    a time. files that could not be parsed give 'Failed' records, see
+    parse_log for the options
+    '''
+    options = (need_entropy, need_thermo, need_geometry, need_history)
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1:
+        for path in paths:
+            yield try_parse_log(path, *options)
+        return
+
+    paths = iter(paths)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        while True:
+            batch = list(islice(paths, PARSE_BATCH))
+            if not batch:
+                break
+            chunksize = max(1, len(batch) // (jobs * 4))
+            yield from executor.map(try_parse_log, batch,
+                                    *[repeat(option) for option in options],
+                                    chunksize=chunksize)
+
+
+def to_dataframe(results: Iterable[GaussianResult], columns: List[str]=None):
+    '''
+    put records into one table at once, by columns. pandas is only
+    imported here. without columns, the fields having any value are used
+    (nested ones like thermo and geometry excluded)
+    '''
+    import pandas as pd
+
+    results = list(results)
+    if columns is None:
+        columns = [name for name in RESULT_FIELDS if name not in NESTED_FIELDS
+                   and any(getattr(result, name) is not None for result in results)]
+    return pd.DataFrame({name: [getattr(result, name) for result in results]
+                         for name in columns}, columns=columns)
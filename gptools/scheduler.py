@@ -0,0 +1,120 @@
+# get running jobs from the queueing system
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import json
+import time
+import getpass
+import subprocess
+from abc import ABC, abstractmethod
+
+# running jobs are kept here for ttl seconds, in the collected folder
+QUEUE_CACHE_FILE = '.gptools_queue.json'
+
+
+class Scheduler(ABC):
+    '''
+    base of the queueing system backends, each gives its own query.
+    running_jobs makes one query for all jobs of user, cached in
+    cache_dir (if given) for ttl seconds, and returns job ids as a set
+    '''
+    name = ''
+
+    def __init__(self, user: str=None, ttl: float=60.0, cache_dir: str=None):
+        self.user = user or getpass.getuser()
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+
+    @abstractmethod
+    def query(self) -> set:
+        '''ids of queued or running jobs of user'''
+
+    def run(self, cmd: list) -> str:
+        '''output of the queue command, empty if it could not be run'''
+        try:
+            p = subprocess.run(cmd, capture_output=True, text=True)
+        except OSError as e:
+            print(f'Warning: {cmd[0]} could not be run ({e}), no job is taken as running!')
+            return ''
+        if p.returncode != 0:
+            print(f'Warning: {" ".join(cmd)} failed ({p.stderr.strip()}), no job is taken as running!')
+            return ''
+        return p.stdout
+
+    def running_jobs(self) -> set:
+        if self.cache_dir is None or self.ttl <= 0:
+            return self.query()
+
+        cache_file = os.path.join(self.cache_dir, QUEUE_CACHE_FILE)
+        key = {'scheduler': self.name, 'user': self.user}
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+            if cached['key'] == key and time.time() - cached['time'] < self.ttl:
+                return set(cached['jobs'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        jobs = self.query()
+        try:
+            with open(cache_file, 'w') as f:
+                json.dump({'key': key, 'time': time.time(), 'jobs': sorted(jobs)}, f)
+        except OSError:
+            pass
+        return jobs
+
+
+class SGEScheduler(Scheduler):
+    '''Sun Grid Engine, by qstat'''
+    name = 'sge'
+
+    def query(self) -> set:
+        lines = self.run(['qstat', '-u', self.user]).splitlines()
+        # header and separator lines do not start with a number
+        return {line.split()[0] for line in lines
+                if line.split() and line.split()[0].isdigit()}
+
+
+class SlurmScheduler(Scheduler):
+    '''Slurm, by squeue'''
+    name = 'slurm'
+
+    def query(self) -> set:
+        lines = self.run(['squeue', '-h', '-u', self.user, '-o', '%i']).splitlines()
+        return {line.strip() for line in lines if line.strip()}
+
+
+class LocalScheduler(Scheduler):
+    '''
+    no queueing system, only the given job ids are taken as running.
+    also useful to test gaucollect without a cluster
+    '''
+    name = 'local'
+
+    def __init__(self, user: str=None, ttl: float=60.0, cache_dir: str=None,
+                 running: set=()):
+        super().__init__(user, ttl, cache_dir)
+        self.running = set(running)
+
+    def query(self) -> set:
+        return set(self.running)
+
+    def running_jobs(self) -> set:
+        return self.query()
+
+
+SCHEDULERS = {
+    'sge': SGEScheduler,
+    'slurm': SlurmScheduler,
+    'local': LocalScheduler,
+}
+
+
+def get_scheduler(name: str='sge', **kwargs) -> Scheduler:
+    '''get the backend of a queueing system by name'''
+    try:
+        return SCHEDULERS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f'unknown scheduler {name}, choose from {list(SCHEDULERS)}')
@@ -0,0 +1,62 @@
+# evaluate free energy terms over a grid of conditions
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+from typing import List
+
+from gptools.gauprocess import archive_dir, get_gau_list, collect_data, split_thermo
+
+SWEEP_FILE = 'gauprocess_sweep.csv'
+
+
+def sweep(work_dir: str=os.getcwd(),
+          inp_file: str=None,
+          temps: List[float]=[298.15],
+          concs: List[float]=[1.0],
+          factors_rot: List[float]=[0.5],
+          factors_trans: List[float]=[0.5],
+          jobs: int=1,
+          use_cache: bool=True,
+          cache_hash: bool=False,
+          freq_scale: float=1.0,
+          ):
+    '''
+    parse each gaussian output file once, then compute qh-G and solv-G
+    of every file with frequencies over the full grid of temperatures,
+    concentrations and scaling factors of S_rot and S_trans.
+    output to a long csv file with one row per file and grid point,
+    the values of each grid point are the same as the ones process
+    gives with -s -g at that point.
+    '''
+    # numpy and pandas are only needed here
+    from gptools.thermo import free_energy_sweep
+
+    work_dir, inp_file = archive_dir(work_dir, inp_file)
+    gau_list = get_gau_list(work_dir, inp_file)
+    if not gau_list:
+        return
+
+    n_points = len(temps) * len(concs) * len(factors_rot) * len(factors_trans)
+    print(f'Temperatures used are {temps}K!')
+    print(f'Concentrations used are {concs}M!')
+    print(f'Scaling factors for S_rot are {factors_rot}')
+    print(f'Scaling factors for S_trans are {factors_trans}')
+    print('Extracting data from gaussian output!')
+    data_list = collect_data(work_dir, gau_list, True, True,
+                             jobs, use_cache, cache_hash)
+    entropy_list = [data_dict for data_dict in data_list
+                    if data_dict.get('thermo') is not None]
+    thermo_files, thermo_list = split_thermo(data_list)
+
+    print(f'Calculating free energies of {len(thermo_files)} files at {n_points} grid points!')
+    sweep_df = free_energy_sweep(thermo_files, thermo_list, entropy_list,
+                                 temps, concs, factors_rot, factors_trans,
+                                 freq_scale)
+    if sweep_df.empty:
+        print('No files with frequencies found!')
+        return
+
+    sweep_df.to_csv(SWEEP_FILE, index=False)
+    print(f'All data wrote to {SWEEP_FILE} in current folder!')
@@ -0,0 +1,157 @@
+# synthetic gaussian output files for benchmarks
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import re
+import shutil
+from typing import List
+
+OPT_TEMPLATE = 'AJM_573.log'  # opt freq, minimum
+TS_TEMPLATE = 'pryimidone-2-Me-14-ts14.log'  # opt freq, transition state
+SP_TEMPLATE = 'AJM_573_sp.log'  # single point
+TEMPLATES = [OPT_TEMPLATE, TS_TEMPLATE, SP_TEMPLATE]
+# sample logs in test/ of a source checkout, used as templates. they are
+# not installed with the package, elsewhere the folder must be given
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test')
+if not all(os.path.isfile(os.path.join(TEMPLATE_DIR, file)) for file in TEMPLATES):
+    TEMPLATE_DIR = None
+
+# end of each optimization step
+STEP_END = 'Predicted change in Energy'
+STEP_NUMBER = re.compile(r'Step number\s+\d+')
+# rows of per atom tables (coordinates, forces, normal modes): numbers only
+ATOM_ROW = re.compile(r'^\s+\d+(\s+-?\d+(\.\d+)?)+\s*$')
+
+
+def check_template_dir(template_dir: str) -> str:
+    '''template_dir if it has every template log, else FileNotFoundError'''
+    if template_dir is None:
+        raise FileNotFoundError('No template folder, give one with the sample logs '
+                                f'({", ".join(TEMPLATES)}), e.g. test/ of the gptools repository!')
+    missing = [file for file in TEMPLATES if not os.path.isfile(os.path.join(template_dir, file))]
+    if missing:
+        raise FileNotFoundError(f'{", ".join(missing)} not found in {template_dir}!')
+    return template_dir
+
+
+class LogTemplate:
+    '''
+    a gaussian output file cut into the part before the second
+    optimization step (head), one optimization step (step) and the part
+    after the last step (tail, with freq job, archive and termination)
+    '''
+    def __init__(self, template_file: str):
+        with open(template_file) as f:
+            lines = f.readlines()
+        # steps of the first job only, the freq job prints a converge table too
+        first_end = next((i for i, line in enumerate(lines) if 'Normal termination' in line),
+                         len(lines))
+        ends = [i for i, line in enumerate(lines[:first_end]) if STEP_END in line]
+        # the last step has no predicted change
+        self.n_steps = len(ends) + 1 if ends else 0
+        if len(ends) < 2:  # no steps to repeat, e.g. single point
+            self.head, self.step, self.tail = lines, [], []
+        else:
+            self.head = lines[:ends[0] + 1]
+            self.step = lines[ends[0] + 1:ends[1] + 1]
+            self.tail = lines[ends[-1] + 1:]
+
+    def write(self, gau_file: str, n_steps: int=None, atom_scale: int=1,
+              max_bytes: int=None):
+        '''
+        write a log with n_steps optimization steps (as the template if
+        None) and every per atom row repeated atom_scale times.
+        the file is cut after max_bytes, like a job still running.
+        written as a stream, so multi-GB files need no memory
+        '''
+        if n_steps is None:
+            n_steps = self.n_steps
+        # steps between the first (in head) and the last one (in tail)
+        n_middle = max(0, n_steps - 2) if self.step else 0
+        step = 0
+
+        def scale(lines):
+            nonlocal step
+            out = []
+            for line in lines:
+                if 'Step number' in line:
+                    step += 1
+                    line = STEP_NUMBER.sub(f'Step number {step:>3}', line)
+                out.append(line)
+                if atom_scale > 1 and ATOM_ROW.match(line):
+                    out.extend([line] * (atom_scale - 1))
+            return ''.join(out)
+
+        written = 0
+        with open(gau_file, 'w') as f:
+            def put(text):
+                nonlocal written
+                if max_bytes is not None and written + len(text) > max_bytes:
+                    text = text[:max(0, max_bytes - written)]
+                f.write(text)
+                written += len(text)
+                return max_bytes is None or written < max_bytes
+
+            if not put(scale(self.head)):
+                return
+            for _ in range(n_middle):
+                if not put(scale(self.step)):
+                    return
+            put(scale(self.tail))
+
+    def step_bytes(self, atom_scale: int=1) -> int:
+        '''size of one optimization step in bytes, to aim at a file size'''
+        n = sum(len(line) * (atom_scale if ATOM_ROW.match(line) else 1) for line in self.step)
+        return max(n, 1)
+
+
+def write_goodvibes_output(gv_file: str, names: List[str]):
+    '''goodvibes (v3) output with one row per name, values as in the samples'''
+    star = '   ' + '*' * 128 + '\n'
+    with open(gv_file, 'w') as f:
+        f.write('   GoodVibes v3.2\n\n')
+        f.write('   Structure                                           E        ZPE'
+                '             H        T.S     T.qh-S          G(T)       qh-G(T)\n')
+        f.write(star)
+        for name in names:
+            f.write(f'o  {name:<36} -2283.155184   0.433987  -2282.691944   0.092195'
+                    '   0.085099  -2282.784139  -2282.777044\n')
+        f.write(star)
+
+
+def make_campaign(work_dir: str, n_files: int, template_dir: str=TEMPLATE_DIR,
+                  n_steps: int=None, atom_scale: int=1) -> List[str]:
+    '''
+    fill work_dir with n_files logs like a real campaign: opt freq jobs
+    (minimum and transition state), their single points and some still
+    running. only one of each kind is generated, the rest are copies
+    '''
+    check_template_dir(template_dir)
+    os.makedirs(work_dir, exist_ok=True)
+    kinds = {}
+    for kind, template, running in [('min', OPT_TEMPLATE, False),
+                                    ('min_sp', SP_TEMPLATE, False),
+                                    ('ts', TS_TEMPLATE, False),
+                                    ('run', OPT_TEMPLATE, True)]:
+        source = os.path.join(work_dir, f'.template_{kind}.log')
+        log = LogTemplate(os.path.join(template_dir, template))
+        max_bytes = None
+        if running:  # cut in the middle of the optimization
+            n_done = max(1, (n_steps or log.n_steps) // 2)
+            max_bytes = len(''.join(log.head)) + log.step_bytes(atom_scale) * n_done
+        log.write(source, n_steps, atom_scale, max_bytes)
+        kinds[kind] = source
+
+    names = []
+    order = ['min', 'min_sp', 'ts', 'run']
+    for i in range(n_files):
+        kind = order[i % len(order)]
+        # single points pair with the opt job before them, for gensi
+        name = f'job{i - 1:05d}_sp.log' if kind == 'min_sp' else f'job{i:05d}.log'
+        shutil.copyfile(kinds[kind], os.path.join(work_dir, name))
+        names.append(name)
+    for source in kinds.values():
+        os.remove(source)
+    return names
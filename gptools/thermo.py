@@ -0,0 +1,215 @@
+# quasi-harmonic thermochemistry from parsed gaussian output
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from gptools.extractors import solv_corr_terms
+
+# physical constants, same values as goodvibes        UNITS
+GAS_CONSTANT = 8.3144621  # J / K / mol
+PLANCK_CONSTANT = 6.62606957e-34  # J * s
+BOLTZMANN_CONSTANT = 1.3806488e-23  # J / K
+SPEED_OF_LIGHT = 2.99792458e10  # cm / s
+AVOGADRO_CONSTANT = 6.0221415e23  # 1 / mol
+AMU_to_KG = 1.66053886E-27  # UNIT CONVERSION
+HARTREE_TO_KCAL = 627.509541  # UNIT CONVERSION
+J_TO_AU = 4.184 * 627.509541 * 1000.0  # UNIT CONVERSION
+# average moment of inertia of free rotors used by Grimme (kg m^2)
+BAV = 1.00e-44
+
+
+def pad_freqs(thermo_list: List[dict], freq_scale: float=1.0):
+    '''
+    put real frequencies (scaled) of all files into one 2D array,
+    padded with nan, so every file is computed in one go
+    '''
+    freqs = [[fr for fr in thermo['freqs'] if fr > 0.0] for thermo in thermo_list]
+    n_modes = max([len(fr) for fr in freqs] + [1])
+    freq_arr = np.full((len(freqs), n_modes), np.nan)
+    for i, fr in enumerate(freqs):
+        freq_arr[i, :len(fr)] = fr
+    return freq_arr * freq_scale
+
+
+def qh_terms(thermo_list: List[dict],
+             temp=298.15,
+             conc=1.0,
+             freq_scale: float=1.0,
+             freq_cutoff: float=100.0,
+             ) -> dict:
+    '''
+    compute ZPE, H and quasi-harmonic entropy terms (Grimme's quasi-RRHO
+    with the same defaults as goodvibes) for all files at once.
+    thermo_list comes from LogScanner.thermo_data. temp and conc could be
+    numbers or arrays of the same length (grid points), every value
+    returned is an array in hartree of shape (grid points, files).
+    '''
+    # grid points in rows, files in columns, modes in the last axis
+    temp = np.asarray(temp, dtype=float).reshape(-1, 1)
+    conc = np.asarray(conc, dtype=float).reshape(-1, 1)
+    freq = pad_freqs(thermo_list, freq_scale)
+    has_freq = ~np.isnan(freq[:, 0])
+    energy = np.array([thermo['energy'] for thermo in thermo_list], dtype=float)
+    mass = np.array([thermo['mass'] for thermo in thermo_list], dtype=float)
+    mult = np.array([thermo['mult'] for thermo in thermo_list], dtype=float)
+    symmno = np.array([thermo['symmno'] for thermo in thermo_list], dtype=float)
+    zpe_corr = np.array([thermo['zpe_corr'] for thermo in thermo_list], dtype=float)
+    n_rotemp = np.array([len(thermo['rotemp']) for thermo in thermo_list])
+    rotemp = np.ones((len(thermo_list), 3))
+    for i, thermo in enumerate(thermo_list):
+        rotemp[i, :len(thermo['rotemp'])] = thermo['rotemp'][:3]
+    monatomic = np.all(rotemp == 0.0, axis=1) | (zpe_corr == 0.0)
+    linear_mol = np.array([thermo['linear'] for thermo in thermo_list], dtype=bool)
+
+    # translational and electronic terms
+    u_trans = 1.5 * GAS_CONSTANT * temp
+    lmda = np.sqrt(2.0 * np.pi * mass * AMU_to_KG * BOLTZMANN_CONSTANT * temp) / PLANCK_CONSTANT
+    ndens = conc * 1000 * AVOGADRO_CONSTANT
+    s_trans = GAS_CONSTANT * (2.5 + np.log(lmda ** 3 / ndens))
+    s_elec = GAS_CONSTANT * np.log(mult)
+
+    # rotational terms
+    u_rot = np.where(linear_mol, GAS_CONSTANT * temp, 1.5 * GAS_CONSTANT * temp)
+    u_rot = np.where(monatomic | ~has_freq, 0.0, u_rot)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        qrot_linear = temp / rotemp[:, 0]
+        qrot = np.sqrt(np.pi * temp ** 3 / np.prod(rotemp, axis=1))
+        # rotational entropy follows the number of rotational temperatures
+        s_rot = np.where(n_rotemp == 1,
+                         GAS_CONSTANT * (np.log(qrot_linear / symmno) + 1),
+                         GAS_CONSTANT * (np.log(qrot / symmno) + 1.5))
+    s_rot = np.where(monatomic | (n_rotemp == 2) | ~has_freq, 0.0, s_rot)
+
+    # vibrational terms, nan entries are padding and summed as zero
+    factor = PLANCK_CONSTANT * freq * SPEED_OF_LIGHT / BOLTZMANN_CONSTANT
+    zpe = np.nansum(0.5 * factor * GAS_CONSTANT, axis=1)
+    x = factor / temp[:, :, None]
+    u_vib = np.nansum(x * GAS_CONSTANT * temp[:, :, None] * (0.5 + 1.0 / np.expm1(x)), axis=-1)
+    s_rrho = x * GAS_CONSTANT / np.expm1(x) - GAS_CONSTANT * np.log(-np.expm1(-x))
+    mu = PLANCK_CONSTANT / (8 * np.pi ** 2 * freq * SPEED_OF_LIGHT)
+    mu_primed = mu * BAV / (mu + BAV)
+    s_free_rot = (0.5 + np.log(np.sqrt(8 * np.pi ** 3 * mu_primed * BOLTZMANN_CONSTANT
+                                       * temp[:, :, None] / PLANCK_CONSTANT ** 2))) * GAS_CONSTANT
+    damp = 1 / (1 + (freq_cutoff / freq) ** 4)
+    qh_s_vib = np.nansum(s_rrho * damp + (1 - damp) * s_free_rot, axis=-1)
+
+    enthalpy = energy + (u_trans + u_rot + u_vib + GAS_CONSTANT * temp) / J_TO_AU
+    qh_entropy = (s_trans + s_rot + qh_s_vib + s_elec) / J_TO_AU
+
+    return {'E': np.broadcast_to(energy, enthalpy.shape),
+            'ZPE': np.broadcast_to(zpe / J_TO_AU, enthalpy.shape),
+            'H': enthalpy,
+            'T.qh-S': temp * qh_entropy,
+            'qh-G': enthalpy - temp * qh_entropy}
+
+
+def round_terms(terms: dict) -> dict:
+    '''
+    round like the values printed by goodvibes before taking differences,
+    named as the columns of extract_goodvibes_result
+    '''
+    energy = np.round(terms['E'], 6)
+    enthalpy = np.round(terms['H'], 6)
+    qh_gibbs = np.round(terms['qh-G'], 6)
+    return {'ZPE': np.round(terms['ZPE'], 6),
+            'H_corr': np.round(enthalpy - energy, 6),
+            'H': enthalpy,
+            'T.qh-S_tot': np.round(terms['T.qh-S'], 6),
+            'qh-G_corr': np.round(qh_gibbs - energy, 6),
+            'qh-G': qh_gibbs}
+
+
+def get_qh_thermo(file_list: List[str],
+                  thermo_list: List[dict],
+                  temp: float=298.15,
+                  conc: float=1.0,
+                  freq_scale: float=1.0,
+                  ) -> pd.DataFrame:
+    '''
+    quasi-harmonic results in the same columns as extract_goodvibes_result,
+    computed in process instead of running goodvibes.
+    '''
+    if not file_list:
+        return pd.DataFrame([])
+
+    terms = round_terms(qh_terms(thermo_list, temp, conc, freq_scale))
+    gv_df = pd.DataFrame({'file_name': file_list})
+    for col, values in terms.items():
+        gv_df[col] = values[0]
+    return gv_df
+
+
+# number of array entries computed at once in a sweep
+MAX_SWEEP_SIZE = 1 << 22
+
+
+def free_energy_sweep(file_list: List[str],
+                      thermo_list: List[dict],
+                      entropy_list: List[dict],
+                      temps: List[float],
+                      concs: List[float],
+                      factors_rot: List[float],
+                      factors_trans: List[float],
+                      freq_scale: float=1.0,
+                      ) -> pd.DataFrame:
+    '''
+    evaluate quasi-harmonic and solvent corrected free energy terms of
+    all files over the full grid of temperature, concentration and
+    scaling factors of S_rot and S_trans.
+    entropy_list holds E, S_tot, S_rot and S_trans of each file as given
+    by get_sp_energy and get_entropy, solv-G follows get_solv_corr.
+    returns a long table with one row per file and grid point
+    '''
+    if not file_list:
+        return pd.DataFrame([])
+
+    # temperature and concentration change the quasi-harmonic terms
+    grid_temp, grid_conc = [a.ravel() for a in np.meshgrid(temps, concs, indexing='ij')]
+    # scaling factors only change the solvent correction
+    grid_rot, grid_trans = [a.ravel() for a in np.meshgrid(factors_rot, factors_trans, indexing='ij')]
+
+    n_files = len(file_list)
+    n_modes = pad_freqs(thermo_list).shape[1]
+    chunk = max(1, MAX_SWEEP_SIZE // (n_files * n_modes))
+    chunks = [round_terms(qh_terms(thermo_list, grid_temp[i:i + chunk],
+                                   grid_conc[i:i + chunk], freq_scale))
+              for i in range(0, len(grid_temp), chunk)]
+    qh = {col: np.concatenate([c[col] for c in chunks]) for col in chunks[0]}
+
+    # solvent correction, axes are (temperature/concentration, factors, files)
+    def column(name):
+        return np.array([e[name] for e in entropy_list], dtype=float)
+
+    temp = grid_temp[:, None, None]
+    solv_corr, solv_gibbs = solv_corr_terms(column('E'),
+                                            qh['H_corr'][:, None, :],
+                                            qh['T.qh-S_tot'][:, None, :],
+                                            column('S_tot'),
+                                            column('S_rot'),
+                                            column('S_trans'),
+                                            temp,
+                                            grid_rot[None, :, None],
+                                            grid_trans[None, :, None])
+
+    # one row per file and grid point, files first
+    shape = solv_corr.shape
+    def flat(values):
+        return np.broadcast_to(values, shape).transpose(2, 0, 1).ravel()
+
+    sweep_df = pd.DataFrame({
+        'file_name': np.repeat(np.asarray(file_list, dtype=object), shape[0] * shape[1]),
+        'temperature': flat(temp),
+        'concentration': flat(grid_conc[:, None, None]),
+        'factor_rot': flat(grid_rot[None, :, None]),
+        'factor_trans': flat(grid_trans[None, :, None]),
+    })
+    for col, values in qh.items():
+        sweep_df[col] = flat(values[:, None, :])
+    sweep_df['solv-G_corr'] = flat(solv_corr)
+    sweep_df['solv-G'] = flat(solv_gibbs)
+    return sweep_df
@@ -3,11 +3,87 @@
 # creation time: Dec, 2022
 # version: 2025/03/05
 
-import pandas as pd
+import os
+import csv
+import math
+import tempfile
 from collections import defaultdict
+from contextlib import contextmanager
+from typing import List
+
+
+def file_mode(path) -> int:
+    '''permission bits of path, 0o666 less the umask if it does not exist'''
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_open(output_file):
+    '''
+    open a temporary file next to output_file to write and then rename
+    it, readers never see a half written file. the file gets the mode
+    of the one it replaces, or the one open() would give a new file
+    '''
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    fd, tmp_file = tempfile.mkstemp(dir=output_dir, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_file, file_mode(output_file))
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+
+def write_csv(data_df, output_file):
+    '''write the table to output_file at once, see atomic_open'''
+    with atomic_open(output_file) as f:
+        data_df.to_csv(f, index=False)
+
+
+def is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def csv_column(values: list) -> list:
+    '''
+    text of one column the same as pandas writes it: numbers of a column
+    having floats or missing values are floats, missing values are empty
+    '''
+    present = [value for value in values if not is_missing(value)]
+    numeric = all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                  for value in present)
+    as_float = numeric and (len(present) < len(values) or
+                            any(isinstance(value, float) for value in present))
+    return ['' if is_missing(value) else repr(float(value)) if as_float else str(value)
+            for value in values]
+
+
+def write_rows(rows: List[dict], output_file):
+    '''
+    write result dicts to output_file as csv without pandas, columns in
+    the order they are first seen, the same text as write_csv would give
+    '''
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    texts = [csv_column([row.get(name) for row in rows]) for name in columns]
+    with atomic_open(output_file) as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(columns)
+        writer.writerows(zip(*texts))
 
 
 def merge_and_update(old_df, new_df):
+    import pandas as pd
+
     # no successful goodvibes calculation
     if new_df.empty:
         return old_df
@@ -15,19 +91,15 @@ def merge_and_update(old_df, new_df):
     # merge based on file_name
     merged_df = pd.merge(old_df, new_df, on='file_name', how='outer', suffixes=('_old', '_new'))
 
-    # update value for the same key and deal with different keys
-    columns = set(old_df.columns).union(set(new_df.columns)) - {'file_name'}
-    
-    for col in columns:
-        if col + '_old' in merged_df and col + '_new' in merged_df:
-            # replace old values with new one
-            merged_df[col] = merged_df[col + '_new'].combine_first(merged_df[col + '_old'])
-            # remove temp col
-            merged_df.drop([col + '_old', col + '_new'], axis=1, inplace=True)
-        elif col + '_old' in merged_df:
-            merged_df.rename(columns={col + '_old': col}, inplace=True)
-        elif col + '_new' in merged_df:
-            merged_df.rename(columns={col + '_new': col}, inplace=True)
+    # update value for the same key, new values first, all columns at once
+    columns = [col for col in old_df.columns
+               if col in new_df.columns and col != 'file_name']
+    if columns:
+        old_cols = [col + '_old' for col in columns]
+        new_cols = [col + '_new' for col in columns]
+        new_values = merged_df[new_cols].set_axis(columns, axis=1)
+        old_values = merged_df[old_cols].set_axis(columns, axis=1)
+        updated = new_values.combine_first(old_values)[columns]
+        merged_df = pd.concat([merged_df.drop(columns=old_cols + new_cols), updated], axis=1)
 
     return merged_df
-
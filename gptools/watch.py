@@ -0,0 +1,199 @@
+# keep gauprocess.csv updated while gaussian jobs are running
+# Author: Zihao Ye & Alexander J Maertens
+# creation time: Oct, 2026
+# version: 2026/10/18
+
+import os
+import sys
+import time
+import struct
+import select
+import ctypes
+import ctypes.util
+
+from gptools.gauprocess import get_gau_list, collect_data, write_table, drop_same_names
+from gptools.logfile import is_gau_file
+
+# inotify events, see inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# struct inotify_event without the name
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    '''
+    get names of files changed in a directory from inotify (linux only).
+    note that inotify does not see files written by other hosts on
+    network filesystems, PollWatcher is needed there
+    '''
+    def __init__(self, work_dir: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self.fd, os.fsencode(work_dir), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f'could not watch {work_dir}')
+        self.work_dir = work_dir
+
+    def read_events(self, changed: set, removed: set):
+        data = os.read(self.fd, 1 << 16)
+        pos = 0
+        while pos < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            name = os.fsdecode(data[pos:pos + length].rstrip(b'\0'))
+            pos += length
+            if mask & IN_Q_OVERFLOW:
+                # events are lost, let the cache find what has changed
+                changed.update(os.listdir(self.work_dir))
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                removed.add(name)
+                changed.discard(name)
+            else:
+                changed.add(name)
+                removed.discard(name)
+
+    def changes(self, interval: float=2.0):
+        '''
+        wait until some file changes, then collect changes for interval
+        seconds more, so a file written many times is parsed once.
+        return names of changed and removed files
+        '''
+        changed = set()
+        removed = set()
+        while not select.select([self.fd], [], [], 1.0)[0]:
+            pass
+        deadline = time.monotonic() + interval
+        while True:
+            self.read_events(changed, removed)
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 or not select.select([self.fd], [], [], timeout)[0]:
+                break
+        return changed, removed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollWatcher:
+    '''
+    get names of files changed in a directory by comparing size and
+    mtime of every file each interval seconds, only stat is called
+    '''
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.stats = self.scan()
+
+    def scan(self) -> dict:
+        stats = {}
+        with os.scandir(self.work_dir) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except OSError:  # removed meanwhile
+                    continue
+                stats[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return stats
+
+    def changes(self, interval: float=2.0):
+        '''
+        wait until some file changes, return names of changed and
+        removed files
+        '''
+        while True:
+            time.sleep(interval)
+            stats = self.scan()
+            changed = {name for name, stat in stats.items()
+                       if self.stats.get(name) != stat}
+            removed = set(self.stats) - set(stats)
+            self.stats = stats
+            if changed or removed:
+                return changed, removed
+
+    def close(self):
+        pass
+
+
+def open_watcher(work_dir: str, use_poll: bool=False):
+    '''inotify watcher if possible, otherwise fall back to polling'''
+    if not use_poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(work_dir)
+        except (OSError, AttributeError) as e:
+            print(f'Warning: inotify is not available ({e}), polling instead!')
+    return PollWatcher(work_dir)
+
+
+def watch(work_dir: str=os.getcwd(),
+          need_entropy: bool=False,
+          need_goodvibes: bool=False,
+          temp: float=298.15,
+          conc: float=1.0,
+          factor_rot: float=0.5,
+          factor_trans: float=0.5,
+          jobs: int=1,
+          use_cache: bool=True,
+          cache_hash: bool=False,
+          freq_scale: float=1.0,
+          interval: float=2.0,
+          use_poll: bool=False,
+          output_file: str='gauprocess.csv',
+          ):
+    '''
+    process all gaussian output files in work_dir like process, then
+    keep output_file updated until interrupted (Ctrl+C).
+    only new, growing or finished files are parsed again, results of
+    the others are kept in memory. output_file is replaced at once
+    so readers never see a half written table.
+    quasi-harmonic corrections are always computed by the builtin
+    engine here, running goodvibes on every update would parse all files
+    '''
+    def update_table():
+        data_list = [dict(results[file]) for file in drop_same_names(results, verbose=False)]
+        write_table(data_list, output_file, work_dir, need_entropy, need_goodvibes,
+                    temp, conc, factor_rot, factor_trans,
+                    'builtin', freq_scale, verbose=False)
+
+    def collect(gau_list):
+        return dict(zip(gau_list, collect_data(work_dir, gau_list, need_entropy,
+                                               need_goodvibes, jobs, use_cache,
+                                               cache_hash)))
+
+    print(f'Temperature used is {temp}K!')
+    print(f'Concentration used is {conc}M!')
+    print('Extracting data from gaussian output!')
+    results = collect(get_gau_list(work_dir) or [])
+    if results:
+        update_table()
+        print(f'All data wrote to {output_file} in current folder!')
+
+    watcher = open_watcher(work_dir, use_poll)
+    print(f'Watching {work_dir} for changed files, press Ctrl+C to stop!')
+    try:
+        while True:
+            changed, removed = watcher.changes(interval)
+            removed = {file for file in removed if file in results}
+            changed = sorted(file for file in changed if is_gau_file(file)
+                             and os.path.isfile(os.path.join(work_dir, file)))
+            if not changed and not removed:
+                continue
+            for file in removed:
+                del results[file]
+            results.update(collect(changed))
+            update_table()
+            print(f'{time.strftime("%H:%M:%S")} {len(changed)} files parsed, '
+                  f'{len(removed)} removed, {output_file} updated!')
+    except KeyboardInterrupt:
+        print('Stop watching!')
+    finally:
+        watcher.close()
@@ -14,5 +14,6 @@ setup(
     packages=find_packages(include=['gptools']),
     package_data={'': []},
     include_package_data=True,
+    extras_require={'zstd': ['zstandard'], 'arrow': ['pyarrow'], 'yaml': ['pyyaml']},
     version='0.0.5',
 )
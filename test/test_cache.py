@@ -0,0 +1,19 @@
+import json
+
+from gptools import cache
+from gptools.cache import ResultCache
+
+
+def test_old_version_is_ignored(tmp_path, monkeypatch):
+    gau_file = tmp_path / 'job.log'
+    gau_file.write_text(' Normal termination of Gaussian 16\n')
+    result_cache = ResultCache(str(tmp_path))
+    monkeypatch.setattr(cache, 'CACHE_VERSION', cache.CACHE_VERSION - 1)
+    old_options = ResultCache.options_key(need_entropy=False)
+    result_cache.put(str(gau_file), old_options, {'file_name': 'job'})
+    monkeypatch.undo()
+
+    options = ResultCache.options_key(need_entropy=False)
+    assert json.loads(options)['version'] == cache.CACHE_VERSION
+    assert result_cache.get(str(gau_file), options) is None
+    assert result_cache.get(str(gau_file), old_options) == {'file_name': 'job'}
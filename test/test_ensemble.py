@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gptools.ensemble import boltzmann, ensemble_table, find_duplicates, pair_rmsd
+from gptools.thermo import GAS_CONSTANT, HARTREE_TO_KCAL, J_TO_AU
+
+# a chiral set of points, no rotation maps it on its mirror image
+COORDS = np.array([[0.0, 0.0, 0.0], [1.5, 0.0, 0.0], [0.0, 1.2, 0.0],
+                   [0.0, 0.0, 0.9], [0.7, 0.4, 0.3]])
+
+
+def rotated(coords, angle=0.7, shift=(1.0, -2.0, 3.0)):
+    c, s = np.cos(angle), np.sin(angle)
+    rotation = np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+    return coords @ rotation.T + shift
+
+
+def test_pair_rmsd():
+    mirror = COORDS * [1, 1, -1]
+    moved = COORDS.copy()
+    moved[0] += [0.3, 0.0, 0.0]
+    coords = np.array([COORDS, rotated(COORDS), mirror, moved])
+    rmsd = pair_rmsd(coords, np.array([0, 0, 0]), np.array([1, 2, 3]))
+    assert rmsd[0] == pytest.approx(0.0, abs=1e-6)
+    assert rmsd[1] > 0.1
+    assert 0.0 < rmsd[2] < 0.3 / np.sqrt(len(COORDS))
+
+
+def test_find_duplicates():
+    other = COORDS.copy()
+    other[4] += [1.0, 1.0, 1.0]
+    coords = np.array([rotated(COORDS), COORDS, other, COORDS, rotated(COORDS, 2.0)])
+    # kcal/mol above the lowest one (index 1)
+    rel = np.array([0.05, 0.0, 0.02, 1.0, 0.08])
+    energies = -100.0 + rel / HARTREE_TO_KCAL
+    # 0 and 4 are the same as 1 within 0.1 kcal/mol, 3 is too high
+    assert find_duplicates(energies, coords).tolist() == [1, 1, 2, 3, 1]
+    assert find_duplicates(energies, coords, e_window=0.01).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_boltzmann():
+    rt = GAS_CONSTANT * 298.15 / J_TO_AU
+    weighted = boltzmann(np.array([-100.0, -100.0]))
+    assert weighted['weights'].tolist() == [0.5, 0.5]
+    assert weighted['boltz'] == -100.0
+    assert weighted['ens'] == pytest.approx(-100.0 - rt * np.log(2), abs=1e-12)
+    # 1 kcal/mol apart at 298.15 K
+    weighted = boltzmann(np.array([-100.0, -100.0 + 1 / HARTREE_TO_KCAL]))
+    assert weighted['weights'] == pytest.approx([0.843936, 0.156064], abs=1e-6)
+
+
+def test_ensemble_table():
+    other = COORDS.copy()
+    other[4] += [1.0, 1.0, 1.0]
+    symbols = ['C', 'C', 'O', 'H', 'N']
+    geometries = {name: {'atoms': [(symbol, *xyz) for symbol, xyz in zip(symbols, coords)]}
+                  for name, coords in [('mol_conf1', COORDS), ('mol_conf2', rotated(COORDS)),
+                                       ('mol_conf3', other), ('ts', COORDS)]}
+    data_df = pd.DataFrame({
+        'file_name': ['mol_conf1', 'mol_conf2', 'mol_conf3', 'mol_conf1_sp', 'ts', 'failed'],
+        'status': ['Normal'] * 5 + ['Error'],
+        'E': [-100.0, -100.00001, -99.999, -101.0, -50.0, -1.0],
+        'G': [-99.9, -99.9, -99.9, 0.0, -49.9, -1.0],
+    })
+    table = ensemble_table(data_df, geometries)
+    assert table['species'].tolist() == ['mol', 'ts']
+    assert table['conformers'].tolist() == [3, 1]
+    assert table['unique'].tolist() == [2, 1]
+    rt = GAS_CONSTANT * 298.15 / J_TO_AU
+    assert table['G_min'].tolist() == [-99.9, -49.9]
+    assert table['G_ens'].tolist() == [round(-99.9 - rt * np.log(2), 6), -49.9]
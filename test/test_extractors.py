@@ -0,0 +1,92 @@
+import os
+import json
+
+import pytest
+
+from gptools.extractors import (
+    LogScanner,
+    OptTracker,
+    as_scanner,
+    get_status,
+    get_status_from_file,
+    get_imag_freq,
+    get_sp_energy,
+    get_sp_energy_from_file,
+    get_free_energy,
+    get_entropy,
+)
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize('names', [
+    ['AJM_573.log'],
+    ['AJM_573_sp.log'],
+    # two jobs in one file, the first archive entry is used
+    ['AJM_573_sp.log', 'AJM_573.log'],
+])
+def test_sp_energy_from_file(tmp_path, names):
+    gau_file = tmp_path / 'job.log'
+    with open(gau_file, 'w') as out:
+        for name in names:
+            with open(os.path.join(TEST_DIR, name)) as f:
+                out.write(f.read())
+    with open(gau_file) as f:
+        lines = f.readlines()
+    energy = get_sp_energy_from_file(str(gau_file))
+    assert energy == LogScanner().scan(lines).sp_energy() == get_sp_energy(lines)
+
+
+@pytest.mark.parametrize('name', ['AJM_573.log', 'pryimidone-2-Me-14-ts14.log'])
+def test_fields_share_one_scan(name):
+    gau_file = os.path.join(TEST_DIR, name)
+    with open(gau_file) as f:
+        lines = f.readlines()
+    scanner = as_scanner(lines)
+    assert as_scanner(scanner) is scanner
+    assert get_status(lines) == get_status(scanner) == get_status_from_file(gau_file) == 1
+    for extractor in [get_imag_freq, get_sp_energy, get_free_energy, get_entropy]:
+        assert extractor(scanner) == extractor(lines)
+
+
+def test_status_reads_last_lines():
+    lines = [' Normal termination of Gaussian 16\n'] + ['\n'] * 9
+    assert get_status(lines) == 0
+    assert get_status(lines[:-1]) == 1
+
+
+def tracked(tracker):
+    return tracker.opt_points(), tracker.converge(), tracker.history
+
+
+@pytest.mark.parametrize('cuts', [[0.3], [0.25, 0.5, 0.75], [0.3001, 0.6003]])
+def test_opt_tracker_resume(tmp_path, cuts):
+    # a running job followed across runs gives the same as one full read,
+    # also when cut in the middle of a line
+    with open(os.path.join(TEST_DIR, 'AJM_573.log'), 'rb') as f:
+        data = f.read()
+    gau_file = tmp_path / 'job.log'
+    state = {}
+    start = 0
+    for end in [int(len(data) * cut) for cut in cuts] + [len(data)]:
+        with open(gau_file, 'ab') as f:
+            f.write(data[start:end])
+        start = end
+        tracker = OptTracker(state).update(str(gau_file))
+        # kept as json in the cache
+        state = json.loads(json.dumps(tracker.state()))
+        partial = tracked(tracker)
+        assert partial == tracked(OptTracker().update(str(gau_file)))
+    assert tracker.history and partial[0]['opt_points'] > 0
+
+
+def test_opt_tracker_replaced_file(tmp_path):
+    gau_file = tmp_path / 'job.log'
+    with open(os.path.join(TEST_DIR, 'AJM_573.log'), 'rb') as f:
+        gau_file.write_bytes(f.read())
+    state = OptTracker().update(str(gau_file)).state()
+    with open(os.path.join(TEST_DIR, 'pryimidone-2-Me-14-ts14.log'), 'rb') as f:
+        gau_file.write_bytes(f.read())
+    # read from the start again
+    tracker = OptTracker(state).update(str(gau_file))
+    assert tracked(tracker) == tracked(OptTracker().update(str(gau_file)))
@@ -0,0 +1,18 @@
+from gptools.fileops import FilePlan
+
+
+def test_kept_paths_are_not_deleted(tmp_path):
+    (tmp_path / '123').mkdir()
+    kept = tmp_path / '123' / 'job1.log'
+    kept.write_text('log')
+    other = tmp_path / 'job2.log'
+    other.write_text('log')
+
+    plan = FilePlan()
+    plan.keep(str(kept))
+    for path in [kept, tmp_path / '123', other]:
+        plan.delete(str(path))
+    assert [src for _, src, _ in plan.ops] == [str(other)]
+
+    plan.run()
+    assert kept.exists() and not other.exists()
@@ -0,0 +1,47 @@
+import pytest
+
+from gptools.gaucollect import main, MANIFEST_FILE
+
+NORMAL_LOG = ' Entering Gaussian System\n Normal termination of Gaussian 16\n'
+
+
+def make_job(main_dir, prefix='job1', jobid='123'):
+    '''a finished job: log, chk, job output and its scratch dir'''
+    (main_dir / f'{prefix}.log').write_text(NORMAL_LOG)
+    (main_dir / f'{prefix}.chk').write_text('chk')
+    (main_dir / f'{prefix}.o{jobid}').write_text('')
+    (main_dir / jobid).mkdir()
+    (main_dir / jobid / 'scratch').write_text('')
+
+
+@pytest.mark.parametrize('clean,deepclean', [(True, False), (False, True)])
+def test_symlink_clean_keeps_originals(tmp_path, monkeypatch, clean, deepclean):
+    monkeypatch.chdir(tmp_path)
+    make_job(tmp_path)
+    main(main_dir=str(tmp_path), clean=clean, deepclean=deepclean, mode='symlink',
+         scheduler='local', all_yes=True)
+
+    for name in ['job1.log', 'job1.chk', 'job1.o123', '123']:
+        assert (tmp_path / name).exists()
+    link = tmp_path / 'log' / 'job1.log'
+    assert link.is_symlink() and link.read_text() == NORMAL_LOG
+
+
+def test_manifest_clean_keeps_originals(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_job(tmp_path)
+    main(main_dir=str(tmp_path), clean=True, mode='manifest', scheduler='local', all_yes=True)
+
+    for name in ['job1.log', 'job1.chk', 'job1.o123', '123']:
+        assert (tmp_path / name).exists()
+    assert 'job1.log' in (tmp_path / 'log' / MANIFEST_FILE).read_text()
+
+
+def test_copy_clean_removes_originals(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_job(tmp_path)
+    main(main_dir=str(tmp_path), clean=True, mode='copy', scheduler='local', all_yes=True)
+
+    for name in ['job1.log', 'job1.chk', 'job1.o123', '123']:
+        assert not (tmp_path / name).exists()
+    assert (tmp_path / 'log' / 'job1.log').read_text() == NORMAL_LOG
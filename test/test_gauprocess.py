@@ -0,0 +1,122 @@
+import os
+import csv
+import gzip
+import shutil
+import tarfile
+import zipfile
+
+import pytest
+
+from gptools.extractors import LogScanner
+from gptools.gauprocess import get_gau_list, process, process_file
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_FILE = os.path.join(TEST_DIR, 'gauprocess_template.csv')
+# logs of test/, the single point as named in the template
+LOG_FILES = {
+    'AJM_573.log': 'AJM_573.log',
+    'AJM_573_sp.log': 'AJM_573_SP_M06.log',
+    'pryimidone-2-Me-14-ts14.log': 'pryimidone-2-Me-14-ts14.log',
+}
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    for name, copy_name in LOG_FILES.items():
+        shutil.copy(os.path.join(TEST_DIR, name), tmp_path / copy_name)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize('qh_engine', [
+    'builtin',
+    pytest.param('goodvibes', marks=pytest.mark.skipif(
+        shutil.which('goodvibes') is None, reason='goodvibes not installed')),
+])
+def test_process_template(log_dir, qh_engine):
+    # python -m gptools -s -g -c 1.5 -t 273.15
+    process(str(log_dir), need_entropy=True, need_goodvibes=True, temp=273.15, conc=1.5,
+            use_cache=False, qh_engine=qh_engine)
+    with open(log_dir / 'gauprocess.csv') as f, open(TEMPLATE_FILE) as template:
+        assert f.read() == template.read()
+
+
+@pytest.mark.parametrize('jobs', [2, 0])
+def test_process_jobs(log_dir, jobs):
+    # a pool of processes gives the rows of a serial run, in the same order
+    process(str(log_dir), need_entropy=True, need_goodvibes=True, temp=273.15, conc=1.5,
+            use_cache=False, jobs=jobs)
+    with open(log_dir / 'gauprocess.csv') as f, open(TEMPLATE_FILE) as template:
+        assert f.read() == template.read()
+
+
+def test_process_file_energy_of_first_job(tmp_path):
+    # two jobs in one file, E is from the first archive entry
+    gau_file = tmp_path / 'job.log'
+    with open(gau_file, 'w') as out:
+        for name in ['AJM_573_sp.log', 'AJM_573.log']:
+            with open(os.path.join(TEST_DIR, name)) as f:
+                out.write(f.read())
+    with open(gau_file) as f:
+        energy = LogScanner().scan(f).sp_energy()['E']
+    data_dict = process_file(str(gau_file), need_entropy=True)
+    assert data_dict['status'] == 'Normal'
+    assert data_dict['E'] == energy == -2284.532144
+
+
+def test_plain_and_compressed_same_name(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(TEST_DIR, 'AJM_573.log'), tmp_path / 'x.log')
+    with open(os.path.join(TEST_DIR, 'AJM_573_sp.log'), 'rb') as f:
+        with gzip.open(tmp_path / 'x.log.gz', 'wb') as out:
+            out.write(f.read())
+    monkeypatch.chdir(tmp_path)
+    assert get_gau_list(str(tmp_path)) == ['x.log']
+    process(str(tmp_path), use_cache=False)
+    with open(tmp_path / 'gauprocess.csv') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['file_name'] for row in rows] == ['x']
+    assert float(rows[0]['E']) == -2283.155184
+
+
+@pytest.mark.parametrize('suffix', ['.tar.gz', '.zip'])
+def test_archive_members_same_name(tmp_path, monkeypatch, suffix):
+    members = {'a/AJM_573.log': 'AJM_573.log', 'b/AJM_573.log': 'AJM_573_sp.log',
+               'c/ts.log': 'pryimidone-2-Me-14-ts14.log', 'c/ts.log.gz': 'AJM_573.log'}
+    archive = tmp_path / f'campaign{suffix}'
+    if suffix == '.zip':
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for member, name in members.items():
+                zf.write(os.path.join(TEST_DIR, name), member)
+    else:
+        with tarfile.open(archive, 'w:gz') as tf:
+            for member, name in members.items():
+                tf.add(os.path.join(TEST_DIR, name), member)
+    monkeypatch.chdir(tmp_path)
+    process(inp_file=str(archive), use_cache=False)
+    with open(tmp_path / 'gauprocess.csv') as f:
+        rows = {row['file_name']: row for row in csv.DictReader(f)}
+    # same base names in several folders are named by path, c/ts.log.gz is
+    # skipped for c/ts.log (never read)
+    assert sorted(rows) == ['a/AJM_573', 'b/AJM_573', 'ts']
+    assert float(rows['a/AJM_573']['E']) == -2283.155184
+    assert float(rows['b/AJM_573']['E']) == -2284.532144
+    assert float(rows['ts']['E']) == -417.636809
+
+
+def test_split_jobs(tmp_path, monkeypatch):
+    # a single point chained with an opt freq job, and a single job file
+    with open(tmp_path / 'chain.log', 'w') as out:
+        for name in ['AJM_573_sp.log', 'AJM_573.log']:
+            with open(os.path.join(TEST_DIR, name)) as f:
+                out.write(f.read())
+    shutil.copy(os.path.join(TEST_DIR, 'AJM_573_sp.log'), tmp_path / 'sp.log')
+    monkeypatch.chdir(tmp_path)
+    process(str(tmp_path), split_jobs=True, use_cache=False)
+    with open(tmp_path / 'gauprocess.csv') as f:
+        rows = [(row['file_name'], row['status'], float(row['E']), float(row['G']))
+                for row in csv.DictReader(f)]
+    # one row per sub-job, the freq step of opt freq is a sub-job too
+    assert rows == [('chain_link1', 'Normal', -2284.532144, 0.0),
+                    ('chain_link2', 'Normal', -2283.155184, 0.0),
+                    ('chain_link3', 'Normal', -2283.155184, -2282.784139),
+                    ('sp', 'Normal', -2284.532144, 0.0)]
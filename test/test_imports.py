@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import pytest
+
+from gptools.benchmark import CORE_MODULES
+
+
+@pytest.mark.parametrize('module', CORE_MODULES)
+def test_core_import_is_light(module):
+    # pandas and numpy are only loaded by the commands needing them
+    code = (f"import {module}, sys; "
+            "assert 'pandas' not in sys.modules and 'numpy' not in sys.modules")
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_results_are_loaded_on_use():
+    code = ("import gptools, sys; "
+            "assert 'gptools.results' not in sys.modules; "
+            "from gptools import GaussianResult, parse_log; "
+            "assert parse_log.__module__ == 'gptools.results'")
+    subprocess.run([sys.executable, '-c', code], check=True)
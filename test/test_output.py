@@ -0,0 +1,53 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from gptools import gauprocess
+from gptools.gauprocess import process
+from gptools.output import get_format, output_columns, read_table
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_FILE = os.path.join(TEST_DIR, 'gauprocess_template.csv')
+LOG_FILES = {
+    'AJM_573.log': 'AJM_573.log',
+    'AJM_573_sp.log': 'AJM_573_SP_M06.log',
+    'pryimidone-2-Me-14-ts14.log': 'pryimidone-2-Me-14-ts14.log',
+}
+
+
+@pytest.mark.parametrize('output_file, output_format', [
+    ('out.csv', None), ('out.txt', None), ('out.json', None), ('out.ndjson', None),
+    ('out.pq', None), ('out.arrow', None), ('out.feather', None), ('out.dat', 'jsonl'),
+])
+def test_get_format(output_file, output_format):
+    expected = {'.json': 'jsonl', '.ndjson': 'jsonl', '.pq': 'parquet',
+                '.arrow': 'feather', '.feather': 'feather', '.dat': 'jsonl'}
+    ext = os.path.splitext(output_file)[1]
+    assert get_format(output_file, output_format) == expected.get(ext, 'csv')
+
+
+@pytest.mark.parametrize('output_file', [
+    'out.csv',
+    'out.jsonl',
+    'out.parquet',
+    'out.feather',
+])
+def test_output_formats(tmp_path, monkeypatch, output_file):
+    if not output_file.endswith(('.csv', '.jsonl')):
+        pytest.importorskip('pyarrow')
+    for name, copy_name in LOG_FILES.items():
+        shutil.copy(os.path.join(TEST_DIR, name), tmp_path / copy_name)
+    monkeypatch.chdir(tmp_path)
+    # streamed in chunks of one file
+    monkeypatch.setattr(gauprocess, 'OUTPUT_CHUNK', 1)
+    process(str(tmp_path), need_entropy=True, need_goodvibes=True, temp=273.15, conc=1.5,
+            use_cache=False, output_file=output_file)
+
+    data_df = read_table(output_file)
+    assert list(data_df.columns) == [name for name, _ in output_columns(True, True)]
+    # the same rows as gauprocess.csv, with the opt columns as well
+    template_df = pd.read_csv(TEMPLATE_FILE)
+    pd.testing.assert_frame_equal(data_df[template_df.columns], template_df,
+                                  check_dtype=False)
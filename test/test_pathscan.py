@@ -0,0 +1,80 @@
+import os
+import csv
+import gzip
+import shutil
+
+import numpy as np
+import pytest
+
+from gptools.extractors import PATH_FORWARD, PATH_REVERSE, PATH_SCAN, PathScanner, get_path
+from gptools.pathscan import paths
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+# a relaxed scan of R(1,3) over 3 points, the last one not converged, and
+# an IRC of 2 points along each path (path 2 is the reverse one). kept
+# apart, so the logs of test/ still give gauprocess_template.csv
+SCAN_FILE = os.path.join(TEST_DIR, 'pathscan', 'scan.log')
+IRC_FILE = os.path.join(TEST_DIR, 'pathscan', 'irc.log')
+
+
+def test_scan_points():
+    scanner = get_path(SCAN_FILE)
+    assert scanner.kind == 'scan' and len(scanner) == 3
+    arrays = scanner.arrays()
+    assert arrays['names'].tolist() == ['R(1,3)']
+    assert arrays['symbols'].tolist() == ['C', 'H', 'O']
+    assert arrays['coordinate'].tolist() == [[1.2], [1.3], [1.4]]
+    # energy and input orientation of the last step of each point
+    assert arrays['energy'].tolist() == [-100.002, -100.012, -100.022]
+    assert arrays['converged'].tolist() == [True, True, False]
+    assert arrays['path'].tolist() == [PATH_SCAN] * 3
+    assert arrays['xyz'].shape == (3, 3, 3)
+    np.testing.assert_allclose(arrays['xyz'][:, 0, 2], [1.22, 1.32, 1.42])
+
+
+def test_irc_points():
+    arrays = get_path(IRC_FILE).arrays()
+    assert arrays['names'].tolist() == ['IRC']
+    # sorted along the reaction coordinate, the TS in the middle
+    assert arrays['coordinate'][:, 0].tolist() == [-0.2, -0.1, 0.0, 0.1, 0.2]
+    assert arrays['energy'].tolist() == [-100.04, -100.02, -100.0, -100.01, -100.02]
+    assert arrays['path'].tolist() == [PATH_REVERSE] * 2 + [PATH_SCAN] + [PATH_FORWARD] * 2
+    np.testing.assert_allclose(arrays['xyz'][:, 0, 2], [0.3, 0.4, 0.5, 0.6, 0.7])
+
+
+def test_irc_g09_points():
+    with open(IRC_FILE) as f:
+        lines = [line.replace('Path Number:   1', 'in FORWARD path direction.')
+                     .replace('Path Number:   2', 'in REVERSE path direction.')
+                 for line in f]
+    arrays = PathScanner().scan(lines).arrays()
+    assert arrays['coordinate'][:, 0].tolist() == [-0.2, -0.1, 0.0, 0.1, 0.2]
+
+
+def test_no_points():
+    scanner = get_path(os.path.join(TEST_DIR, 'AJM_573_sp.log'))
+    assert scanner.kind is None and len(scanner) == 0
+
+
+@pytest.mark.parametrize('path_file', ['paths.npz', 'paths.csv'])
+def test_paths(tmp_path, monkeypatch, path_file):
+    shutil.copy(SCAN_FILE, tmp_path / 'scan.log')
+    with open(IRC_FILE, 'rb') as f, gzip.open(tmp_path / 'irc.log.gz', 'wb') as out:
+        out.write(f.read())
+    shutil.copy(os.path.join(TEST_DIR, 'AJM_573_sp.log'), tmp_path / 'sp.log')
+    monkeypatch.chdir(tmp_path)
+    paths(str(tmp_path), path_file=path_file)
+
+    if path_file.endswith('.npz'):
+        with np.load(path_file) as arrays:
+            assert sorted(arrays.files) == sorted(
+                f'{name}/{key}' for name in ['irc', 'scan']
+                for key in ['coordinate', 'energy', 'converged', 'path', 'xyz',
+                            'names', 'symbols'])
+            assert arrays['scan/energy'].tolist() == [-100.002, -100.012, -100.022]
+    else:
+        with open(path_file) as f:
+            rows = list(csv.DictReader(f))
+        # files without points are left out
+        assert [row['file_name'] for row in rows] == ['irc'] * 5 + ['scan'] * 3
+        assert [float(row['rel_E']) for row in rows[5:]] == [12.55, 6.28, 0.0]
@@ -0,0 +1,59 @@
+import time
+import threading
+
+import pytest
+
+from gptools.prefetch import MB, prefetch, warm, warm_files
+
+
+@pytest.mark.parametrize('n_ahead', [0, 1, 4])
+def test_prefetch_order(n_ahead):
+    # later items load faster, they are still yielded in order
+    def load(i):
+        time.sleep(0.001 * (10 - i))
+        return i * i
+    assert list(prefetch(range(10), load, n_ahead)) == [(i, i * i) for i in range(10)]
+
+
+def test_prefetch_budget():
+    lock = threading.Lock()
+    started = []
+
+    def load(i):
+        with lock:
+            started.append(i)
+        return i
+
+    # 1 MB items in a 3 MB budget, at most 2 loaded after the one taken
+    taken = 0
+    for i, _ in prefetch(range(20), load, n_ahead=8, max_mb=3, size=lambda i: MB):
+        taken += 1
+        with lock:
+            assert len(started) - taken <= 2
+    assert taken == 20
+    # an item larger than the budget is loaded alone
+    assert list(prefetch(range(3), load, n_ahead=8, max_mb=1,
+                         size=lambda i: 10 * MB)) == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_prefetch_error():
+    def load(i):
+        if i == 3:
+            raise OSError('unreadable')
+        return i
+
+    taken = []
+    with pytest.raises(OSError):
+        for i, _ in prefetch(range(6), load):
+            taken.append(i)
+    assert taken == [0, 1, 2]
+
+
+def test_warm(tmp_path):
+    path = tmp_path / 'job.log'
+    path.write_bytes(b'x' * 3000)
+    assert warm(str(path)) == 3000
+    assert warm(str(path), max_bytes=1000) == 1000
+    assert warm(str(tmp_path / 'missing.log')) == 0
+    paths = [str(path), str(tmp_path / 'missing.log')] * 3
+    assert list(warm_files(paths, n_ahead=2)) == paths
@@ -0,0 +1,53 @@
+import os
+import json
+import pstats
+import shutil
+
+import pytest
+
+from gptools import profiling
+from gptools.gauprocess import process
+from gptools.profiling import count, measured, stage, staged
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_FILES = ['AJM_573.log', 'AJM_573_sp.log']
+
+
+def test_stages_nest():
+    @staged('inner')
+    def inner():
+        count(lines=5)
+        return 1
+
+    assert inner() == 1 and profiling.STATS is None
+    profiling.enable()
+    try:
+        with stage('outer'):
+            inner()
+            inner()
+    finally:
+        stats = profiling.disable()
+    assert profiling.STATS is None
+    assert list(stats.stages) == ['outer', 'outer/inner']
+    assert [stats.stages[name]['calls'] for name in stats.stages] == [1, 2]
+    assert [stats.stages[name]['lines'] for name in stats.stages] == [10, 10]
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_process_stats(tmp_path, monkeypatch, jobs):
+    n_lines = 0
+    for name in LOG_FILES:
+        shutil.copy(os.path.join(TEST_DIR, name), tmp_path / name)
+        with open(tmp_path / name) as f:
+            n_lines += sum(1 for _ in f)
+    monkeypatch.chdir(tmp_path)
+    with measured('stats.json', 'profile.out'):
+        process(str(tmp_path), use_cache=False, jobs=jobs)
+
+    with open('stats.json') as f:
+        stages = json.load(f)['stages']
+    # lines scanned in worker processes are merged into the parent stages
+    scan = stages['process/collect_data/parse/LogScanner.scan']
+    assert scan['calls'] == len(LOG_FILES)
+    assert scan['lines'] == stages['process']['lines'] == n_lines
+    assert pstats.Stats('profile.out').total_calls > 0
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gptools.reaction import energetic_span, read_spec, reaction_profile
+from gptools.thermo import HARTREE_TO_KCAL
+
+
+@pytest.mark.parametrize('barrier,reaction,expected', [
+    # the first TS over the first intermediate
+    ([20.0, 15.0], [-5.0, -10.0],
+     {'span': 20.0, 'tdi_step': 1, 'tdts_step': 1, 'reaction': -15.0}),
+    # a deep intermediate before a late TS
+    ([5.0, 18.0], [-20.0, 5.0],
+     {'span': 18.0, 'tdi_step': 2, 'tdts_step': 2, 'reaction': -15.0}),
+    # TS before the TDI, the reaction energy is added: 25 + 40 - 30
+    ([25.0, 0.0], [-40.0, 10.0],
+     {'span': 35.0, 'tdi_step': 2, 'tdts_step': 1, 'reaction': -30.0}),
+    # barrierless step (no TS listed) counts as its reaction energy if uphill
+    ([np.nan, 10.0], [12.0, -20.0],
+     {'span': 22.0, 'tdi_step': 1, 'tdts_step': 2, 'reaction': -8.0}),
+])
+def test_energetic_span(barrier, reaction, expected):
+    assert energetic_span(np.array(barrier), np.array(reaction)) == expected
+
+
+def table(energies: dict) -> pd.DataFrame:
+    '''process table of normal terminated files, G_corr 0'''
+    return pd.DataFrame({'file_name': list(energies), 'status': 'Normal',
+                         'E': list(energies.values()), 'G_corr': 0.0})
+
+
+def write_spec(tmp_path, rows):
+    spec_file = tmp_path / 'steps.csv'
+    spec_file.write_text('pathway,reactants,ts,products\n' + ''.join(f'{row}\n' for row in rows))
+    return read_spec(str(spec_file))
+
+
+def test_reaction_profile(tmp_path):
+    kcal = 1 / HARTREE_TO_KCAL
+    table_df = table({'a': 0.0, 'ts1': 20 * kcal, 'b': -5 * kcal,
+                      'ts2': 10 * kcal, 'c': -15 * kcal})
+    spec_df = write_spec(tmp_path, ['p,a,ts1,b', 'p,b,ts2,c'])
+    steps_df, span_df, missing = reaction_profile(table_df, spec_df)
+    assert missing == []
+    assert steps_df['barrier'].tolist() == [20.0, 15.0]
+    assert steps_df['reaction'].tolist() == [-5.0, -10.0]
+    span = span_df.iloc[0]
+    assert (span['span'], span['tdi_step'], span['tdts_step']) == (20.0, 1, 1)
+
+
+def test_reaction_profile_missing_ts(tmp_path):
+    kcal = 1 / HARTREE_TO_KCAL
+    # ts2 is listed but not in the table, the step is not barrierless
+    table_df = table({'a': 0.0, 'ts1': 20 * kcal, 'b': -5 * kcal, 'c': -15 * kcal})
+    spec_df = write_spec(tmp_path, ['p,a,ts1,b', 'p,b,ts2,c', 'q,a,,b'])
+    steps_df, span_df, missing = reaction_profile(table_df, spec_df)
+    assert missing == ['ts2']
+    assert np.isnan(steps_df['barrier'].iloc[1])
+    span = span_df.set_index('pathway')
+    assert np.isnan(span.loc['p', 'span'])
+    assert pd.isna(span.loc['p', 'tdi_step']) and pd.isna(span.loc['p', 'tdts_step'])
+    assert span.loc['p', 'reaction'] == -15.0
+    # no TS listed at all is barrierless
+    assert span.loc['q', 'span'] == 0.0
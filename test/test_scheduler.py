@@ -0,0 +1,52 @@
+import pytest
+
+from gptools.scheduler import (
+    QUEUE_CACHE_FILE,
+    Scheduler,
+    SGEScheduler,
+    SlurmScheduler,
+    get_scheduler,
+)
+
+QSTAT = '''job-ID  prior   name       user         state submit/start at     queue    slots
+-----------------------------------------------------------------------------------------
+ 123456 0.50500 job1       zye          r     10/18/2026 10:00:00 all.q@n1     16
+ 123457 0.00000 job2       zye          qw    10/18/2026 10:01:00              16
+'''
+
+
+def test_scheduler_is_abstract():
+    with pytest.raises(TypeError):
+        Scheduler()
+
+
+def test_sge_query(monkeypatch):
+    scheduler = SGEScheduler(user='zye')
+    monkeypatch.setattr(scheduler, 'run', lambda cmd: QSTAT)
+    assert scheduler.query() == {'123456', '123457'}
+
+
+def test_slurm_query(monkeypatch):
+    scheduler = SlurmScheduler(user='zye')
+    monkeypatch.setattr(scheduler, 'run', lambda cmd: '101\n102\n\n')
+    assert scheduler.query() == {'101', '102'}
+
+
+def test_running_jobs_cached(tmp_path, monkeypatch):
+    calls = []
+    scheduler = SlurmScheduler(user='zye', ttl=60.0, cache_dir=str(tmp_path))
+    monkeypatch.setattr(scheduler, 'run', lambda cmd: calls.append(cmd) or '101\n')
+    assert scheduler.running_jobs() == {'101'}
+    assert scheduler.running_jobs() == {'101'}
+    assert len(calls) == 1 and (tmp_path / QUEUE_CACHE_FILE).exists()
+    # another user is asked again
+    other = SlurmScheduler(user='other', ttl=60.0, cache_dir=str(tmp_path))
+    monkeypatch.setattr(other, 'run', lambda cmd: calls.append(cmd) or '')
+    assert other.running_jobs() == set()
+    assert len(calls) == 2
+
+
+def test_get_scheduler():
+    assert get_scheduler('local', running={'5'}).running_jobs() == {'5'}
+    with pytest.raises(ValueError):
+        get_scheduler('pbs')
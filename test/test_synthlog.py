@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from gptools.extractors import get_status_from_file
+from gptools.synthlog import TEMPLATE_DIR, check_template_dir, make_campaign
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_template_dir(tmp_path):
+    assert TEMPLATE_DIR == TEST_DIR
+    assert check_template_dir(TEST_DIR) == TEST_DIR
+    for template_dir in [None, str(tmp_path)]:
+        with pytest.raises(FileNotFoundError):
+            check_template_dir(template_dir)
+        with pytest.raises(FileNotFoundError):
+            make_campaign(str(tmp_path / 'campaign'), 4, template_dir)
+
+
+def test_make_campaign(tmp_path):
+    names = make_campaign(str(tmp_path), 4, TEST_DIR)
+    assert names == ['job00000.log', 'job00000_sp.log', 'job00002.log', 'job00003.log']
+    assert sorted(os.listdir(tmp_path)) == sorted(names)
+    # the last one is still running
+    assert [get_status_from_file(str(tmp_path / name)) for name in names] == [1, 1, 1, 0]
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pytest
+
+from gptools.extractors import LogScanner
+from gptools.thermo import qh_terms, round_terms
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_FILES = ['AJM_573.log', 'pryimidone-2-Me-14-ts14.log']
+
+# rounded terms of LOG_FILES, at 273.15 K and 1.5 M as printed by
+# goodvibes (see gauprocess_template.csv)
+GOLDEN = {
+    (298.15, 1.0): {'ZPE': [0.433987, 0.134303],
+                    'H_corr': [0.46324, 0.143449],
+                    'H': [-2282.691944, -417.49336],
+                    'T.qh-S_tot': [0.082081, 0.038562],
+                    'qh-G_corr': [0.381159, 0.104886],
+                    'qh-G': [-2282.774025, -417.531923]},
+    (273.15, 1.5): {'ZPE': [0.433987, 0.134303],
+                    'H_corr': [0.458904, 0.142199],
+                    'H': [-2282.69628, -417.49461],
+                    'T.qh-S_tot': [0.071151, 0.033887],
+                    'qh-G_corr': [0.387752, 0.108312],
+                    'qh-G': [-2282.767432, -417.528497]},
+}
+
+
+@pytest.fixture(scope='module')
+def thermo_list():
+    thermo_list = []
+    for name in LOG_FILES:
+        with open(os.path.join(TEST_DIR, name)) as f:
+            thermo_list.append(LogScanner(need_thermo=True).scan(f).thermo_data())
+    return thermo_list
+
+
+@pytest.mark.parametrize('temp, conc', list(GOLDEN))
+def test_qh_terms_golden(thermo_list, temp, conc):
+    terms = round_terms(qh_terms(thermo_list, temp, conc))
+    for col, values in GOLDEN[(temp, conc)].items():
+        assert terms[col].tolist() == [values], col
+
+
+def test_qh_terms_grid(thermo_list):
+    # grid points in rows, the same as one call per point
+    temps, concs = zip(*GOLDEN)
+    terms = qh_terms(thermo_list, temps, concs)
+    for i, (temp, conc) in enumerate(GOLDEN):
+        for col, values in qh_terms(thermo_list, temp, conc).items():
+            np.testing.assert_allclose(terms[col][i], values[0], rtol=0, atol=1e-9)
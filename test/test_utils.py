@@ -0,0 +1,18 @@
+import os
+import stat
+
+from gptools.utils import write_rows
+
+
+def test_write_rows_file_mode(tmp_path):
+    output_file = tmp_path / 'gauprocess.csv'
+    umask = os.umask(0o022)
+    try:
+        write_rows([{'file_name': 'a', 'E': -1.0}], output_file)
+        assert stat.S_IMODE(os.stat(output_file).st_mode) == 0o644
+        # a replaced file keeps its mode
+        os.chmod(output_file, 0o640)
+        write_rows([{'file_name': 'a', 'E': -2.0}], output_file)
+        assert stat.S_IMODE(os.stat(output_file).st_mode) == 0o640
+    finally:
+        os.umask(umask)
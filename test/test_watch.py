@@ -0,0 +1,67 @@
+import os
+import csv
+import shutil
+import sys
+
+import pytest
+
+from gptools import watch as watch_module
+from gptools.watch import InotifyWatcher, PollWatcher, watch
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def change_files(work_dir):
+    with open(work_dir / 'a.log', 'a') as f:
+        f.write(' Normal termination of Gaussian 16\n')
+    (work_dir / 'b.log').write_text('new\n')
+    (work_dir / 'c.log').unlink()
+
+
+def open_inotify(work_dir):
+    if not sys.platform.startswith('linux'):
+        pytest.skip('inotify is linux only')
+    try:
+        return InotifyWatcher(work_dir)
+    except (OSError, AttributeError) as e:
+        pytest.skip(f'inotify is not available ({e})')
+
+
+@pytest.mark.parametrize('open_watcher', [PollWatcher, open_inotify])
+def test_watcher_changes(tmp_path, open_watcher):
+    (tmp_path / 'a.log').write_text('running\n')
+    (tmp_path / 'c.log').write_text('old\n')
+    watcher = open_watcher(str(tmp_path))
+    try:
+        change_files(tmp_path)
+        assert watcher.changes(interval=0.05) == ({'a.log', 'b.log'}, {'c.log'})
+    finally:
+        watcher.close()
+
+
+class FakeWatcher:
+    '''copies the opt freq sample in, then stops the watch'''
+    def __init__(self, work_dir, use_poll=False):
+        self.work_dir = work_dir
+        self.calls = 0
+
+    def changes(self, interval=2.0):
+        self.calls += 1
+        if self.calls > 1:
+            raise KeyboardInterrupt
+        shutil.copy(os.path.join(TEST_DIR, 'AJM_573.log'), os.path.join(self.work_dir, 'new.log'))
+        os.remove(os.path.join(self.work_dir, 'sp.log'))
+        return {'new.log', 'notes.txt'}, {'sp.log'}
+
+    def close(self):
+        pass
+
+
+def test_watch_updates_table(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(TEST_DIR, 'AJM_573_sp.log'), tmp_path / 'sp.log')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(watch_module, 'open_watcher', FakeWatcher)
+    watch(str(tmp_path), use_cache=False)
+    with open(tmp_path / 'gauprocess.csv') as f:
+        rows = list(csv.DictReader(f))
+    assert [(row['file_name'], float(row['E'])) for row in rows] == [('new', -2283.155184)]